@@ -16,6 +16,7 @@ def _parse_args() -> argparse.Namespace:
     p.add_argument("--out", type=Path, default=None)
     p.add_argument("--real-sandbox", action="store_true")
     p.add_argument("--fail-fast", action="store_true")
+    p.add_argument("--workers", type=int, default=1)
     p.add_argument("--json", action="store_true", dest="print_json")
     return p.parse_args()
 
@@ -35,6 +36,7 @@ def main() -> None:
             limit=args.limit,
             real_sandbox=args.real_sandbox,
             fail_fast=args.fail_fast,
+            workers=args.workers,
         )
     )
     if args.print_json:
@@ -71,8 +71,9 @@ async def run_eval_cases(
     limit: int | None,
     real_sandbox: bool,
     fail_fast: bool,
+    workers: int = 1,
 ) -> tuple[list[EvalCaseResult], EvalAggregateMetrics, dict]:
-    from sre_agent.fix_pipeline.offline import run_pipeline_from_logs
+    from sre_agent.fix_pipeline.offline import run_pipeline_batch
 
     run_id = out_dir.name or f"run_{uuid4().hex[:8]}"
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -83,17 +84,32 @@ async def run_eval_cases(
 
     validation_mode = "real-sandbox" if real_sandbox else "mock"
 
-    for case in cases:
+    outcomes = await run_pipeline_batch(
+        [
+            {
+                "log_text": case.logs_text,
+                "case_id": case.case_id,
+                "model": model,
+                "repo_fixture_dir": case.repo_fixture_dir,
+                "fix_category_hint": case.failure.category,
+                "allowed_fix_types": case.expected.allowed_fix_types,
+                "drop_raw": True,
+                "serialize_detection": False,
+            }
+            for case in cases
+        ],
+        workers=workers,
+        stop_on_error=fail_fast,
+    )
+
+    for case, outcome in zip(cases, outcomes, strict=False):
+        pipeline_ms = 0
         started = time.perf_counter()
         try:
-            pipeline_out = await run_pipeline_from_logs(
-                case.logs_text,
-                case_id=case.case_id,
-                model=model,
-                repo_fixture_dir=case.repo_fixture_dir,
-                fix_category_hint=case.failure.category,
-                allowed_fix_types=case.expected.allowed_fix_types,
-            )
+            if isinstance(outcome, Exception):
+                raise outcome
+            pipeline_out = outcome
+            pipeline_ms = int(pipeline_out["time_ms"])
 
             plan = pipeline_out["plan"]
             plan_decision = pipeline_out["plan_decision"]
@@ -141,7 +157,7 @@ async def run_eval_cases(
                 forbidden_path_touched=forbidden_path_touched,
                 validation_passed=validation_passed,
                 validation_mode=validation_mode,
-                time_ms=max(1, int((time.perf_counter() - started) * 1000)),
+                time_ms=max(1, pipeline_ms + int((time.perf_counter() - started) * 1000)),
                 notes=patch_error or "",
             )
 
@@ -173,7 +189,7 @@ async def run_eval_cases(
                 forbidden_path_touched=False,
                 validation_passed=False,
                 validation_mode=validation_mode,
-                time_ms=max(1, int((time.perf_counter() - started) * 1000)),
+                time_ms=max(1, pipeline_ms + int((time.perf_counter() - started) * 1000)),
                 notes=str(e),
             )
             per_case_artifacts[case.case_id] = {"error": str(e)}
@@ -207,6 +223,7 @@ async def run_evals(
     limit: int | None,
     real_sandbox: bool,
     fail_fast: bool,
+    workers: int = 1,
 ) -> dict:
     from evals.reporting import render_markdown_summary
 
@@ -217,6 +234,7 @@ async def run_evals(
         limit=limit,
         real_sandbox=real_sandbox,
         fail_fast=fail_fast,
+        workers=workers,
     )
 
     _write_json(
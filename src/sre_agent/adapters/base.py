@@ -24,6 +24,14 @@ class ValidationStep(BaseModel):
 class BaseAdapter(ABC):
     name: str
     supported_languages: list[str]
+    # Path suffixes of the build files this adapter looks for. Adapters that
+    # set this must depend on ``repo_files`` only through ``has_markers``, which
+    # lets the registry reuse a detection across different file lists.
+    marker_suffixes: tuple[str, ...] = ()
+
+    def has_markers(self, repo_files: list[str]) -> bool:
+        suffixes = self.marker_suffixes
+        return bool(suffixes) and any(p.endswith(suffixes) for p in repo_files)
 
     @abstractmethod
     def detect(self, log_text: str, repo_files: list[str]) -> DetectionResult | None: ...
@@ -8,9 +8,10 @@ from sre_agent.adapters.base import BaseAdapter, DetectionResult, ValidationStep
 class DockerAdapter(BaseAdapter):
     name = "docker"
     supported_languages = ["docker"]
+    marker_suffixes = ("Dockerfile",)
 
     def detect(self, log_text: str, repo_files: list[str]) -> DetectionResult | None:
-        has_dockerfile = any(p.endswith("Dockerfile") for p in repo_files)
+        has_dockerfile = self.has_markers(repo_files)
         looks_like_docker = "failed to solve" in log_text or "docker build" in log_text
         if not (has_dockerfile or looks_like_docker):
             return None
@@ -8,9 +8,10 @@ from sre_agent.adapters.base import BaseAdapter, DetectionResult, ValidationStep
 class GoAdapter(BaseAdapter):
     name = "go"
     supported_languages = ["go"]
+    marker_suffixes = ("go.mod",)
 
     def detect(self, log_text: str, repo_files: list[str]) -> DetectionResult | None:
-        has_go_mod = any(p.endswith("go.mod") for p in repo_files)
+        has_go_mod = self.has_markers(repo_files)
         looks_like_go = "go test" in log_text or "go: " in log_text or "go.mod" in log_text
         if not (has_go_mod or looks_like_go):
             return None
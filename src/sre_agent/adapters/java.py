@@ -9,23 +9,21 @@ from sre_agent.adapters.base import BaseAdapter, DetectionResult, ValidationStep
 class JavaAdapter(BaseAdapter):
     name = "java"
     supported_languages = ["java"]
+    marker_suffixes = ("pom.xml", "build.gradle", "build.gradle.kts")
 
     def detect(self, log_text: str, repo_files: list[str]) -> DetectionResult | None:
-        has_maven = any(p.endswith("pom.xml") for p in repo_files)
-        has_gradle = any(
-            p.endswith("build.gradle") or p.endswith("build.gradle.kts") for p in repo_files
-        )
+        has_build_file = self.has_markers(repo_files)
         looks_like_java = (
             "mvn" in log_text
             or "gradle" in log_text
             or "Could not resolve dependencies" in log_text
         )
-        if not (has_maven or has_gradle or looks_like_java):
+        if not (has_build_file or looks_like_java):
             return None
 
         evidence: list[str] = []
         category = "java_unknown"
-        confidence = 0.6 if (has_maven or has_gradle) else 0.35
+        confidence = 0.6 if has_build_file else 0.35
 
         missing_version = re.search(
             r"dependencies\.dependency\.version.*?for\s+([A-Za-z0-9_.-]+):([A-Za-z0-9_.-]+)\s+is missing",
@@ -9,9 +9,10 @@ from sre_agent.adapters.base import BaseAdapter, DetectionResult, ValidationStep
 class NodeAdapter(BaseAdapter):
     name = "node"
     supported_languages = ["javascript", "typescript"]
+    marker_suffixes = ("package.json",)
 
     def detect(self, log_text: str, repo_files: list[str]) -> DetectionResult | None:
-        has_package_json = any(p.endswith("package.json") for p in repo_files)
+        has_package_json = self.has_markers(repo_files)
         looks_like_node = (
             "npm ERR!" in log_text or "Cannot find module" in log_text or "ERR_PNPM" in log_text
         )
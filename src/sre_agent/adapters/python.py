@@ -8,19 +8,19 @@ from sre_agent.adapters.base import BaseAdapter, DetectionResult, ValidationStep
 class PythonAdapter(BaseAdapter):
     name = "python"
     supported_languages = ["python"]
+    marker_suffixes = ("pyproject.toml", "requirements.txt")
 
     def detect(self, log_text: str, repo_files: list[str]) -> DetectionResult | None:
-        has_pyproject = any(p.endswith("pyproject.toml") for p in repo_files)
-        has_requirements = any(p.endswith("requirements.txt") for p in repo_files)
+        has_markers = self.has_markers(repo_files)
         looks_like_python = (
             "Traceback (most recent call last)" in log_text or "ModuleNotFoundError" in log_text
         )
-        if not (has_pyproject or has_requirements or looks_like_python):
+        if not (has_markers or looks_like_python):
             return None
 
         evidence: list[str] = []
         category = "unknown"
-        confidence = 0.55 if (has_pyproject or has_requirements) else 0.35
+        confidence = 0.55 if has_markers else 0.35
 
         patterns = [
             r"ModuleNotFoundError: No module named ['\"]([^'\"]+)['\"]",
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import threading
 from dataclasses import dataclass
 
 from sre_agent.adapters.base import BaseAdapter, DetectionResult
@@ -25,19 +27,68 @@ _adapters: list[BaseAdapter] = [
 ]
 
 
+# Detections keyed by (adapter, log digest, has_markers). Pipelines select an
+# adapter twice per log, from the changed files and then from the full
+# checkout; the log analysis does not depend on which list is passed.
+_DETECTION_CACHE_MAX_ENTRIES = 256
+_detection_cache: dict[tuple[BaseAdapter, bytes, bool], DetectionResult | None] = {}
+_detection_cache_lock = threading.Lock()
+_MISSING = object()
+
+
 def register_adapters(adapters: list[BaseAdapter]) -> None:
     _adapters.clear()
     _adapters.extend(adapters)
+    with _detection_cache_lock:
+        _detection_cache.clear()
 
 
 def get_adapters() -> list[BaseAdapter]:
     return list(_adapters)
 
 
+def repo_marker_suffixes() -> tuple[str, ...] | None:
+    """Suffixes of every repo file the registered adapters can react to.
+
+    ``None`` when some adapter does not declare ``marker_suffixes`` and may
+    therefore need the complete file list.
+    """
+    suffixes: list[str] = []
+    for adapter in _adapters:
+        if not adapter.marker_suffixes:
+            return None
+        suffixes.extend(s for s in adapter.marker_suffixes if s not in suffixes)
+    return tuple(suffixes)
+
+
+def _log_digest(log_text: str) -> bytes:
+    data = log_text.encode("utf-8", "surrogatepass")
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _detect(
+    adapter: BaseAdapter, log_text: str, log_digest: bytes, repo_files: list[str]
+) -> DetectionResult | None:
+    if not adapter.marker_suffixes:
+        return adapter.detect(log_text, repo_files)
+    key = (adapter, log_digest, adapter.has_markers(repo_files))
+    with _detection_cache_lock:
+        cached = _detection_cache.get(key, _MISSING)
+    if cached is not _MISSING:
+        return cached
+    detection = adapter.detect(log_text, repo_files)
+    with _detection_cache_lock:
+        if len(_detection_cache) >= _DETECTION_CACHE_MAX_ENTRIES:
+            _detection_cache.pop(next(iter(_detection_cache)))
+        _detection_cache[key] = detection
+    return detection
+
+
 def select_adapter(log_text: str, repo_files: list[str]) -> SelectedAdapter | None:
     best: SelectedAdapter | None = None
+    log_digest = _log_digest(log_text)
     for adapter in _adapters:
-        detection = adapter.detect(log_text, repo_files)
+        detection = _detect(adapter, log_text, log_digest, repo_files)
         if detection is None:
             continue
         candidate = SelectedAdapter(adapter=adapter, detection=detection)
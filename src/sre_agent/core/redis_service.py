@@ -15,6 +15,7 @@ import asyncio
 import hashlib
 import json
 import logging
+import os
 import time
 from collections.abc import AsyncIterator, Callable
 from contextlib import asynccontextmanager
@@ -25,6 +26,7 @@ from uuid import UUID
 
 import redis.asyncio as redis
 from redis.asyncio import ConnectionPool, Redis
+from redis.asyncio.connection import SSLConnection, UnixDomainSocketConnection, parse_url
 from redis.asyncio.lock import Lock
 
 logger = logging.getLogger(__name__)
@@ -36,6 +38,11 @@ class RedisConfig:
 
     url: str = "redis://localhost:6379/0"
 
+    # Optional UNIX domain socket for a colocated Redis. When set and present
+    # on disk it replaces the TCP transport from ``url`` (db/credentials from
+    # ``url`` still apply). Not allowed together with a TLS (rediss://) URL.
+    unix_socket_path: Optional[str] = None
+
     # Connection pooling for high concurrency
     max_connections: int = 100
     min_idle_connections: int = 10
@@ -57,6 +64,12 @@ class RedisConfig:
     rate_limit_window_seconds: int = 60
     dedup_window_seconds: int = 300  # 5 minutes
 
+    # Pub/Sub batching: with a positive interval, messages are flushed in one
+    # pipeline every interval or once a batch fills up. The default of 0
+    # publishes each message immediately and returns its subscriber count.
+    publish_flush_interval_ms: int = 0
+    publish_batch_size: int = 50
+
 
 class RedisService:
     """Production-grade Redis service with connection pooling.
@@ -79,28 +92,58 @@ class RedisService:
         self._client: Optional[Redis] = None
         self._pubsub: Optional[redis.client.PubSub] = None
         self._subscriber_tasks: list[asyncio.Task] = []
+        self._publish_buffer: list[tuple[str, str]] = []
+        self._publish_pending: Optional[asyncio.Event] = None
+        self._publish_full: Optional[asyncio.Event] = None
+        self._publish_flusher_task: Optional[asyncio.Task] = None
+        self._publish_stopping = False
 
     async def connect(self) -> None:
         """Establish connection pool to Redis."""
         if self._pool is not None:
             return
 
-        self._pool = ConnectionPool.from_url(
-            self.config.url,
-            max_connections=self.config.max_connections,
-            socket_timeout=self.config.socket_timeout,
-            socket_connect_timeout=self.config.socket_connect_timeout,
-            retry_on_timeout=self.config.retry_on_timeout,
-            health_check_interval=self.config.health_check_interval,
-            decode_responses=True,
-        )
+        pool_kwargs: dict[str, Any] = {
+            "max_connections": self.config.max_connections,
+            "socket_timeout": self.config.socket_timeout,
+            "socket_connect_timeout": self.config.socket_connect_timeout,
+            "retry_on_timeout": self.config.retry_on_timeout,
+            "health_check_interval": self.config.health_check_interval,
+            "decode_responses": True,
+        }
+
+        socket_path = self.config.unix_socket_path
+        if socket_path and os.path.exists(socket_path):
+            url_kwargs = parse_url(self.config.url)
+            if url_kwargs.get("connection_class") is SSLConnection:
+                raise ValueError(
+                    "Redis unix_socket_path cannot be combined with a rediss:// URL: "
+                    "the socket connection would bypass TLS"
+                )
+            for key in ("host", "port", "path", "connection_class"):
+                url_kwargs.pop(key, None)
+            self._pool = ConnectionPool(
+                connection_class=UnixDomainSocketConnection,
+                path=socket_path,
+                **url_kwargs,
+                **pool_kwargs,
+            )
+            transport = f"unix://{socket_path}"
+        else:
+            if socket_path:
+                logger.warning(
+                    "Redis UNIX socket not found; falling back to TCP",
+                    extra={"path": socket_path},
+                )
+            self._pool = ConnectionPool.from_url(self.config.url, **pool_kwargs)
+            transport = self.config.url
 
         self._client = Redis(connection_pool=self._pool)
 
         # Verify connection
         try:
             await self._client.ping()
-            logger.info(f"Redis connected: {self.config.url}")
+            logger.info(f"Redis connected: {transport}")
         except Exception as e:
             logger.error(f"Redis connection failed: {e}")
             raise
@@ -112,6 +155,9 @@ class RedisService:
             task.cancel()
         self._subscriber_tasks.clear()
 
+        await self._stop_publish_flusher()
+        await self._flush_publish_buffer()
+
         if self._pubsub:
             await self._pubsub.aclose()
             self._pubsub = None
@@ -134,9 +180,13 @@ class RedisService:
             async with redis_service.get_client() as client:
                 await client.set("key", "value")
         """
+        yield await self._connected_client()
+
+    async def _connected_client(self) -> Redis:
+        """Return the shared client, connecting on first use."""
         if self._client is None:
             await self.connect()
-        yield self._client
+        return self._client
 
     def _key(self, *parts: str) -> str:
         """Build a namespaced key."""
@@ -164,24 +214,24 @@ class RedisService:
         Returns:
             True if added successfully
         """
-        async with self.get_client() as client:
-            key = self._key("blocklist", jti)
-            ttl = ttl_seconds or self.config.token_blocklist_ttl_seconds
-
-            data = {
-                "jti": jti,
-                "user_id": str(user_id) if user_id else None,
-                "reason": reason,
-                "blocked_at": datetime.now(UTC).isoformat(),
-            }
+        client = await self._connected_client()
+        key = self._key("blocklist", jti)
+        ttl = ttl_seconds or self.config.token_blocklist_ttl_seconds
 
-            await client.setex(key, ttl, json.dumps(data))
+        data = {
+            "jti": jti,
+            "user_id": str(user_id) if user_id else None,
+            "reason": reason,
+            "blocked_at": datetime.now(UTC).isoformat(),
+        }
 
-            # Also add to a set for bulk operations
-            await client.sadd(self._key("blocklist", "all"), jti)
+        await client.setex(key, ttl, json.dumps(data))
 
-            logger.info(f"Token blocklisted: {jti[:8]}... reason={reason}")
-            return True
+        # Also add to a set for bulk operations
+        await client.sadd(self._key("blocklist", "all"), jti)
+
+        logger.info(f"Token blocklisted: {jti[:8]}... reason={reason}")
+        return True
 
     async def is_blocklisted(self, jti: str) -> bool:
         """Check if a token is blocklisted.
@@ -192,9 +242,33 @@ class RedisService:
         Returns:
             True if token is blocklisted
         """
-        async with self.get_client() as client:
-            key = self._key("blocklist", jti)
-            return await client.exists(key) > 0
+        client = await self._connected_client()
+        key = self._key("blocklist", jti)
+        return await client.exists(key) > 0
+
+    async def are_blocklisted(self, jtis: list[str]) -> list[bool]:
+        """Check several token IDs against the blocklist in one round-trip.
+
+        Prefer this over repeated ``is_blocklisted`` calls when a request or
+        background sweep has to validate more than one token: collect the
+        JTIs first, then issue a single pipelined check.
+
+        Args:
+            jtis: JWT IDs to check
+
+        Returns:
+            Flags aligned with ``jtis``; True where the token is blocklisted
+        """
+        if not jtis:
+            return []
+
+        prefix = self._key("blocklist", "")
+        client = await self._connected_client()
+        async with client.pipeline(transaction=False) as pipe:
+            for jti in jtis:
+                pipe.exists(prefix + jti)
+            results = await pipe.execute()
+        return [int(r) > 0 for r in results]
 
     async def revoke_all_user_tokens(
         self,
@@ -213,23 +287,23 @@ class RedisService:
         Returns:
             Number of invalidation markers set
         """
-        async with self.get_client() as client:
-            key = self._key("user_revoked", str(user_id))
-
-            data = {
-                "user_id": str(user_id),
-                "revoked_at": datetime.now(UTC).isoformat(),
-                "reason": reason,
-            }
-
-            await client.setex(
-                key,
-                self.config.token_blocklist_ttl_seconds,
-                json.dumps(data),
-            )
+        client = await self._connected_client()
+        key = self._key("user_revoked", str(user_id))
+
+        data = {
+            "user_id": str(user_id),
+            "revoked_at": datetime.now(UTC).isoformat(),
+            "reason": reason,
+        }
+
+        await client.setex(
+            key,
+            self.config.token_blocklist_ttl_seconds,
+            json.dumps(data),
+        )
 
-            logger.warning(f"All tokens revoked for user: {user_id}")
-            return 1
+        logger.warning(f"All tokens revoked for user: {user_id}")
+        return 1
 
     async def is_user_tokens_revoked(
         self,
@@ -245,17 +319,17 @@ class RedisService:
         Returns:
             True if token was issued before revocation
         """
-        async with self.get_client() as client:
-            key = self._key("user_revoked", str(user_id))
-            data = await client.get(key)
+        client = await self._connected_client()
+        key = self._key("user_revoked", str(user_id))
+        data = await client.get(key)
 
-            if not data:
-                return False
+        if not data:
+            return False
 
-            revocation = json.loads(data)
-            revoked_at = datetime.fromisoformat(revocation["revoked_at"])
+        revocation = json.loads(data)
+        revoked_at = datetime.fromisoformat(revocation["revoked_at"])
 
-            return token_iat < revoked_at
+        return token_iat < revoked_at
 
     # =========================================
     # DISTRIBUTED RATE LIMITING
@@ -287,23 +361,22 @@ class RedisService:
         redis_key = self._key("ratelimit", key)
 
         try:
-            async with self.get_client() as client:
-                async with client.pipeline(transaction=True) as pipe:
-                    pipe.zremrangebyscore(redis_key, 0, window_start)
-                    pipe.zcard(redis_key)
-                    pipe.zadd(redis_key, {f"{now}:{id(now)}": now})
-                    pipe.expire(redis_key, window)
+            client = await self._connected_client()
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.zremrangebyscore(redis_key, 0, window_start)
+                pipe.zcard(redis_key)
+                pipe.zadd(redis_key, {f"{now}:{id(now)}": now})
+                pipe.expire(redis_key, window)
 
-                    results = await pipe.execute()
-                    current_count = results[1]
+                results = await pipe.execute()
+                current_count = results[1]
 
             if current_count >= limit:
                 retry_after = window
                 try:
-                    async with self.get_client() as client:
-                        oldest = await client.zrange(redis_key, 0, 0, withscores=True)
-                        if oldest:
-                            retry_after = int(oldest[0][1] + window - now) + 1
+                    oldest = await client.zrange(redis_key, 0, 0, withscores=True)
+                    if oldest:
+                        retry_after = int(oldest[0][1] + window - now) + 1
                 except Exception:
                     retry_after = window
 
@@ -340,12 +413,12 @@ class RedisService:
         redis_key = self._key("ratelimit", key)
 
         try:
-            async with self.get_client() as client:
-                await client.zremrangebyscore(redis_key, 0, window_start)
-                current_count = await client.zcard(redis_key)
+            client = await self._connected_client()
+            await client.zremrangebyscore(redis_key, 0, window_start)
+            current_count = await client.zcard(redis_key)
 
-                oldest = await client.zrange(redis_key, 0, 0, withscores=True)
-                reset_at = oldest[0][1] + window if oldest else now + window
+            oldest = await client.zrange(redis_key, 0, 0, withscores=True)
+            reset_at = oldest[0][1] + window if oldest else now + window
 
             return {
                 "limit": limit,
@@ -393,13 +466,13 @@ class RedisService:
         redis_key = self._key("dedup", operation, payload_hash)
 
         try:
-            async with self.get_client() as client:
-                existing = await client.get(redis_key)
+            client = await self._connected_client()
+            existing = await client.get(redis_key)
 
-                if existing:
-                    return True, existing
+            if existing:
+                return True, existing
 
-                return False, None
+            return False, None
         except Exception as e:
             logger.warning(
                 "Redis dedup unavailable; treating as not duplicate",
@@ -426,8 +499,8 @@ class RedisService:
         redis_key = self._key("dedup", operation, payload_hash)
 
         try:
-            async with self.get_client() as client:
-                await client.setex(redis_key, ttl, result_id)
+            client = await self._connected_client()
+            await client.setex(redis_key, ttl, result_id)
         except Exception as e:
             logger.warning(
                 "Redis dedup mark unavailable; skipping",
@@ -438,12 +511,12 @@ class RedisService:
         """Atomically increment a counter and apply/refresh TTL."""
         redis_key = self._key("counter", key)
         try:
-            async with self.get_client() as client:
-                async with client.pipeline(transaction=True) as pipe:
-                    pipe.incr(redis_key)
-                    pipe.expire(redis_key, int(ttl_seconds))
-                    results = await pipe.execute()
-                return int(results[0] or 0)
+            client = await self._connected_client()
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.incr(redis_key)
+                pipe.expire(redis_key, int(ttl_seconds))
+                results = await pipe.execute()
+            return int(results[0] or 0)
         except Exception as e:
             logger.warning(
                 "Redis counter increment unavailable; returning conservative fallback",
@@ -487,27 +560,27 @@ class RedisService:
             True if lock acquired
         """
         try:
-            async with self.get_client() as client:
-                lock = Lock(
-                    client,
-                    self._key("lock", name),
-                    timeout=timeout,
-                    blocking=blocking,
-                    blocking_timeout=blocking_timeout,
-                )
+            client = await self._connected_client()
+            lock = Lock(
+                client,
+                self._key("lock", name),
+                timeout=timeout,
+                blocking=blocking,
+                blocking_timeout=blocking_timeout,
+            )
 
-                acquired = await lock.acquire()
-                try:
-                    yield acquired
-                finally:
-                    if acquired:
-                        try:
-                            await lock.release()
-                        except Exception:
-                            logger.warning(
-                                "Redis lock release failed",
-                                extra={"lock": name},
-                            )
+            acquired = await lock.acquire()
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    try:
+                        await lock.release()
+                    except Exception:
+                        logger.warning(
+                            "Redis lock release failed",
+                            extra={"lock": name},
+                        )
         except Exception as e:
             logger.warning(
                 "Redis lock unavailable; proceeding without lock",
@@ -519,22 +592,22 @@ class RedisService:
         self, *, repo: str, limit: int, ttl_seconds: int
     ) -> bool:
         try:
-            async with self.get_client() as client:
-                key = self._key("concurrency", f"repo:{repo}")
-                script = """
-                local key = KEYS[1]
-                local limit = tonumber(ARGV[1])
-                local ttl = tonumber(ARGV[2])
-                local current = tonumber(redis.call('GET', key) or '0')
-                if current >= limit then
-                  return 0
-                end
-                redis.call('INCR', key)
-                redis.call('EXPIRE', key, ttl)
-                return 1
-                """
-                res = await client.eval(script, 1, key, str(limit), str(ttl_seconds))
-                return bool(res)
+            client = await self._connected_client()
+            key = self._key("concurrency", f"repo:{repo}")
+            script = """
+            local key = KEYS[1]
+            local limit = tonumber(ARGV[1])
+            local ttl = tonumber(ARGV[2])
+            local current = tonumber(redis.call('GET', key) or '0')
+            if current >= limit then
+              return 0
+            end
+            redis.call('INCR', key)
+            redis.call('EXPIRE', key, ttl)
+            return 1
+            """
+            res = await client.eval(script, 1, key, str(limit), str(ttl_seconds))
+            return bool(res)
         except Exception as e:
             logger.warning(
                 "Redis repo concurrency unavailable; allowing",
@@ -544,18 +617,18 @@ class RedisService:
 
     async def release_repo_concurrency(self, *, repo: str) -> None:
         try:
-            async with self.get_client() as client:
-                key = self._key("concurrency", f"repo:{repo}")
-                script = """
-                local key = KEYS[1]
-                local current = tonumber(redis.call('GET', key) or '0')
-                if current <= 1 then
-                  redis.call('DEL', key)
-                  return 0
-                end
-                return redis.call('DECR', key)
-                """
-                await client.eval(script, 1, key)
+            client = await self._connected_client()
+            key = self._key("concurrency", f"repo:{repo}")
+            script = """
+            local key = KEYS[1]
+            local current = tonumber(redis.call('GET', key) or '0')
+            if current <= 1 then
+              redis.call('DEL', key)
+              return 0
+            end
+            return redis.call('DECR', key)
+            """
+            await client.eval(script, 1, key)
         except Exception as e:
             logger.warning(
                 "Redis repo concurrency release unavailable; skipping",
@@ -568,11 +641,11 @@ class RedisService:
 
     async def cache_get(self, key: str) -> Optional[Any]:
         """Get a cached value."""
-        async with self.get_client() as client:
-            data = await client.get(self._key("cache", key))
-            if data:
-                return json.loads(data)
-            return None
+        client = await self._connected_client()
+        data = await client.get(self._key("cache", key))
+        if data:
+            return json.loads(data)
+        return None
 
     async def cache_set(
         self,
@@ -582,17 +655,17 @@ class RedisService:
     ) -> None:
         """Set a cached value."""
         ttl = ttl_seconds or self.config.default_ttl_seconds
-        async with self.get_client() as client:
-            await client.setex(
-                self._key("cache", key),
-                ttl,
-                json.dumps(value, default=str),
-            )
+        client = await self._connected_client()
+        await client.setex(
+            self._key("cache", key),
+            ttl,
+            json.dumps(value, default=str),
+        )
 
     async def cache_delete(self, key: str) -> None:
         """Delete a cached value."""
-        async with self.get_client() as client:
-            await client.delete(self._key("cache", key))
+        client = await self._connected_client()
+        await client.delete(self._key("cache", key))
 
     async def cache_get_or_set(
         self,
@@ -619,17 +692,90 @@ class RedisService:
     async def publish(self, channel: str, message: dict[str, Any]) -> int:
         """Publish a message to a channel.
 
+        When batching is enabled (``publish_flush_interval_ms > 0``) the
+        message is queued and sent with other pending messages in a single
+        pipeline by the background flusher.
+
         Args:
             channel: Channel name
             message: Message to publish
 
         Returns:
-            Number of subscribers that received the message
+            Number of subscribers that received the message, or 0 when the
+            message was queued for a batched flush
+        """
+        redis_channel = self._key("channel", channel)
+        data = json.dumps(message, default=str)
+
+        client = await self._connected_client()
+        if self.config.publish_flush_interval_ms <= 0:
+            return await client.publish(redis_channel, data)
+
+        self._ensure_publish_flusher()
+        self._publish_buffer.append((redis_channel, data))
+        self._publish_pending.set()
+        if len(self._publish_buffer) >= self.config.publish_batch_size:
+            self._publish_full.set()
+        return 0
+
+    def _ensure_publish_flusher(self) -> None:
+        """Make sure a flusher runs on the current event loop.
+
+        Each ``asyncio.run`` (Celery tasks, ``run_fix_pipeline_sync``) has its
+        own loop, and a flusher started on an earlier one died when that loop
+        closed. A fresh flusher picks up whatever that one left buffered.
         """
-        async with self.get_client() as client:
-            return await client.publish(
-                self._key("channel", channel),
-                json.dumps(message, default=str),
+        task = self._publish_flusher_task
+        loop = asyncio.get_running_loop()
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._publish_stopping = False
+        self._publish_pending = asyncio.Event()
+        self._publish_full = asyncio.Event()
+        self._publish_flusher_task = loop.create_task(self._publish_flusher())
+        if self._publish_buffer:
+            self._publish_pending.set()
+
+    async def _stop_publish_flusher(self) -> None:
+        """Let the flusher finish its in-flight batch, then wait for it to exit."""
+        task, self._publish_flusher_task = self._publish_flusher_task, None
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            return
+        self._publish_stopping = True
+        self._publish_pending.set()
+        self._publish_full.set()
+        await task
+
+    async def _publish_flusher(self) -> None:
+        """Flush queued messages every interval or when a batch fills up."""
+        interval = self.config.publish_flush_interval_ms / 1000
+        while not self._publish_stopping:
+            await self._publish_pending.wait()
+            try:
+                await asyncio.wait_for(self._publish_full.wait(), timeout=interval)
+            except TimeoutError:
+                pass
+            self._publish_pending.clear()
+            self._publish_full.clear()
+            await self._flush_publish_buffer()
+
+    async def _flush_publish_buffer(self) -> None:
+        """Send all queued messages, one pipeline per batch."""
+        batch, self._publish_buffer = self._publish_buffer, []
+        if not batch or self._client is None:
+            return
+
+        size = max(1, self.config.publish_batch_size)
+        try:
+            for start in range(0, len(batch), size):
+                async with self._client.pipeline(transaction=False) as pipe:
+                    for redis_channel, data in batch[start : start + size]:
+                        pipe.publish(redis_channel, data)
+                    await pipe.execute()
+        except Exception as e:
+            logger.warning(
+                "Redis publish flush failed; dropping batch",
+                extra={"count": len(batch), "error": str(e)},
             )
 
     async def subscribe(
@@ -644,8 +790,8 @@ class RedisService:
             handler: Async function to handle messages
         """
         if self._pubsub is None:
-            async with self.get_client() as client:
-                self._pubsub = client.pubsub()
+            client = await self._connected_client()
+            self._pubsub = client.pubsub()
 
         await self._pubsub.subscribe(self._key("channel", channel))
 
@@ -671,17 +817,17 @@ class RedisService:
     async def health_check(self) -> dict[str, Any]:
         """Check Redis health and get stats."""
         try:
-            async with self.get_client() as client:
-                info = await client.info("server", "clients", "memory", "stats")
-
-                return {
-                    "status": "healthy",
-                    "version": info.get("redis_version"),
-                    "connected_clients": info.get("connected_clients"),
-                    "used_memory_human": info.get("used_memory_human"),
-                    "total_commands_processed": info.get("total_commands_processed"),
-                    "uptime_in_seconds": info.get("uptime_in_seconds"),
-                }
+            client = await self._connected_client()
+            info = await client.info("server", "clients", "memory", "stats")
+
+            return {
+                "status": "healthy",
+                "version": info.get("redis_version"),
+                "connected_clients": info.get("connected_clients"),
+                "used_memory_human": info.get("used_memory_human"),
+                "total_commands_processed": info.get("total_commands_processed"),
+                "uptime_in_seconds": info.get("uptime_in_seconds"),
+            }
         except Exception as e:
             return {
                 "status": "unhealthy",
@@ -700,7 +846,12 @@ def get_redis_service() -> RedisService:
         from sre_agent.config import get_settings
 
         settings = get_settings()
-        config = RedisConfig(url=settings.redis_url)
+        config = RedisConfig(
+            url=settings.redis_url,
+            unix_socket_path=settings.redis_unix_socket_path or None,
+            publish_flush_interval_ms=settings.redis_publish_flush_interval_ms,
+            publish_batch_size=settings.redis_publish_batch_size,
+        )
         _redis_service = RedisService(config)
     return _redis_service
 
@@ -4,9 +4,9 @@ GitHub uses HMAC-SHA256 for webhook signature verification.
 Reference: https://docs.github.com/en/webhooks/using-webhooks/validating-webhook-deliveries
 """
 
-import hashlib
 import hmac
 import logging
+from functools import lru_cache
 from typing import Annotated
 
 from fastapi import Depends, Header, HTTPException, Request, status
@@ -15,6 +15,9 @@ from sre_agent.config import Settings, get_settings
 
 logger = logging.getLogger(__name__)
 
+# "sha256=" followed by 64 hex characters
+_SIGNATURE_HEADER_LENGTH = 7 + 64
+
 
 class WebhookSignatureError(Exception):
     """Raised when webhook signature verification fails."""
@@ -22,6 +25,42 @@ class WebhookSignatureError(Exception):
     pass
 
 
+@lru_cache(maxsize=4)
+def _hmac_template(secret: str) -> hmac.HMAC:
+    """Return a keyed HMAC-SHA256 object to ``copy()`` per verification.
+
+    Keying (padding the secret into the inner/outer hash states) is done once
+    per secret instead of on every webhook delivery. The digest is named so
+    CPython binds OpenSSL's HMAC directly (SHA-NI accelerated where the CPU
+    supports it) rather than composing two Python-level hash objects.
+    """
+    return hmac.new(secret.encode("utf-8"), digestmod="sha256")
+
+
+def _parse_signature_header(signature_header: str | None) -> bytes:
+    """Decode the X-Hub-Signature-256 header into the expected raw digest."""
+    if not signature_header:
+        raise WebhookSignatureError("Missing X-Hub-Signature-256 header")
+
+    if not signature_header.startswith("sha256="):
+        raise WebhookSignatureError("Invalid signature format")
+
+    if len(signature_header) != _SIGNATURE_HEADER_LENGTH:
+        raise WebhookSignatureError("Signature mismatch")
+
+    # Extract the signature from header ("sha256=" prefix removed)
+    try:
+        return bytes.fromhex(signature_header[7:])
+    except ValueError:
+        raise WebhookSignatureError("Signature mismatch")
+
+
+def _check_digest(expected_signature: bytes, computed_signature: bytes) -> None:
+    """Timing-safe comparison of the expected and computed digests."""
+    if not hmac.compare_digest(expected_signature, computed_signature):
+        raise WebhookSignatureError("Signature mismatch")
+
+
 def verify_github_signature(
     payload: bytes,
     signature_header: str | None,
@@ -41,26 +80,13 @@ def verify_github_signature(
     Raises:
         WebhookSignatureError: If signature is missing, malformed, or invalid
     """
-    if not signature_header:
-        raise WebhookSignatureError("Missing X-Hub-Signature-256 header")
-
-    if not signature_header.startswith("sha256="):
-        raise WebhookSignatureError("Invalid signature format")
-
-    # Extract the signature from header
-    expected_signature = signature_header[7:]  # Remove "sha256=" prefix
+    expected_signature = _parse_signature_header(signature_header)
 
-    # Calculate HMAC-SHA256 of the payload
-    computed_signature = hmac.new(
-        key=secret.encode("utf-8"),
-        msg=payload,
-        digestmod=hashlib.sha256,
-    ).hexdigest()
-
-    # Use timing-safe comparison to prevent timing attacks
-    if not hmac.compare_digest(expected_signature, computed_signature):
-        raise WebhookSignatureError("Signature mismatch")
+    # Calculate HMAC-SHA256 of the payload from the pre-keyed template
+    mac = _hmac_template(secret).copy()
+    mac.update(payload)
 
+    _check_digest(expected_signature, mac.digest())
     return True
 
 
@@ -74,8 +100,9 @@ async def get_verified_github_payload(
     """
     FastAPI dependency for verified GitHub webhook payloads.
 
-    Reads the raw request body, verifies the signature, and returns
-    the payload along with event type and delivery ID.
+    Streams the raw request body through HMAC-SHA256 as it arrives,
+    verifies the signature, and returns the payload along with event
+    type and delivery ID.
 
     Args:
         request: FastAPI request object
@@ -90,6 +117,7 @@ async def get_verified_github_payload(
     Raises:
         HTTPException 401: If signature verification fails
         HTTPException 400: If required headers are missing
+        HTTPException 413: If the body exceeds the configured size limit
     """
     # Validate required headers
     if not x_github_event:
@@ -106,8 +134,21 @@ async def get_verified_github_payload(
             detail="Missing X-GitHub-Delivery header",
         )
 
-    # Read raw body
-    body = await request.body()
+    # Reject oversized deliveries before reading or hashing any of the body
+    max_bytes = settings.github_webhook_max_bytes
+    try:
+        content_length = int(request.headers.get("content-length", "0"))
+    except ValueError:
+        content_length = 0
+    if content_length > max_bytes:
+        logger.warning(
+            "Webhook payload too large",
+            extra={"delivery_id": x_github_delivery, "content_length": content_length},
+        )
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Payload too large",
+        )
 
     # Skip signature verification in dev mode if secret is not configured
     if not settings.github_webhook_secret:
@@ -118,15 +159,25 @@ async def get_verified_github_payload(
                 detail="Server configuration error",
             )
         logger.warning("Webhook signature verification skipped (no secret configured)")
+        body = await request.body()
         return body, x_github_event, x_github_delivery
 
-    # Verify signature
+    # Verify signature, hashing body chunks as they are received
     try:
-        verify_github_signature(
-            payload=body,
-            signature_header=x_hub_signature_256,
-            secret=settings.github_webhook_secret,
-        )
+        expected_signature = _parse_signature_header(x_hub_signature_256)
+
+        mac = _hmac_template(settings.github_webhook_secret).copy()
+        buffer = bytearray()
+        async for chunk in request.stream():
+            mac.update(chunk)
+            buffer.extend(chunk)
+            if len(buffer) > max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail="Payload too large",
+                )
+
+        _check_digest(expected_signature, mac.digest())
         logger.debug(
             "Webhook signature verified",
             extra={"delivery_id": x_github_delivery, "event": x_github_event},
@@ -145,4 +196,5 @@ async def get_verified_github_payload(
             detail=f"Signature verification failed: {e}",
         )
 
+    body = bytes(buffer)
     return body, x_github_event, x_github_delivery
@@ -4,6 +4,11 @@ Production-grade database configuration with:
 - Connection pooling optimized for high concurrency
 - Health checks and pool monitoring
 - Context managers for proper session handling
+- A native asyncpg pool for hot read paths when Postgres is the backend
+
+Each process opens at most ``database_max_connections`` Postgres connections:
+the native pool's ``database_asyncpg_pool_max_size`` is taken out of that
+budget and SQLAlchemy's pool plus overflow get the rest.
 
 The engine and session factory are created lazily so that environment-driven
 ``Settings`` changes (e.g. tests pointing at an in-memory SQLite URL) are
@@ -12,10 +17,13 @@ respected. Use ``reset_engine()`` in tests after monkey-patching the URL.
 
 from __future__ import annotations
 
+import json
 from collections.abc import AsyncGenerator, AsyncIterator
 from contextlib import asynccontextmanager
 from typing import Any
 
+import asyncpg
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -27,6 +35,37 @@ from sre_agent.config import get_settings
 
 _engine: AsyncEngine | None = None
 _session_factory: async_sessionmaker[AsyncSession] | None = None
+_asyncpg_pool: asyncpg.Pool | None = None
+
+_ASYNCPG_URL_PREFIX = "postgresql+asyncpg://"
+# Short OLTP queries gain nothing from JIT; a larger prepared-statement cache
+# lets repeated reads skip parse/plan.
+_ASYNCPG_SERVER_SETTINGS = {"jit": "off"}
+_ASYNCPG_STATEMENT_CACHE_SIZE = 1024
+_ORM_POOL_SIZE = 20
+_ASYNCPG_POOL_MIN_SIZE = 5
+
+
+def _json_dumps(value: Any) -> str:
+    """Serialize a JSON column value.
+
+    Pydantic models may be bound directly and are encoded by
+    ``model_dump_json`` without building an intermediate dict.
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump_json()
+    return json.dumps(value)
+
+
+def _orm_pool_limits(url: str) -> tuple[int, int]:
+    """``(pool_size, max_overflow)`` for SQLAlchemy within the connection budget."""
+    settings = get_settings()
+    budget = settings.database_max_connections
+    if url.startswith(_ASYNCPG_URL_PREFIX):
+        budget -= max(0, settings.database_asyncpg_pool_max_size)
+    budget = max(1, budget)
+    pool_size = min(_ORM_POOL_SIZE, budget)
+    return pool_size, budget - pool_size
 
 
 def _build_engine() -> AsyncEngine:
@@ -36,16 +75,32 @@ def _build_engine() -> AsyncEngine:
 
     # SQLite (used by tests) doesn't accept pool_size/max_overflow/recycle.
     if url.startswith("sqlite"):
-        return create_async_engine(url, echo=settings.debug, future=True)
+        return create_async_engine(
+            url, echo=settings.debug, future=True, json_serializer=_json_dumps
+        )
+
+    connect_args: dict[str, Any] = {}
+    if url.startswith(_ASYNCPG_URL_PREFIX):
+        connect_args = {
+            "server_settings": _ASYNCPG_SERVER_SETTINGS,
+            "statement_cache_size": _ASYNCPG_STATEMENT_CACHE_SIZE,
+        }
 
+    pool_size, max_overflow = _orm_pool_limits(url)
+    # LIFO checkout keeps bursts on a small warm set of connections so the
+    # rest idle out and get recycled instead of all staying half-warm.
     return create_async_engine(
         url,
         echo=settings.debug,
         pool_pre_ping=True,
-        pool_size=20,
-        max_overflow=30,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
         pool_recycle=1800,
         pool_timeout=30,
+        pool_use_lifo=True,
+        pool_reset_on_return="rollback",
+        connect_args=connect_args,
+        json_serializer=_json_dumps,
     )
 
 
@@ -71,6 +126,74 @@ def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
     return _session_factory
 
 
+async def _init_asyncpg_connection(conn: asyncpg.Connection) -> None:
+    """Decode JSON/JSONB columns to Python objects like the ORM does."""
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name, encoder=_json_dumps, decoder=json.loads, schema="pg_catalog"
+        )
+
+
+async def get_asyncpg_pool() -> asyncpg.Pool | None:
+    """Return the process-wide asyncpg pool, or None when not on Postgres.
+
+    Also None when ``database_asyncpg_pool_max_size`` is 0, which sends every
+    query through SQLAlchemy.
+
+    Read-only hot paths can use it to skip SQLAlchemy's pool checkout and ORM
+    session overhead; writes keep going through ``get_async_session``.
+    """
+    global _asyncpg_pool
+    if _asyncpg_pool is not None:
+        return _asyncpg_pool
+
+    settings = get_settings()
+    url = settings.database_url
+    max_size = settings.database_asyncpg_pool_max_size
+    if not url.startswith(_ASYNCPG_URL_PREFIX) or max_size <= 0:
+        return None
+
+    pool = await asyncpg.create_pool(
+        "postgresql://" + url[len(_ASYNCPG_URL_PREFIX) :],
+        min_size=min(_ASYNCPG_POOL_MIN_SIZE, max_size),
+        max_size=max_size,
+        max_queries=10000,
+        max_inactive_connection_lifetime=600,
+        statement_cache_size=_ASYNCPG_STATEMENT_CACHE_SIZE,
+        server_settings=_ASYNCPG_SERVER_SETTINGS,
+        init=_init_asyncpg_connection,
+    )
+    if _asyncpg_pool is not None:
+        # Another caller won the race while this pool was connecting.
+        await pool.close()
+        return _asyncpg_pool
+    _asyncpg_pool = pool
+    return pool
+
+
+@asynccontextmanager
+async def get_asyncpg_conn() -> AsyncIterator[asyncpg.Connection]:
+    """Context manager for a raw asyncpg connection from the native pool.
+
+    Usage::
+
+        async with get_asyncpg_conn() as conn:
+            row = await conn.fetchrow("SELECT ... WHERE id = $1", some_id)
+    """
+    pool = await get_asyncpg_pool()
+    if pool is None:
+        raise RuntimeError("asyncpg pool requires a postgresql+asyncpg DATABASE_URL")
+    async with pool.acquire() as conn:
+        yield conn
+
+
+async def _close_asyncpg_pool() -> None:
+    global _asyncpg_pool
+    if _asyncpg_pool is not None:
+        await _asyncpg_pool.close()
+    _asyncpg_pool = None
+
+
 async def reset_engine() -> None:
     """Dispose of the current engine and forget cached factories.
 
@@ -81,6 +204,7 @@ async def reset_engine() -> None:
         await _engine.dispose()
     _engine = None
     _session_factory = None
+    await _close_asyncpg_pool()
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
@@ -135,6 +259,7 @@ async def close_database() -> None:
         await _engine.dispose()
     _engine = None
     _session_factory = None
+    await _close_asyncpg_pool()
 
 
 def __getattr__(name: str) -> Any:
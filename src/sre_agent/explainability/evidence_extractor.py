@@ -1,10 +1,27 @@
 from __future__ import annotations
 
+import hashlib
+import heapq
+import logging
 import re
+import threading
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
+from itertools import groupby
 
 from sre_agent.explainability.redactor import get_redactor
 
+logger = logging.getLogger(__name__)
+
+# Optional: Hyperscan finds all trigger literals across the whole log in one
+# SIMD pass. Without it each literal is located with str.find instead.
+try:
+    import hyperscan
+
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
 
 @dataclass(frozen=True)
 class EvidenceLine:
@@ -14,70 +31,290 @@ class EvidenceLine:
     operation_idx: int | None = None
 
 
+# CI logs are ASCII in practice; re.ASCII keeps \b, \s and case folding on
+# the cheap ASCII tables instead of full Unicode case folding.
+_FLAGS = re.IGNORECASE | re.ASCII
+
 _TAG_PATTERNS: list[tuple[str, re.Pattern[str]]] = [
-    ("root-cause", re.compile(r"ModuleNotFoundError: No module named", re.IGNORECASE)),
-    ("root-cause", re.compile(r"No module named ['\"][^'\"]+['\"]", re.IGNORECASE)),
-    ("root-cause", re.compile(r"Cannot find module ['\"][^'\"]+['\"]", re.IGNORECASE)),
-    ("root-cause", re.compile(r"missing go\.sum entry", re.IGNORECASE)),
-    ("root-cause", re.compile(r"no required module provides package", re.IGNORECASE)),
-    ("root-cause", re.compile(r"dependencies\.dependency\.version.*is missing", re.IGNORECASE)),
-    ("root-cause", re.compile(r"failed to solve:", re.IGNORECASE)),
-    ("test-failure", re.compile(r"^FAILED\b", re.IGNORECASE)),
-    ("test-failure", re.compile(r"\bFAIL\b", re.IGNORECASE)),
-    ("npm", re.compile(r"\bnpm ERR!\b", re.IGNORECASE)),
-    ("go", re.compile(r"^\s*go:\s", re.IGNORECASE)),
-    ("maven", re.compile(r"^\[ERROR\]", re.IGNORECASE)),
-    ("docker", re.compile(r"\bdocker build\b", re.IGNORECASE)),
+    ("root-cause", re.compile(r"ModuleNotFoundError: No module named", _FLAGS)),
+    # Quoted module names are bounded so an unterminated quote on a very long
+    # line cannot make each candidate start position scan to the end of line.
+    ("root-cause", re.compile(r"No module named ['\"][^'\"]{1,256}['\"]", _FLAGS)),
+    ("root-cause", re.compile(r"Cannot find module ['\"][^'\"]{1,256}['\"]", _FLAGS)),
+    ("root-cause", re.compile(r"missing go\.sum entry", _FLAGS)),
+    ("root-cause", re.compile(r"no required module provides package", _FLAGS)),
+    (
+        "root-cause",
+        re.compile(r"dependencies\.dependency\.version.{0,512}?is missing", _FLAGS),
+    ),
+    ("root-cause", re.compile(r"failed to solve:", _FLAGS)),
+    ("test-failure", re.compile(r"^FAILED\b", _FLAGS)),
+    ("test-failure", re.compile(r"\bFAIL\b", _FLAGS)),
+    ("npm", re.compile(r"\bnpm ERR!\b", _FLAGS)),
+    ("go", re.compile(r"^\s*go:\s", _FLAGS)),
+    ("maven", re.compile(r"^\[ERROR\]", _FLAGS)),
+    ("docker", re.compile(r"\bdocker build\b", _FLAGS)),
 ]
 
 
-def extract_evidence_lines(log_text: str, *, max_lines: int = 30) -> list[EvidenceLine]:
-    redactor = get_redactor()
-    lines = log_text.splitlines()
-    candidates: list[EvidenceLine] = []
+# Patterns sharing a tag are contiguous above, so folding each run into one
+# alternation keeps "first matching tag wins" while invoking the regex engine
+# once per tag instead of once per pattern.
+_TAG_GROUPS: list[tuple[str, re.Pattern[str]]] = [
+    (tag, re.compile("|".join(f"(?:{pat.pattern})" for _, pat in group), _FLAGS))
+    for tag, group in groupby(_TAG_PATTERNS, key=lambda item: item[0])
+]
+
+# Literals implied by at least one pattern above. A line containing none of
+# them cannot match any tag, so the per-pattern regexes are skipped for it.
+_TRIGGER_LITERALS = (
+    "no module named",
+    "cannot find module",
+    "missing go.sum entry",
+    "no required module provides package",
+    "dependencies.dependency.version",
+    "fail",
+    "npm err!",
+    "go:",
+    "[error]",
+    "docker build",
+)
+_TAG_TRIGGER = re.compile("|".join(re.escape(literal) for literal in _TRIGGER_LITERALS), _FLAGS)
+
+# Line breaks str.splitlines() honours besides "\n". Logs without them can be
+# scanned as a whole and only the lines holding a trigger literal visited.
+_OTHER_LINE_BREAKS = re.compile(r"[\r\v\f\x1c-\x1e\x85\u2028\u2029]")
+
+_TRACEBACK_MARKER = "Traceback (most recent call last)"
+_STACK_TRACE_WINDOW = 20
+
+# Logs are split a block at a time so only one block's lines are alive at once.
+_SPLIT_BLOCK_CHARS = 1 << 20
+
+
+_TAG_PRIORITY = {
+    "root-cause": 0,
+    "stack-trace": 1,
+    "test-failure": 2,
+    "maven": 3,
+    "go": 3,
+    "npm": 3,
+    "docker": 3,
+}
+_STACK_TRACE_PRIORITY = _TAG_PRIORITY["stack-trace"]
+
+# (log digest, max_lines) -> evidence. Provenance artifacts of retried and
+# resumed runs re-extract the same stored log, so results are kept by content.
+_EVIDENCE_CACHE_MAX_ENTRIES = 256
+_evidence_cache: dict[tuple[bytes, int], tuple[EvidenceLine, ...]] = {}
+_evidence_cache_lock = threading.Lock()
+
+
+def _build_hyperscan_db() -> hyperscan.Database | None:
+    if not HYPERSCAN_AVAILABLE:
+        return None
+    try:
+        db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        db.compile(
+            expressions=[re.escape(literal).encode("ascii") for literal in _TRIGGER_LITERALS],
+            ids=list(range(len(_TRIGGER_LITERALS))),
+            elements=len(_TRIGGER_LITERALS),
+            flags=[hyperscan.HS_FLAG_CASELESS] * len(_TRIGGER_LITERALS),
+        )
+    except Exception:
+        logger.warning("Hyperscan database compilation failed; using regex scan", exc_info=True)
+        return None
+    return db
+
+
+_HYPERSCAN_DB = _build_hyperscan_db()
+
+# A scratch space serves one scan at a time and extraction runs on the explain
+# thread pool, so every thread scans with its own.
+_hyperscan_local = threading.local()
+
+
+def _hyperscan_scratch() -> hyperscan.Scratch:
+    scratch = getattr(_hyperscan_local, "scratch", None)
+    if scratch is None:
+        scratch = _hyperscan_local.scratch = hyperscan.Scratch(_HYPERSCAN_DB)
+    return scratch
+
+
+def _trigger_offsets(text: str) -> Iterable[int]:
+    """Ascending offsets that fall inside a trigger literal, possibly repeated."""
+    if not text.isascii():
+        return (m.start() for m in _TAG_TRIGGER.finditer(text))
+
+    offsets: list[int] = []
+    if _HYPERSCAN_DB is not None:
+
+        def on_match(_id: int, _start: int, end: int, _flags: int, _context: object) -> None:
+            offsets.append(end - 1)
 
-    for i, raw in enumerate(lines, start=1):
-        if not raw.strip():
+        _HYPERSCAN_DB.scan(
+            text.encode("ascii"), match_event_handler=on_match, scratch=_hyperscan_scratch()
+        )
+    else:
+        # For ASCII, lower() keeps offsets and matches re.IGNORECASE | re.ASCII;
+        # str.find per literal is far cheaper than the case-folding alternation.
+        lowered = text.lower()
+        for literal in _TRIGGER_LITERALS:
+            pos = lowered.find(literal)
+            while pos >= 0:
+                offsets.append(pos)
+                pos = lowered.find(literal, pos + 1)
+    offsets.sort()
+    return offsets
+
+
+def _has_other_line_breaks(text: str) -> bool:
+    if text.isascii():
+        return any(ch in text for ch in "\r\v\f\x1c\x1d\x1e")
+    return _OTHER_LINE_BREAKS.search(text) is not None
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Yield ``text.splitlines()`` without materializing the full line list.
+
+    Blocks are cut just after a ``\\n`` so no line (or ``\\r\\n`` pair) straddles
+    two blocks, and each block is split by the C ``splitlines``.
+    """
+    start = 0
+    end = len(text)
+    while start < end:
+        cut = text.find("\n", start + _SPLIT_BLOCK_CHARS)
+        stop = end if cut < 0 else cut + 1
+        yield from text[start:stop].splitlines()
+        start = stop
+
+
+def _scan_all_lines(text: str) -> Iterator[tuple[int, str, bool]]:
+    """Yield ``(idx, line, in_stack_trace)`` for every line of ``text``."""
+    traceback_seen = False
+    stack_remaining = 0
+    for i, raw in enumerate(_iter_lines(text), start=1):
+        if not traceback_seen and _TRACEBACK_MARKER in raw:
+            traceback_seen = True
+            stack_remaining = _STACK_TRACE_WINDOW
+        in_stack_trace = stack_remaining > 0
+        if in_stack_trace:
+            stack_remaining -= 1
+        yield i, raw, in_stack_trace
+
+
+def _scan_candidate_lines(text: str) -> Iterator[tuple[int, str, bool]]:
+    """Like ``_scan_all_lines`` for ``\\n``-only text, skipping lines that cannot rank.
+
+    Only lines holding a trigger literal or inside the traceback window are
+    sliced out; line numbers are recovered by counting newlines in between.
+    """
+    lines: dict[int, str] = {}
+    idx = 1
+    pos = 0  # start of line ``idx``
+    for offset in _trigger_offsets(text):
+        if offset < pos:
             continue
-        for tag, pat in _TAG_PATTERNS:
+        idx += text.count("\n", pos, offset)
+        start = text.rfind("\n", pos, offset) + 1 or pos
+        end = text.find("\n", offset)
+        if end < 0:
+            end = len(text)
+        lines[idx] = text[start:end]
+        idx += 1
+        pos = end + 1
+
+    stack_first = stack_last = 0
+    marker = text.find(_TRACEBACK_MARKER)
+    if marker >= 0:
+        stack_first = text.count("\n", 0, marker) + 1
+        stack_last = stack_first + _STACK_TRACE_WINDOW - 1
+        start = text.rfind("\n", 0, marker) + 1
+        for stack_idx in range(stack_first, stack_last + 1):
+            if start > len(text):
+                break
+            end = text.find("\n", start)
+            if end < 0:
+                end = len(text)
+            lines.setdefault(stack_idx, text[start:end])
+            start = end + 1
+
+    for i in sorted(lines):
+        yield i, lines[i], stack_first <= i <= stack_last
+
+
+def _rank_line(raw: str, in_stack_trace: bool) -> tuple[int, str] | None:
+    """Return ``(priority, tag)`` for the best tag of a line, if any."""
+    if not raw.strip():
+        return None
+    best: tuple[int, str] | None = None
+    if in_stack_trace:
+        best = (_STACK_TRACE_PRIORITY, "stack-trace")
+    if _TAG_TRIGGER.search(raw):
+        for tag, pat in _TAG_GROUPS:
             if pat.search(raw):
-                candidates.append(EvidenceLine(idx=i, line=redactor.redact_text(raw), tag=tag))
+                priority = _TAG_PRIORITY.get(tag, 10)
+                if best is None or priority < best[0]:
+                    best = (priority, tag)
                 break
+    return best
+
+
+def extract_evidence_lines(log_text: str, *, max_lines: int = 30) -> list[EvidenceLine]:
+    """Return the highest-priority evidence lines of a CI log, redacted.
+
+    Lines are ranked by tag priority, then position. Only the best ``max_lines``
+    are kept while scanning (a bounded max-heap), so memory beyond the input
+    stays proportional to the result and only the surviving lines are redacted.
+    Results are memoized by log content, so re-extracting an unchanged log
+    costs one digest.
+    """
+    key = (_log_digest(log_text), max_lines)
+    with _evidence_cache_lock:
+        cached = _evidence_cache.get(key)
+    if cached is None:
+        cached = tuple(_extract_evidence_lines(log_text, max_lines))
+        with _evidence_cache_lock:
+            if len(_evidence_cache) >= _EVIDENCE_CACHE_MAX_ENTRIES:
+                _evidence_cache.pop(next(iter(_evidence_cache)))
+            _evidence_cache[key] = cached
+    return list(cached)
 
-    for i, raw in enumerate(lines, start=1):
-        if "Traceback (most recent call last)" in raw:
-            for j in range(i, min(len(lines) + 1, i + 20)):
-                line_text = lines[j - 1]
-                if line_text.strip():
-                    candidates.append(
-                        EvidenceLine(
-                            idx=j,
-                            line=redactor.redact_text(line_text),
-                            tag="stack-trace",
-                        )
-                    )
-            break
-
-    seen: set[int] = set()
-    ranked: list[EvidenceLine] = []
-    tag_priority = {
-        "root-cause": 0,
-        "stack-trace": 1,
-        "test-failure": 2,
-        "maven": 3,
-        "go": 3,
-        "npm": 3,
-        "docker": 3,
-    }
-    candidates.sort(key=lambda e: (tag_priority.get(e.tag, 10), e.idx))
-    for e in candidates:
-        if e.idx in seen:
+
+def _log_digest(log_text: str) -> bytes:
+    """Digest of the UTF-8 encoded log, encoded a block at a time."""
+    digest = hashlib.blake2b(digest_size=16)
+    for start in range(0, len(log_text), _SPLIT_BLOCK_CHARS):
+        block = log_text[start : start + _SPLIT_BLOCK_CHARS]
+        digest.update(block.encode("utf-8", "surrogatepass"))
+    return digest.digest()
+
+
+def _extract_evidence_lines(log_text: str, max_lines: int) -> list[EvidenceLine]:
+    if _has_other_line_breaks(log_text):
+        lines = _scan_all_lines(log_text)
+    else:
+        lines = _scan_candidate_lines(log_text)
+
+    limit = max(max_lines, 1)
+    # Max-heap on (priority, idx) via negated keys; heap[0] is the worst kept line.
+    kept: list[tuple[int, int, str, str]] = []
+    for i, raw, in_stack_trace in lines:
+        ranked = _rank_line(raw, in_stack_trace)
+        if ranked is None:
             continue
-        ranked.append(e)
-        seen.add(e.idx)
-        if len(ranked) >= max_lines:
-            break
-    return ranked
+        priority, tag = ranked
+        if len(kept) < limit:
+            heapq.heappush(kept, (-priority, -i, tag, raw))
+        elif priority < -kept[0][0]:
+            # Later lines lose ties on idx, so only a strictly better priority evicts.
+            heapq.heapreplace(kept, (-priority, -i, tag, raw))
+
+    redactor = get_redactor()
+    return [
+        EvidenceLine(idx=-neg_idx, line=redactor.redact_text(raw), tag=tag)
+        for _, neg_idx, tag, raw in sorted(kept, reverse=True)
+    ]
 
 
 def attach_operation_links(
@@ -85,21 +322,24 @@ def attach_operation_links(
 ) -> list[EvidenceLine]:
     if not operations:
         return evidence
-    by_token: list[tuple[int, list[str]]] = []
+    # One literal alternation per operation: a single scan of the line
+    # replaces a substring search per token.
+    matchers: list[tuple[int, re.Pattern[str]]] = []
     for op_idx, op in enumerate(operations):
-        tokens: list[str] = []
+        tokens: set[str] = set()
         for line in op.get("evidence") or []:
             token = str(line).strip()
             if token:
-                tokens.append(token)
+                tokens.add(token)
         if tokens:
-            by_token.append((op_idx, tokens))
+            alternation = "|".join(re.escape(t) for t in sorted(tokens, key=len, reverse=True))
+            matchers.append((op_idx, re.compile(alternation)))
 
     out: list[EvidenceLine] = []
     for e in evidence:
         linked: int | None = None
-        for op_idx, tokens in by_token:
-            if any(t in e.line for t in tokens):
+        for op_idx, matcher in matchers:
+            if matcher.search(e.line):
                 linked = op_idx
                 break
         out.append(EvidenceLine(idx=e.idx, line=e.line, tag=e.tag, operation_idx=linked))
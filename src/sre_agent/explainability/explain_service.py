@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
@@ -7,19 +9,23 @@ from uuid import UUID
 
 from sqlalchemy import desc, select
 
-from sre_agent.database import get_async_session
+from sre_agent.database import get_async_session, get_asyncpg_conn, get_asyncpg_pool
 from sre_agent.explainability.evidence_extractor import (
     EvidenceLine,
     attach_operation_links,
     extract_evidence_lines,
 )
 from sre_agent.explainability.redactor import get_redactor
-from sre_agent.models.events import PipelineEvent
+from sre_agent.models.events import Base, PipelineEvent
 from sre_agent.models.fix_pipeline import FixPipelineRun
 from sre_agent.safety.policy_models import PolicyDecision
 
+# Dedicated and small: explain scans are CPU-bound, so a burst of requests for
+# huge logs queues here instead of crowding out the loop's default executor.
+_EXPLAIN_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="explain")
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class ConfidenceFactor:
     factor: str
     value: float
@@ -27,6 +33,27 @@ class ConfidenceFactor:
     note: str
 
 
+_DETECTION_WEIGHT = 0.4
+_PLAN_WEIGHT = 0.4
+_VALIDATION_WEIGHT = 0.2
+
+# Validation outcomes are fixed, so their (immutable) factors are shared.
+_VALIDATION_FACTORS = {
+    "validation_passed": ConfidenceFactor(
+        factor="validation",
+        value=1.0,
+        weight=_VALIDATION_WEIGHT,
+        note="Sandbox validation passed",
+    ),
+    "validation_failed": ConfidenceFactor(
+        factor="validation",
+        value=0.0,
+        weight=_VALIDATION_WEIGHT,
+        note="Sandbox validation failed",
+    ),
+}
+
+
 def _safe_float(value: Any) -> float | None:
     try:
         if value is None:
@@ -43,15 +70,13 @@ def compute_confidence_breakdown(
     validation_status: str | None,
 ) -> tuple[float, list[ConfidenceFactor]]:
     factors: list[ConfidenceFactor] = []
-    total = 0.0
-    weight_sum = 0.0
 
     if detection_confidence is not None:
         factors.append(
             ConfidenceFactor(
                 factor="adapter_detection",
                 value=detection_confidence,
-                weight=0.4,
+                weight=_DETECTION_WEIGHT,
                 note="Adapter detection confidence",
             )
         )
@@ -60,38 +85,18 @@ def compute_confidence_breakdown(
             ConfidenceFactor(
                 factor="plan_confidence",
                 value=plan_confidence,
-                weight=0.4,
+                weight=_PLAN_WEIGHT,
                 note="FixPlan confidence",
             )
         )
+    validation_factor = _VALIDATION_FACTORS.get(validation_status or "")
+    if validation_factor is not None:
+        factors.append(validation_factor)
 
-    validation_value: float | None
-    if validation_status == "validation_passed":
-        validation_value = 1.0
-        note = "Sandbox validation passed"
-    elif validation_status == "validation_failed":
-        validation_value = 0.0
-        note = "Sandbox validation failed"
-    else:
-        validation_value = None
-        note = "Sandbox validation not available"
-
-    if validation_value is not None:
-        factors.append(
-            ConfidenceFactor(
-                factor="validation",
-                value=validation_value,
-                weight=0.2,
-                note=note,
-            )
-        )
-
-    for f in factors:
-        total += f.value * f.weight
-        weight_sum += f.weight
-
-    if weight_sum <= 0:
+    if not factors:
         return 0.0, []
+    total = sum(f.value * f.weight for f in factors)
+    weight_sum = sum(f.weight for f in factors)
     return max(0.0, min(1.0, total / weight_sum)), factors
 
 
@@ -136,30 +141,81 @@ def _parse_policy(decision_json: dict[str, Any] | None) -> PolicyDecision | None
         return None
 
 
+def _select_columns(model: type[Base], alias: str) -> str:
+    return ", ".join(
+        f'{alias}."{col.name}" AS "{alias}__{col.name}"' for col in model.__table__.columns
+    )
+
+
+# One round-trip: the event plus its most recent run (if any) via a lateral
+# subquery, with columns prefixed per table since both share names like id.
+_FAILURE_WITH_LATEST_RUN_SQL = (
+    f"SELECT {_select_columns(PipelineEvent, 'e')}, {_select_columns(FixPipelineRun, 'r')} "
+    f"FROM {PipelineEvent.__tablename__} AS e "
+    f"LEFT JOIN LATERAL (SELECT * FROM {FixPipelineRun.__tablename__} "
+    "WHERE event_id = e.id ORDER BY created_at DESC LIMIT 1) AS r ON true "
+    "WHERE e.id = $1"
+)
+
+
+def _model_from_record(model: type[Base], record: Any, alias: str) -> Any:
+    """Build a detached ORM instance from the aliased columns of an asyncpg record."""
+    return model(
+        **{
+            attr.key: record[f"{alias}__{attr.columns[0].name}"]
+            for attr in model.__mapper__.column_attrs
+        }
+    )
+
+
+async def _load_failure_and_latest_run_native(
+    *, failure_id: UUID
+) -> tuple[PipelineEvent | None, FixPipelineRun | None]:
+    async with get_asyncpg_conn() as conn:
+        row = await conn.fetchrow(_FAILURE_WITH_LATEST_RUN_SQL, failure_id)
+    if row is None:
+        return None, None
+    event = _model_from_record(PipelineEvent, row, "e")
+    run = _model_from_record(FixPipelineRun, row, "r") if row["r__id"] is not None else None
+    return event, run
+
+
 async def load_failure_and_latest_run(
     *, failure_id: UUID
 ) -> tuple[PipelineEvent | None, FixPipelineRun | None]:
+    if await get_asyncpg_pool() is not None:
+        return await _load_failure_and_latest_run_native(failure_id=failure_id)
+
     async with get_async_session() as session:
-        event = (
-            await session.execute(select(PipelineEvent).where(PipelineEvent.id == failure_id))
-        ).scalar_one_or_none()
-        if event is None:
-            return None, None
-        run = (
-            (
-                await session.execute(
-                    select(FixPipelineRun)
-                    .where(FixPipelineRun.event_id == failure_id)
-                    .order_by(desc(FixPipelineRun.created_at))
-                    .limit(1)
-                )
+        row = (
+            await session.execute(
+                select(PipelineEvent, FixPipelineRun)
+                .outerjoin(FixPipelineRun, FixPipelineRun.event_id == PipelineEvent.id)
+                .where(PipelineEvent.id == failure_id)
+                .order_by(desc(FixPipelineRun.created_at))
+                .limit(1)
             )
-            .scalars()
-            .first()
-        )
+        ).first()
+        if row is None:
+            return None, None
+        event, run = row
         return event, run
 
 
+def _extract_evidence_and_redact(
+    log_text: str, plan_json: Any, sections: dict[str, Any]
+) -> tuple[list[EvidenceLine], dict[str, Any]]:
+    evidence: list[EvidenceLine] = (
+        extract_evidence_lines(log_text, max_lines=30) if log_text else []
+    )
+    evidence = attach_operation_links(
+        evidence, operations=(plan_json or {}).get("operations") if plan_json else None
+    )
+    # Redact every free-form section in one redact_obj walk rather than a
+    # separate pass per section; repeated string leaves hit the leaf memo.
+    return evidence, get_redactor().redact_obj(sections)
+
+
 async def build_failure_explain_payload(*, failure_id: UUID) -> dict[str, Any] | None:
     redactor = get_redactor()
     event, run = await load_failure_and_latest_run(failure_id=failure_id)
@@ -179,13 +235,6 @@ async def build_failure_explain_payload(*, failure_id: UUID) -> dict[str, Any] |
         summary = context_json.get("log_summary")
         log_text = str(raw or summary or "")
 
-    evidence: list[EvidenceLine] = (
-        extract_evidence_lines(log_text, max_lines=30) if log_text else []
-    )
-    evidence = attach_operation_links(
-        evidence, operations=(plan_json or {}).get("operations") if plan_json else None
-    )
-
     category = None
     plan_confidence = None
     root_cause = None
@@ -222,8 +271,23 @@ async def build_failure_explain_payload(*, failure_id: UUID) -> dict[str, Any] |
         "patch_policy": (patch_policy.model_dump(mode="json") if patch_policy else None),
     }
 
+    # Log scanning and redaction are CPU-bound on multi-MB logs; keep them off
+    # the event loop so other requests on this worker are not stalled.
+    evidence, redacted = await asyncio.get_running_loop().run_in_executor(
+        _EXPLAIN_EXECUTOR,
+        _extract_evidence_and_redact,
+        log_text,
+        plan_json,
+        {
+            "plan": plan_json or None,
+            "safety": safety,
+            "validation": build_validation_summary(run.validation_json if run else None),
+            "timeline": build_timeline_from_artifact(run.artifact_json if run else None),
+        },
+    )
+
     proposed_fix = {
-        "plan": redactor.redact_obj(plan_json) if plan_json else None,
+        "plan": redacted["plan"],
         "files": list((plan_json or {}).get("files") or []) if isinstance(plan_json, dict) else [],
         "diff_available": bool(run and run.patch_diff),
     }
@@ -251,19 +315,15 @@ async def build_failure_explain_payload(*, failure_id: UUID) -> dict[str, Any] |
             for e in evidence
         ],
         "proposed_fix": proposed_fix,
-        "safety": redactor.redact_obj(safety),
-        "validation": redactor.redact_obj(
-            build_validation_summary(run.validation_json if run else None)
-        ),
+        "safety": redacted["safety"],
+        "validation": redacted["validation"],
         "run": {
             "run_id": str(run.id) if run else None,
             "status": (run.status if run else None),
             "created_at": (run.created_at.isoformat() if run else None),
             "updated_at": (run.updated_at.isoformat() if run and run.updated_at else None),
         },
-        "timeline": redactor.redact_obj(
-            build_timeline_from_artifact(run.artifact_json if run else None)
-        ),
+        "timeline": redacted["timeline"],
         "generated_at": datetime.now(UTC).isoformat(),
     }
     return payload
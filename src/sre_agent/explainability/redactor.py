@@ -1,51 +1,166 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
-from functools import lru_cache
+import re._constants as sre_constants
+import re._parser as sre_parse
+import threading
+from dataclasses import dataclass, field
 from typing import Any
 
 from sre_agent.config import get_settings
 from sre_agent.safety.policy_loader import load_policy_from_file
 
+_URL_TOKEN_KEYS = "access_token|token|auth|authorization|signature|sig|key"
+_HEADER_TOKEN_KEYS = "authorization|x-api-key|x-auth-token"
 
-@dataclass(frozen=True)
+# Every URL/header token key above contains one of these literals.
+_BUILTIN_TRIGGERS = ("token", "auth", "sig", "key")
+
+# Fallback trigger for rules without a usable literal: a ``[=:]`` separator.
+_SEPARATORS = frozenset("=:")
+
+# redact_obj memoizes redacted leaf strings up to this length.
+_MEMO_MAX_CHARS = 4096
+_MEMO_MAX_ENTRIES = 1024
+
+
+@dataclass(frozen=True, slots=True)
 class Redactor:
     patterns: list[re.Pattern[str]]
     url_token_pattern: re.Pattern[str]
     header_token_pattern: re.Pattern[str]
+    trigger_pattern: re.Pattern[str] | None = None
+    _memo: dict[str, str] = field(default_factory=dict, repr=False, compare=False)
+    _memo_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
     def redact_text(self, value: str) -> str:
-        redacted = value
-        redacted = self.url_token_pattern.sub(r"\1=[REDACTED]", redacted)
+        # Most leaves (ids, timestamps, enum values) cannot match any rule;
+        # a cheap search for a required literal skips every pass below.
+        if self.trigger_pattern is not None and not self.trigger_pattern.search(value):
+            return value
+        return self._redact_passes(value)
+
+    def _redact_passes(self, value: str) -> str:
+        redacted = self.url_token_pattern.sub(r"\1=[REDACTED]", value)
         redacted = self.header_token_pattern.sub(r"\1 [REDACTED]", redacted)
         for pat in self.patterns:
             redacted = pat.sub("[REDACTED]", redacted)
         return redacted
 
     def redact_obj(self, obj: Any) -> Any:
+        """Redact every string leaf of a JSON-like value.
+
+        Dashboards poll the same run payloads repeatedly, so leaves that need
+        the full redaction passes are memoized by value. Containers are
+        rebuilt on every call.
+        """
         if obj is None:
             return None
         if isinstance(obj, str):
-            return self.redact_text(obj)
+            return self._redact_leaf(obj)
         if isinstance(obj, list):
             return [self.redact_obj(v) for v in obj]
         if isinstance(obj, dict):
             return {k: self.redact_obj(v) for k, v in obj.items()}
         return obj
 
+    def _redact_leaf(self, value: str) -> str:
+        if self.trigger_pattern is not None and not self.trigger_pattern.search(value):
+            return value
+        if len(value) > _MEMO_MAX_CHARS:
+            return self._redact_passes(value)
+        with self._memo_lock:
+            cached = self._memo.get(value)
+        if cached is None:
+            cached = self._redact_passes(value)
+            with self._memo_lock:
+                if len(self._memo) >= _MEMO_MAX_ENTRIES:
+                    self._memo.pop(next(iter(self._memo)))
+                self._memo[value] = cached
+        return cached
+
+
+def _required_trigger(source: str) -> str | None:
+    """Return a regex fragment that must occur in any match of ``source``.
+
+    Only unconditional top-level items are considered. The longest run of
+    literal characters is preferred since it is far more selective than a
+    separator (timestamps and URLs are full of ``:``); a ``[=:]``-style set is
+    the fallback. Returns None when nothing is required.
+    """
+    try:
+        parsed = sre_parse.parse(source)
+    except re.error:
+        return None
+
+    runs: list[str] = []
+    current: list[str] = []
+    separator = False
+    for op, av in parsed:
+        if op is sre_constants.LITERAL:
+            current.append(chr(av))
+            continue
+        if current:
+            runs.append("".join(current))
+            current = []
+        if op is sre_constants.IN and all(item_op is sre_constants.LITERAL for item_op, _ in av):
+            if {chr(ch) for _, ch in av} <= _SEPARATORS:
+                separator = True
+    if current:
+        runs.append("".join(current))
+
+    longest = max(runs, key=len, default="")
+    if len(longest) >= 2 or (longest and not separator):
+        return re.escape(longest)
+    if separator:
+        return "[=:]"
+    return None
+
+
+def _build_trigger(sources: list[str]) -> re.Pattern[str] | None:
+    """One alternation of the literals some rule needs, checked before redacting.
+
+    Plays the role of a literal prefilter: a single scan rejects strings that
+    no rule can match, and only strings containing a required literal pay for
+    the redaction passes.
+    """
+    fragments = list(_BUILTIN_TRIGGERS)
+    for source in sources:
+        fragment = _required_trigger(source)
+        if fragment is None:
+            return None
+        if fragment not in fragments:
+            fragments.append(fragment)
+    return re.compile("|".join(fragments), re.IGNORECASE)
+
+
+_redactor: Redactor | None = None
+
 
-@lru_cache(maxsize=1)
 def get_redactor() -> Redactor:
+    """Return the process-wide redactor, built on first use.
+
+    A plain module global rather than ``lru_cache``: this is called per string
+    batch on hot paths. Concurrent first calls may both build one; either
+    result is equivalent and the last assignment wins.
+    """
+    global _redactor
+    redactor = _redactor
+    if redactor is None:
+        redactor = _redactor = _build_redactor()
+    return redactor
+
+
+def _build_redactor() -> Redactor:
     settings = get_settings()
     policy = load_policy_from_file(settings.safety_policy_path)
-    patterns = [re.compile(p, re.IGNORECASE) for p in policy.secrets.forbidden_patterns]
-    url_token_pattern = re.compile(
-        r"(?i)\b(access_token|token|auth|authorization|signature|sig|key)=([^&\s]+)"
-    )
-    header_token_pattern = re.compile(r"(?i)\b(authorization|x-api-key|x-auth-token):\s*([^\s]+)")
+    sources = list(policy.secrets.forbidden_patterns)
+    patterns = [re.compile(p, re.IGNORECASE) for p in sources]
+    url_token_pattern = re.compile(rf"(?i)\b({_URL_TOKEN_KEYS})=([^&\s]+)")
+    header_token_pattern = re.compile(rf"(?i)\b({_HEADER_TOKEN_KEYS}):\s*([^\s]+)")
     return Redactor(
         patterns=patterns,
         url_token_pattern=url_token_pattern,
         header_token_pattern=header_token_pattern,
+        trigger_pattern=_build_trigger(sources),
     )
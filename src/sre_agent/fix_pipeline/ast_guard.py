@@ -2,10 +2,32 @@
 
 from __future__ import annotations
 
-import ast
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from pathlib import Path
 
+from sre_agent.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Below this many files (and bytes), process start-up and pickling cost more
+# than parsing; larger sources go to the pool so compiling never stalls the loop.
+_INLINE_PARSE_MAX_FILES = 3
+_INLINE_PARSE_MAX_BYTES = 128 * 1024
+
+_process_pool: ProcessPoolExecutor | None = None
+
+# Content digest -> compile error message (None when the file compiles). Kept
+# per process: pool workers are long-lived, so each warms its own cache.
+_COMPILE_CACHE_MAX_ENTRIES = 4096
+_compile_cache: dict[bytes, str | None] = {}
+
 
 @dataclass(frozen=True)
 class AstIssue:
@@ -21,50 +43,103 @@ class AstCheckResult:
     issues: list[AstIssue]
 
 
-def validate_python_ast(*, repo_path: Path, touched_files: list[str]) -> AstCheckResult:
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        # The API and Celery processes already run threads; forking them could
+        # hand a worker a lock held mid-operation, so workers start clean.
+        method = (
+            "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        )
+        _process_pool = ProcessPoolExecutor(
+            max_workers=max(1, get_settings().ast_guard_max_workers),
+            mp_context=multiprocessing.get_context(method),
+        )
+    return _process_pool
+
+
+def _parse_one(abs_path: str, rel_path: str) -> AstIssue | None:
+    """Parse a single file; module-level so it can run in a worker process."""
+    try:
+        # Raw bytes: the compiler honours the BOM and coding declarations itself.
+        source = Path(abs_path).read_bytes()
+    except Exception as exc:
+        return AstIssue(
+            file=rel_path,
+            phase="post_patch_read",
+            message=f"Failed to read file for AST validation: {exc}",
+        )
+
+    key = hashlib.blake2b(source, digest_size=16).digest()
+    if key in _compile_cache:
+        message = _compile_cache[key]
+    else:
+        message = _compile_error(source, rel_path)
+        if len(_compile_cache) >= _COMPILE_CACHE_MAX_ENTRIES:
+            _compile_cache.pop(next(iter(_compile_cache)))
+        _compile_cache[key] = message
+    if message is None:
+        return None
+    return AstIssue(file=rel_path, phase="post_patch_parse", message=message)
+
+
+def _compile_error(source: bytes, rel_path: str) -> str | None:
+    try:
+        # Compiling to a code object (discarded) avoids materializing the Python
+        # AST node graph and also reports compile-time errors such as a
+        # ``return`` outside a function.
+        compile(source, rel_path, "exec", dont_inherit=True)
+    except SyntaxError as exc:
+        return f"SyntaxError at line {exc.lineno}: {exc.msg}"
+    except Exception as exc:
+        return f"AST parsing failed: {exc}"
+    return None
+
+
+def _parse_inline(jobs: list[tuple[str, str]]) -> bool:
+    if len(jobs) > _INLINE_PARSE_MAX_FILES:
+        return False
+    total = 0
+    for abs_path, _ in jobs:
+        try:
+            total += os.stat(abs_path).st_size
+        except OSError:
+            continue  # _parse_one reports the read failure
+    return total <= _INLINE_PARSE_MAX_BYTES
+
+
+async def _parse_in_pool(jobs: list[tuple[str, str]]) -> list[AstIssue | None]:
+    global _process_pool
+    loop = asyncio.get_running_loop()
+    try:
+        pool = _get_process_pool()
+        return list(
+            await asyncio.gather(
+                *(loop.run_in_executor(pool, _parse_one, abs_path, rel) for abs_path, rel in jobs)
+            )
+        )
+    except BrokenProcessPool:
+        logger.warning("AST process pool broken; parsing inline", exc_info=True)
+        _process_pool = None
+        return [_parse_one(abs_path, rel) for abs_path, rel in jobs]
+
+
+async def validate_python_ast(*, repo_path: Path, touched_files: list[str]) -> AstCheckResult:
     """Validate AST parseability for all touched Python files.
 
     The check is intentionally conservative: any parse failure blocks the pipeline.
+    Large patchsets, or a few large files, are parsed in parallel across worker
+    processes so the event loop is not blocked.
     """
-    checked: list[str] = []
-    issues: list[AstIssue] = []
-
-    for rel_path in sorted(set(touched_files)):
-        if not rel_path.endswith(".py"):
-            continue
-        checked.append(rel_path)
-        abs_path = repo_path / rel_path
-        try:
-            content = abs_path.read_text(encoding="utf-8", errors="replace")
-        except Exception as exc:
-            issues.append(
-                AstIssue(
-                    file=rel_path,
-                    phase="post_patch_read",
-                    message=f"Failed to read file for AST validation: {exc}",
-                )
-            )
-            continue
+    checked = [rel for rel in sorted(set(touched_files)) if rel.endswith(".py")]
+    jobs = [(str(repo_path / rel), rel) for rel in checked]
 
-        try:
-            ast.parse(content, filename=rel_path)
-        except SyntaxError as exc:
-            issues.append(
-                AstIssue(
-                    file=rel_path,
-                    phase="post_patch_parse",
-                    message=f"SyntaxError at line {exc.lineno}: {exc.msg}",
-                )
-            )
-        except Exception as exc:
-            issues.append(
-                AstIssue(
-                    file=rel_path,
-                    phase="post_patch_parse",
-                    message=f"AST parsing failed: {exc}",
-                )
-            )
+    if _parse_inline(jobs):
+        results = [_parse_one(abs_path, rel) for abs_path, rel in jobs]
+    else:
+        results = await _parse_in_pool(jobs)
 
+    issues = [issue for issue in results if issue is not None]
     return AstCheckResult(
         passed=not issues,
         checked_files=checked,
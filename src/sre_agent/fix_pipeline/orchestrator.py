@@ -1,13 +1,20 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
-from datetime import UTC, datetime
-from fnmatch import fnmatch
+import os
+import re
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from fnmatch import translate
+from functools import lru_cache, partial
 from pathlib import Path
 from uuid import UUID
 
-from sre_agent.adapters.registry import select_adapter
+from sre_agent.adapters.registry import repo_marker_suffixes, select_adapter
 from sre_agent.ai.critic import PlanCritic
 from sre_agent.ai.guardrails import FixGuardrails
 from sre_agent.ai.plan_generator import PlanGenerator
@@ -15,17 +22,16 @@ from sre_agent.artifacts.provenance import build_provenance_artifact
 from sre_agent.config import get_settings
 from sre_agent.consensus.coordinator import ConsensusCoordinator
 from sre_agent.consensus.issue_graph import build_issue_graph
-from sre_agent.database import get_async_session
 from sre_agent.explainability.evidence_extractor import (
     attach_operation_links,
     extract_evidence_lines,
 )
 from sre_agent.fix_pipeline.ast_guard import validate_python_ast
-from sre_agent.fix_pipeline.patch_generator import PatchGenerator
+from sre_agent.fix_pipeline.patch_generator import PatchGenerator, _count_diff_changes
 from sre_agent.fix_pipeline.store import FixPipelineRunStore
 from sre_agent.intelligence.rca_engine import RCAEngine
 from sre_agent.models.events import PipelineEvent
-from sre_agent.models.fix_pipeline import FixPipelineRunStatus
+from sre_agent.models.fix_pipeline import FixPipelineRun, FixPipelineRunStatus
 from sre_agent.observability.metrics import (
     METRICS,
     bucket_danger_score,
@@ -56,6 +62,7 @@ from sre_agent.schemas.fix_plan import FixPlan
 from sre_agent.schemas.intelligence import RCAResult
 from sre_agent.schemas.pr import PRResult
 from sre_agent.schemas.repository_config import RepositoryRuntimeConfig
+from sre_agent.schemas.scans import ScanStatus, ScanSummary
 from sre_agent.schemas.validation import ValidationRequest, ValidationResult
 from sre_agent.services.context_builder import ContextBuilder
 from sre_agent.services.dashboard_events import publish_dashboard_event
@@ -63,6 +70,26 @@ from sre_agent.services.post_merge_monitor import PostMergeMonitorService
 
 logger = logging.getLogger(__name__)
 
+# Label children are resolved once at import; only Trivy severities, which
+# come from the scanner output, are looked up per run.
+_SCAN_FAIL_HANDLES = {
+    (scanner, reason): METRICS.scan_fail_total.labels(scanner=scanner, reason=reason)
+    for scanner in ("gitleaks", "trivy")
+    for reason in ("timeout", "error", "unknown")
+}
+_GITLEAKS_FINDINGS = METRICS.scan_findings_total.labels(scanner="gitleaks", severity="UNKNOWN")
+_FAILED_SCAN_STATUSES = frozenset({ScanStatus.FAIL, ScanStatus.ERROR})
+
+
+@lru_cache(maxsize=256)
+def _metric_child(metric, **labels):
+    """Labelled child of ``metric``, resolved once per distinct label set.
+
+    Only for low-cardinality labels (stages, policy codes, PR labels); the
+    cache keeps every child it has seen.
+    """
+    return metric.labels(**labels)
+
 
 def _derive_repo_url(event: PipelineEvent) -> str | None:
     repo_info = (event.raw_payload or {}).get("repository") or {}
@@ -74,17 +101,41 @@ def _derive_repo_url(event: PipelineEvent) -> str | None:
     return None
 
 
-def _list_repo_files(repo_path: Path) -> list[str]:
-    root = Path(repo_path)
-    out: list[str] = []
-    for p in root.rglob("*"):
-        if p.is_dir():
-            continue
-        rel = p.relative_to(root).as_posix()
-        if rel.startswith(".git/"):
+def _iter_repo_files(repo_path: Path, suffixes: tuple[str, ...] | None = None) -> Iterator[str]:
+    """POSIX paths of the non-directory entries in a checkout, in walk order.
+
+    An ``os.scandir`` walk takes entry types from the directory listing
+    (``is_dir(follow_symlinks=False)`` needs no ``stat``) and never descends
+    into ``.git`` directories. With ``suffixes``, names are filtered before
+    anything else, so skipped entries cost no path join and symlinks among
+    them are never resolved.
+    """
+    root = os.fspath(repo_path)
+    prefix_len = len(root.rstrip(os.sep)) + 1
+    native_sep = os.sep != "/"
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != ".git":
+                            pending.append(entry.path)
+                        continue
+                    if suffixes is not None and not entry.name.endswith(suffixes):
+                        continue
+                    # Only symlinks reach a stat here: the link's target decides.
+                    if not entry.is_dir():
+                        rel = entry.path[prefix_len:]
+                        yield rel.replace(os.sep, "/") if native_sep else rel
+        except OSError:
             continue
-        out.append(rel)
-    return out
+
+
+def _list_relevant_repo_files(repo_path: Path, suffixes: tuple[str, ...] | None) -> list[str]:
+    """Sorted checkout paths whose name ends in one of ``suffixes`` (all when ``None``)."""
+    return sorted(_iter_repo_files(repo_path, suffixes))
 
 
 def _extract_runtime_config(event: PipelineEvent) -> RepositoryRuntimeConfig:
@@ -95,16 +146,36 @@ def _extract_runtime_config(event: PipelineEvent) -> RepositoryRuntimeConfig:
             cfg = meta.get("repo_config")
             if isinstance(cfg, dict):
                 try:
-                    return RepositoryRuntimeConfig.model_validate(cfg)
+                    return _build_runtime_config(json.dumps(cfg, sort_keys=True))
                 except Exception:
                     pass
     # Preserve legacy behavior when metadata is unavailable (tests/manual runs).
     return RepositoryRuntimeConfig(automation_mode="auto_pr", protected_paths=[], retry_limit=3)
 
 
-def _matches_protected_path(path: str, protected_paths: list[str]) -> bool:
+@lru_cache(maxsize=512)
+def _build_runtime_config(cfg_key: str) -> RepositoryRuntimeConfig:
+    """Validate a canonical-JSON repo config once per distinct payload.
+
+    Workers see the same few repo configs over and over, so validation is
+    memoized by content. The shared instance is only read by the pipeline.
+    """
+    return RepositoryRuntimeConfig.model_validate(json.loads(cfg_key))
+
+
+@lru_cache(maxsize=256)
+def _compile_protected_paths(protected_paths: tuple[str, ...]) -> re.Pattern[str] | None:
+    """One anchored alternation equivalent to ``fnmatch`` against any of the globs."""
+    if not protected_paths:
+        return None
+    return re.compile(
+        "|".join(f"(?:{translate(os.path.normcase(pat))})" for pat in protected_paths)
+    )
+
+
+def _matches_protected_path(path: str, protected: re.Pattern[str]) -> bool:
     normalized = path.replace("\\", "/").lstrip("./")
-    return any(fnmatch(normalized, pat) for pat in protected_paths)
+    return protected.match(os.path.normcase(normalized)) is not None
 
 
 def _default_critic_decision(reason: str) -> CriticDecision:
@@ -126,6 +197,112 @@ def _default_critic_decision(reason: str) -> CriticDecision:
     )
 
 
+@dataclass(slots=True)
+class _Timeline:
+    """Pipeline steps in run order, kept as parallel columns.
+
+    Steps are timed on the monotonic clock. Entries become dicts, with
+    wall-clock ISO times derived from one anchor, only when persisted.
+    """
+
+    anchor: tuple[datetime, int] = field(
+        default_factory=lambda: (datetime.now(UTC), time.perf_counter_ns())
+    )
+    steps: list[str] = field(default_factory=list)
+    statuses: list[str] = field(default_factory=list)
+    durations_ms: list[int | None] = field(default_factory=list)
+    started_ns: list[int | None] = field(default_factory=list)
+    completed_ns: list[int | None] = field(default_factory=list)
+
+    def add(self, step: str, status: str, *, started_ns: int | None = None) -> int:
+        """Append an entry and return its index; untimed unless ``started_ns``."""
+        self.steps.append(step)
+        self.statuses.append(status)
+        self.durations_ms.append(None)
+        self.started_ns.append(started_ns)
+        self.completed_ns.append(None)
+        return len(self.steps) - 1
+
+    def start(self, step: str) -> int:
+        return self.add(step, "running", started_ns=time.perf_counter_ns())
+
+    def end(self, index: int, status: str) -> int:
+        """Close a started step and return its duration in milliseconds."""
+        completed = time.perf_counter_ns()
+        started = self.started_ns[index]
+        duration_ms = 0 if started is None else (completed - started) // 1_000_000
+        self.statuses[index] = status
+        self.durations_ms[index] = duration_ms
+        self.completed_ns[index] = completed
+        return duration_ms
+
+    def as_dicts(self) -> list[dict]:
+        anchor_wall, anchor_ns = self.anchor
+
+        def _iso(ns: int | None) -> str | None:
+            if ns is None:
+                return None
+            return (anchor_wall + timedelta(microseconds=(ns - anchor_ns) // 1000)).isoformat()
+
+        return [
+            {
+                "step": step,
+                "status": status,
+                "started_at": _iso(started),
+                "completed_at": _iso(completed),
+                "duration_ms": duration_ms,
+            }
+            for step, status, started, completed, duration_ms in zip(
+                self.steps,
+                self.statuses,
+                self.started_ns,
+                self.completed_ns,
+                self.durations_ms,
+                strict=True,
+            )
+        ]
+
+
+def _record_scan_metrics(scans: ScanSummary) -> str:
+    """Count scan findings and failures; return the overall scans status."""
+    if scans.gitleaks is not None:
+        _GITLEAKS_FINDINGS.inc(int(scans.gitleaks.findings_count or 0))
+    if scans.trivy is not None:
+        for sev, count in (scans.trivy.severity_counts or {}).items():
+            _metric_child(
+                METRICS.scan_findings_total, scanner="trivy", severity=str(sev).upper() or "UNKNOWN"
+            ).inc(int(count or 0))
+
+    status = "ok"
+    for scanner, scan in (("gitleaks", scans.gitleaks), ("trivy", scans.trivy)):
+        if scan is None:
+            continue
+        scan_status = scan.status
+        if scan_status not in _FAILED_SCAN_STATUSES:
+            continue
+        status = "fail"
+        if "timeout" in str(scan.error_message or "").lower():
+            reason = "timeout"
+        elif scan_status == ScanStatus.ERROR:
+            reason = "error"
+        else:
+            reason = "unknown"
+        _SCAN_FAIL_HANDLES[scanner, reason].inc()
+    return status
+
+
+# Run status recorded when a gate of the given stage blocks the run.
+_BLOCKED_STATUS = {
+    "plan": FixPipelineRunStatus.PLAN_BLOCKED.value,
+    "patch": FixPipelineRunStatus.PATCH_BLOCKED.value,
+}
+
+# The highest confidence the built-in adapters report. ``select_adapter`` only
+# replaces a detection with a strictly more confident one, so a changed-files
+# detection at this level is final and the checkout need not be listed.
+_DECISIVE_DETECTION_CONFIDENCE = 0.9
+
+
 def _can_auto_merge(*, validation_passed: bool, pr_label: str | None, manual_review: bool) -> bool:
     if not validation_passed:
         return False
@@ -134,7 +311,14 @@ def _can_auto_merge(*, validation_passed: bool, pr_label: str | None, manual_rev
     return (pr_label or "").strip().lower() == "safe"
 
 
+def _file_diff(filename: str, lines: list[str]) -> FileDiff:
+    diff = "".join(lines)
+    added, removed = _count_diff_changes(diff)
+    return FileDiff(filename=filename, diff=diff, lines_added=added, lines_removed=removed)
+
+
 def _split_file_diffs(combined_diff: str) -> list[FileDiff]:
+    """Split a combined diff per file; each chunk's +/- lines are counted in C."""
     diffs: list[FileDiff] = []
     current: list[str] = []
     current_file: str | None = None
@@ -142,46 +326,17 @@ def _split_file_diffs(combined_diff: str) -> list[FileDiff]:
     for line in combined_diff.splitlines(keepends=True):
         if line.startswith("--- a/"):
             if current_file and current:
-                diff_text = "".join(current)
-                added, removed = _count_diff_changes(diff_text)
-                diffs.append(
-                    FileDiff(
-                        filename=current_file,
-                        diff=diff_text,
-                        lines_added=added,
-                        lines_removed=removed,
-                    )
-                )
+                diffs.append(_file_diff(current_file, current))
             current = [line]
             current_file = line[len("--- a/") :].strip()
             continue
         current.append(line)
 
     if current_file and current:
-        diff_text = "".join(current)
-        added, removed = _count_diff_changes(diff_text)
-        diffs.append(
-            FileDiff(
-                filename=current_file,
-                diff=diff_text,
-                lines_added=added,
-                lines_removed=removed,
-            )
-        )
+        diffs.append(_file_diff(current_file, current))
     return diffs
 
 
-def _count_diff_changes(diff_text: str) -> tuple[int, int]:
-    added = 0
-    removed = 0
-    for line in diff_text.splitlines():
-        if line.startswith("+") and not line.startswith("+++"):
-            added += 1
-        elif line.startswith("-") and not line.startswith("---"):
-            removed += 1
-    return added, removed
-
-
 class FixPipelineOrchestrator:
     def __init__(
         self,
@@ -194,7 +349,8 @@ class FixPipelineOrchestrator:
         self.plan_generator = plan_generator or PlanGenerator()
         self.patch_generator = patch_generator or PatchGenerator()
         self.critic = critic or PlanCritic()
-        self.repo_manager = RepoManager()
+        # Depth 50 keeps older commit_shas reachable; blobless keeps that history cheap.
+        self.repo_manager = RepoManager(partial_clone=True)
         self.guardrails = FixGuardrails()
         self.validator = ValidationOrchestrator()
         self.pr_orchestrator = PROrchestrator()
@@ -204,79 +360,95 @@ class FixPipelineOrchestrator:
         self.consensus = ConsensusCoordinator()
 
     async def run(self, run_id: UUID) -> dict:
-        run = await self.store.get_run(run_id)
+        run, event = await self.store.get_run_with_event(run_id)
         if run is None:
             return {"success": False, "error": "run_not_found"}
-
-        async with get_async_session() as session:
-            event = await session.get(PipelineEvent, run.event_id)
         if event is None:
             return {"success": False, "error": "event_not_found"}
 
-        timeline: list[dict] = []
+        timeline = _Timeline()
         failure_id = str(event.id)
         run_id_str = str(run_id)
+        # Shared by every tracing span of this run.
+        span_attrs = {
+            "run_id": run_id_str,
+            "failure_id": failure_id,
+            "run_key": str(getattr(event, "idempotency_key", "") or ""),
+        }
         runtime_config = _extract_runtime_config(event)
         automation_mode = runtime_config.automation_mode
-        protected_paths = runtime_config.protected_paths
+        # Compiled once per distinct glob list; each path is then one regex match.
+        protected = _compile_protected_paths(tuple(runtime_config.protected_paths))
         retry_limit = runtime_config.retry_limit
 
-        async def _emit(stage: str, status: str, metadata: dict | None = None) -> None:
-            await publish_dashboard_event(
-                event_type="pipeline_stage",
-                stage=stage,
-                status=status,
-                failure_id=failure_id,
-                run_id=run_id_str,
-                metadata=metadata,
-            )
+        # Stage events are queued and published in order by one background task,
+        # so no stage waits on the broker; the queue is drained before returning.
+        # A failed publish is logged and skipped so later events still go out.
+        emit_queue: asyncio.Queue[dict | None] = asyncio.Queue()
+
+        async def _drain_emits() -> None:
+            while (pending := await emit_queue.get()) is not None:
+                try:
+                    await publish_dashboard_event(**pending)
+                except Exception:
+                    logger.debug(
+                        "Failed to publish pipeline stage event",
+                        extra={"stage": pending["stage"], "status": pending["status"]},
+                        exc_info=True,
+                    )
 
-        def _step_start(step: str) -> tuple[int, datetime]:
-            started = datetime.now(UTC)
-            timeline.append(
+        def _emit(stage: str, status: str, metadata: dict | None = None) -> None:
+            emit_queue.put_nowait(
                 {
-                    "step": step,
-                    "status": "running",
-                    "started_at": started.isoformat(),
-                    "completed_at": None,
-                    "duration_ms": None,
+                    "event_type": "pipeline_stage",
+                    "stage": stage,
+                    "status": status,
+                    "failure_id": failure_id,
+                    "run_id": run_id_str,
+                    "metadata": metadata,
+                    "timestamp": datetime.now(UTC),
                 }
             )
-            return len(timeline) - 1, started
-
-        def _step_end(step_index: int, *, status: str, started: datetime) -> None:
-            completed = datetime.now(UTC)
-            duration_ms = int((completed - started).total_seconds() * 1000)
-            step_name = str(timeline[step_index].get("step") or "unknown")
-            timeline[step_index] = {
-                **timeline[step_index],
-                "status": status,
-                "completed_at": completed.isoformat(),
-                "duration_ms": duration_ms,
-            }
-            METRICS.pipeline_stage_duration_seconds.labels(stage=step_name).observe(
-                max(0.0, duration_ms / 1000.0)
-            )
+
+        def _step_end(step_index: int, *, status: str) -> None:
+            duration_ms = timeline.end(step_index, status)
+            _metric_child(
+                METRICS.pipeline_stage_duration_seconds, stage=timeline.steps[step_index]
+            ).observe(max(0.0, duration_ms / 1000.0))
+
+        # Fields that change no status (config snapshot, freshly built context
+        # and RCA, issue graph, adapter detection, critic and consensus
+        # verdicts, patch and its policy decision) ride along with the next
+        # status write instead of costing their own round-trip; whatever is
+        # left is flushed in the finally block.
+        pending_fields: dict = {}
+
+        async def _update(**fields) -> None:
+            if pending_fields:
+                fields = {**pending_fields, **fields}
+                pending_fields.clear()
+            await self.store.update_run(run_id, **fields)
+
+        async def _block(stage: str, reason: str, message: str, **fields) -> None:
+            await _update(status=_BLOCKED_STATUS[stage], error_message=message, **fields)
+            _emit(stage, "blocked", {"reason": reason})
 
         repo_path = None
+        clone_task: asyncio.Task[Path] | None = None
+        emit_task = asyncio.create_task(_drain_emits())
         try:
-            await _emit("pipeline", "started", {"repo": event.repo, "branch": event.branch})
-            await self.store.update_run(
-                run_id,
-                automation_mode=automation_mode,
-                retry_limit_snapshot=retry_limit,
-            )
-            ingest_idx, ingest_started = _step_start("ingest")
-            context, rca = await self._load_or_build_context(event, run_id)
-            _step_end(ingest_idx, status="ok", started=ingest_started)
-
-            issue_graph_idx, issue_graph_started = _step_start("issue_graph")
+            _emit("pipeline", "started", {"repo": event.repo, "branch": event.branch})
+            pending_fields.update(automation_mode=automation_mode, retry_limit_snapshot=retry_limit)
+            ingest_idx = timeline.start("ingest")
+            context, rca, context_fields = await self._load_or_build_context(event, run)
+            pending_fields.update(context_fields)
+            _step_end(ingest_idx, status="ok")
+
+            issue_graph_idx = timeline.start("issue_graph")
             issue_graph = build_issue_graph(context=context, rca=rca)
-            _step_end(issue_graph_idx, status="ok", started=issue_graph_started)
-            await self.store.update_run(
-                run_id, issue_graph_json=issue_graph.model_dump(mode="json")
-            )
-            await _emit(
+            _step_end(issue_graph_idx, status="ok")
+            pending_fields["issue_graph_json"] = issue_graph
+            _emit(
                 "issue_graph",
                 "completed",
                 {
@@ -290,153 +462,164 @@ class FixPipelineOrchestrator:
                 if context.log_content is not None
                 else (context.log_summary or "")
             )
-            adapter_idx, adapter_started = _step_start("adapter_select")
+            adapter_idx = timeline.start("adapter_select")
             repo_files_hint = [f.filename for f in (context.changed_files or []) if f.filename]
             selected = select_adapter(log_text, repo_files_hint)
             if selected is None:
-                _step_end(adapter_idx, status="fail", started=adapter_started)
-                await self.store.update_run(
-                    run_id,
+                _step_end(adapter_idx, status="fail")
+                await _update(
                     status=FixPipelineRunStatus.PLAN_BLOCKED.value,
                     error_message="No adapter matched this repository/logs",
                 )
-                await _emit("adapter_select", "failed")
+                _emit("adapter_select", "failed")
                 return {"success": False, "error": "no_adapter"}
-            _step_end(adapter_idx, status="ok", started=adapter_started)
-            await _emit("adapter_select", "completed", {"adapter": selected.adapter.name})
-
-            await self.store.update_run(
-                run_id,
+            _step_end(adapter_idx, status="ok")
+            _emit("adapter_select", "completed", {"adapter": selected.adapter.name})
+            pending_fields.update(
                 adapter_name=selected.adapter.name,
-                detection_json=selected.detection.model_dump(mode="json"),
+                detection_json=selected.detection,
             )
 
-            plan_idx, plan_started = _step_start("plan")
+            # The clone needs only the event, so it runs in the background
+            # through plan generation and the plan gates; it is awaited just
+            # before patching and cancelled (killing git) on any earlier exit.
+            repo_url = _derive_repo_url(event)
+            if repo_url:
+                clone_idx = timeline.start("clone")
+                clone_task = asyncio.create_task(
+                    self.repo_manager.clone(
+                        repo_url=repo_url,
+                        branch=event.branch,
+                        commit=event.commit_sha,
+                        depth=50,
+                    )
+                )
+
+                def _clone_done(task: asyncio.Task[Path]) -> None:
+                    if not task.cancelled():
+                        _step_end(clone_idx, status="fail" if task.exception() else "ok")
+
+                clone_task.add_done_callback(_clone_done)
+
+            plan_idx = timeline.start("plan")
             with start_span(
                 "generate_plan",
                 attributes={
-                    "run_id": str(run_id),
-                    "failure_id": str(event.id),
-                    "run_key": str(getattr(event, "idempotency_key", "") or ""),
+                    **span_attrs,
                     "language": str(getattr(selected.detection, "language", "") or ""),
                 },
             ):
                 plan = await self._generate_plan(context, rca, run_id)
             if plan is None:
-                _step_end(plan_idx, status="fail", started=plan_started)
-                await _emit("plan", "failed")
+                _step_end(plan_idx, status="fail")
+                _emit("plan", "failed")
                 return {"success": False, "error": "plan_failed"}
-            _step_end(plan_idx, status="ok", started=plan_started)
-            await _emit("plan", "completed", {"category": plan.category, "files": len(plan.files)})
+            _step_end(plan_idx, status="ok")
+            _emit("plan", "completed", {"category": plan.category, "files": len(plan.files)})
 
-            if protected_paths:
+            if protected is not None:
                 violating = sorted(
-                    {path for path in plan.files if _matches_protected_path(path, protected_paths)}
+                    {path for path in plan.files if _matches_protected_path(path, protected)}
                 )
                 if violating:
-                    await self.store.update_run(
-                        run_id,
-                        status=FixPipelineRunStatus.PLAN_BLOCKED.value,
-                        error_message=f"Plan touches protected paths: {violating}",
+                    await _block(
+                        "plan", "protected_paths", f"Plan touches protected paths: {violating}"
                     )
-                    await _emit("plan", "blocked", {"reason": "protected_paths"})
                     return {"success": False, "error": "protected_paths_blocked"}
 
-            policy_plan_idx, policy_plan_started = _step_start("policy_plan")
+            policy_plan_idx = timeline.start("policy_plan")
             with start_span(
                 "policy_check_plan",
                 attributes={
-                    "run_id": str(run_id),
-                    "failure_id": str(event.id),
-                    "run_key": str(getattr(event, "idempotency_key", "") or ""),
+                    **span_attrs,
                     "category": str(getattr(plan, "category", "") or ""),
                 },
             ):
-                plan_decision = self.policy_engine.evaluate_plan(
+                plan_decision = await asyncio.to_thread(
+                    self.policy_engine.evaluate_plan,
                     PlanIntent(
                         target_files=plan.files,
                         category=plan.category,
                         operation_types=[op.type for op in plan.operations],
-                    )
+                    ),
                 )
-            _step_end(
-                policy_plan_idx,
-                status="ok" if plan_decision.allowed else "fail",
-                started=policy_plan_started,
-            )
-            await self.store.update_run(
-                run_id,
-                plan_json=plan.model_dump(),
-                plan_policy_json=plan_decision.model_dump(),
-            )
-            await _emit(
-                "policy_plan",
-                "completed" if plan_decision.allowed else "failed",
-                {
-                    "allowed": plan_decision.allowed,
-                    "danger_score": plan_decision.danger_score,
-                },
-            )
+            _step_end(policy_plan_idx, status="ok" if plan_decision.allowed else "fail")
+
+            allowed_categories = selected.adapter.allowed_categories()
+            category_allowed = not allowed_categories or plan.category in allowed_categories
+            allowed_types = selected.adapter.allowed_fix_types()
+            op_types = frozenset(str(op.type) for op in plan.operations)
+            types_allowed = op_types.issubset(allowed_types)
+
+            # The plan gates below are all decided by now. When every one passes,
+            # start the critic's LLM review so it overlaps the persistence and
+            # dashboard round-trips; a blocked plan never reaches the critic.
+            critic_task: asyncio.Task[CriticDecision] | None = None
+            if plan_decision.allowed and category_allowed and types_allowed:
+                critic_idx = timeline.start("critic")
+                critic_task = asyncio.create_task(
+                    self._review_plan(rca_result=rca, context=context, plan=plan)
+                )
+            # Each dump is persisted and, on the matching exit path, returned as-is;
+            # plan_dump also feeds the consensus shadow comparison below.
+            plan_dump = plan.model_dump()
+            plan_policy_dump = plan_decision.model_dump()
+            try:
+                await _update(
+                    plan_json=plan_dump,
+                    plan_policy_json=plan_policy_dump,
+                )
+                _emit(
+                    "policy_plan",
+                    "completed" if plan_decision.allowed else "failed",
+                    {
+                        "allowed": plan_decision.allowed,
+                        "danger_score": plan_decision.danger_score,
+                    },
+                )
+            except BaseException:
+                if critic_task is not None:
+                    critic_task.cancel()
+                raise
             for v in plan_decision.violations:
-                METRICS.policy_violations_total.labels(type=str(v.code).split(".")[0]).inc()
+                _metric_child(METRICS.policy_violations_total, type=str(v.code).split(".")[0]).inc()
 
             if not plan_decision.allowed:
-                await self.store.update_run(
-                    run_id,
-                    status=FixPipelineRunStatus.PLAN_BLOCKED.value,
-                    error_message="Plan blocked by safety policy",
-                )
-                await _emit("plan", "blocked", {"reason": "policy"})
+                await _block("plan", "policy", "Plan blocked by safety policy")
                 return {
                     "success": False,
                     "error": "plan_blocked",
-                    "policy": plan_decision.model_dump(),
+                    "policy": plan_policy_dump,
                 }
 
-            allowed_categories = selected.adapter.allowed_categories()
-            if allowed_categories and plan.category not in allowed_categories:
-                await self.store.update_run(
-                    run_id,
-                    status=FixPipelineRunStatus.PLAN_BLOCKED.value,
-                    error_message=f"Unsupported plan category: {plan.category}",
+            if not category_allowed:
+                await _block(
+                    "plan", "unsupported_category", f"Unsupported plan category: {plan.category}"
                 )
-                await _emit("plan", "blocked", {"reason": "unsupported_category"})
                 return {"success": False, "error": "unsupported_category"}
 
-            allowed_types = selected.adapter.allowed_fix_types()
-            op_types = {str(op.type) for op in plan.operations}
-            if not op_types.issubset(allowed_types):
+            if not types_allowed:
                 disallowed = sorted(op_types - allowed_types)
-                await self.store.update_run(
-                    run_id,
-                    status=FixPipelineRunStatus.PLAN_BLOCKED.value,
-                    error_message=f"Plan used disallowed fix types: {disallowed}",
+                await _block(
+                    "plan", "disallowed_fix_types", f"Plan used disallowed fix types: {disallowed}"
                 )
-                await _emit("plan", "blocked", {"reason": "disallowed_fix_types"})
                 return {"success": False, "error": "disallowed_fix_types"}
 
-            critic_idx, critic_started = _step_start("critic")
-            try:
-                critic_decision = await self.critic.review(
-                    rca_result=rca,
-                    context=context,
-                    plan=plan,
+            if critic_task is None:
+                critic_idx = timeline.start("critic")
+                critic_task = asyncio.create_task(
+                    self._review_plan(rca_result=rca, context=context, plan=plan)
                 )
-            except Exception as exc:
-                critic_decision = _default_critic_decision(f"Critic failed: {exc}")
-            _step_end(
-                critic_idx,
-                status="ok" if critic_decision.allowed else "fail",
-                started=critic_started,
-            )
+            critic_decision = await critic_task
+            _step_end(critic_idx, status="ok" if critic_decision.allowed else "fail")
             record_critic_decision(outcome="allow" if critic_decision.allowed else "block")
             manual_review_required = bool(critic_decision.requires_manual_review)
-            await self.store.update_run(
-                run_id,
-                critic_json=critic_decision.model_dump(),
+            critic_dump = critic_decision.model_dump()
+            pending_fields.update(
+                critic_json=critic_dump,
                 manual_review_required=manual_review_required,
             )
-            await _emit(
+            _emit(
                 "critic",
                 "completed" if critic_decision.allowed else "failed",
                 {
@@ -446,20 +629,16 @@ class FixPipelineOrchestrator:
                 },
             )
             if not critic_decision.allowed:
-                await self.store.update_run(
-                    run_id,
-                    status=FixPipelineRunStatus.PLAN_BLOCKED.value,
-                    error_message="Plan rejected by critic",
-                )
-                await _emit("plan", "blocked", {"reason": "critic_rejected"})
+                await _block("plan", "critic_rejected", "Plan rejected by critic")
                 return {
                     "success": False,
                     "error": "critic_rejected",
-                    "critic": critic_decision.model_dump(),
+                    "critic": critic_dump,
                 }
 
+            plan_ready_fields: dict = {"status": FixPipelineRunStatus.PLAN_READY.value}
             if self.settings.phase4_consensus_enabled:
-                consensus_idx, consensus_started = _step_start("consensus")
+                consensus_idx = timeline.start("consensus")
                 consensus_decision = self.consensus.resolve(
                     issue_graph=issue_graph,
                     plan=plan,
@@ -469,9 +648,7 @@ class FixPipelineOrchestrator:
                     min_confidence=self.settings.phase4_consensus_min_confidence,
                 )
                 _step_end(
-                    consensus_idx,
-                    status="ok" if consensus_decision.state == "accepted" else "fail",
-                    started=consensus_started,
+                    consensus_idx, status="ok" if consensus_decision.state == "accepted" else "fail"
                 )
                 for candidate in consensus_decision.candidates:
                     outcome = (
@@ -499,16 +676,16 @@ class FixPipelineOrchestrator:
                     "selected_plan_present": selected_plan is not None,
                     "same_as_executed": (
                         selected_plan is not None
-                        and selected_plan.model_dump() == plan.model_dump()
+                        and (selected_plan is plan or selected_plan.model_dump() == plan_dump)
                     ),
                 }
-                await self.store.update_run(
-                    run_id,
-                    consensus_json=consensus_decision.model_dump(mode="json"),
+                consensus_dump = consensus_decision.model_dump(mode="json")
+                pending_fields.update(
+                    consensus_json=consensus_dump,
                     consensus_state=consensus_decision.state,
                     consensus_shadow_diff_json=shadow,
                 )
-                await _emit(
+                _emit(
                     "consensus",
                     "completed" if consensus_decision.state == "accepted" else "failed",
                     {
@@ -518,223 +695,201 @@ class FixPipelineOrchestrator:
                 )
                 if self.settings.phase4_consensus_mode == "enforced":
                     if consensus_decision.state != "accepted" or selected_plan is None:
-                        await self.store.update_run(
-                            run_id,
-                            status=FixPipelineRunStatus.PLAN_BLOCKED.value,
-                            error_message="Plan rejected by consensus coordinator",
+                        await _block(
+                            "plan", "consensus_rejected", "Plan rejected by consensus coordinator"
                         )
-                        await _emit("plan", "blocked", {"reason": "consensus_rejected"})
                         return {
                             "success": False,
                             "error": "consensus_rejected",
-                            "consensus": consensus_decision.model_dump(mode="json"),
+                            "consensus": consensus_dump,
                         }
                     plan = selected_plan
-                    await self.store.update_run(run_id, plan_json=plan.model_dump(mode="json"))
+                    plan_ready_fields["plan_json"] = plan
 
-            await self.store.update_run(run_id, status=FixPipelineRunStatus.PLAN_READY.value)
-            await _emit("plan", "ready")
+            await _update(**plan_ready_fields)
+            _emit("plan", "ready")
+            # Consensus may have swapped the plan above; this is the final file set.
+            plan_files = frozenset(plan.files)
 
-            repo_url = _derive_repo_url(event)
-            if not repo_url:
-                await self.store.update_run(
-                    run_id,
+            if clone_task is None:
+                await _update(
                     status=FixPipelineRunStatus.PLAN_BLOCKED.value,
                     error_message="Unsupported repository URL for cloning",
                 )
-                await _emit("clone", "failed", {"reason": "repo_url_missing"})
+                _emit("clone", "failed", {"reason": "repo_url_missing"})
                 return {"success": False, "error": "repo_url_missing"}
 
-            clone_idx, clone_started = _step_start("clone")
-            repo_path = await self.repo_manager.clone(
-                repo_url=repo_url,
-                branch=event.branch,
-                commit=event.commit_sha,
-                depth=50,
-            )
-            _step_end(clone_idx, status="ok", started=clone_started)
-            await _emit("clone", "completed")
-
-            repo_files = _list_repo_files(repo_path)
-            selected_repo = select_adapter(log_text, repo_files) or selected
-            if selected_repo.adapter.name != selected.adapter.name:
-                selected = selected_repo
-                await self.store.update_run(
-                    run_id,
-                    adapter_name=selected.adapter.name,
-                    detection_json=selected.detection.model_dump(mode="json"),
-                )
+            repo_path = await clone_task
+            _emit("clone", "completed")
+
+            if selected.detection.confidence < _DECISIVE_DETECTION_CONFIDENCE:
+                # Adapters only look for their build files, so the (possibly
+                # huge) checkout listing is never materialized beyond those.
+                repo_files = _list_relevant_repo_files(repo_path, repo_marker_suffixes())
+                selected_repo = select_adapter(log_text, repo_files) or selected
+                if selected_repo.adapter.name != selected.adapter.name:
+                    selected = selected_repo
+                    pending_fields.update(
+                        adapter_name=selected.adapter.name,
+                        detection_json=selected.detection,
+                    )
 
-            patch_idx, patch_started = _step_start("patch")
+            patch_idx = timeline.start("patch")
             with start_span(
                 "generate_patch",
                 attributes={
-                    "run_id": str(run_id),
-                    "failure_id": str(event.id),
-                    "run_key": str(getattr(event, "idempotency_key", "") or ""),
+                    **span_attrs,
                     "category": str(getattr(plan, "category", "") or ""),
                 },
             ):
                 patch = self.patch_generator.generate(repo_path, plan)
-            _step_end(patch_idx, status="ok", started=patch_started)
-            await _emit("patch", "completed")
+            _step_end(patch_idx, status="ok")
+            _emit("patch", "completed")
             parsed = parse_unified_diff(patch.diff_text)
             touched = {f.path for f in parsed.files}
-            plan_files = set(plan.files)
-            if touched - plan_files:
-                await self.store.update_run(
-                    run_id,
-                    status=FixPipelineRunStatus.PATCH_BLOCKED.value,
-                    error_message="Patch touched files outside plan.files",
+            if not touched.issubset(plan_files):
+                await _block(
+                    "patch",
+                    "outside_plan",
+                    "Patch touched files outside plan.files",
                     patch_diff=patch.diff_text,
                     patch_stats_json=patch.stats.as_dict(),
                 )
-                await _emit("patch", "blocked", {"reason": "outside_plan"})
                 return {"success": False, "error": "patch_outside_plan"}
-            if protected_paths:
+            if protected is not None:
+                # touched is already a set, so the matches need no de-duplication.
                 blocked_files = sorted(
-                    {path for path in touched if _matches_protected_path(path, protected_paths)}
+                    path for path in touched if _matches_protected_path(path, protected)
                 )
                 if blocked_files:
-                    await self.store.update_run(
-                        run_id,
-                        status=FixPipelineRunStatus.PATCH_BLOCKED.value,
-                        error_message=f"Patch touches protected paths: {blocked_files}",
+                    await _block(
+                        "patch",
+                        "protected_paths",
+                        f"Patch touches protected paths: {blocked_files}",
                         patch_diff=patch.diff_text,
                         patch_stats_json=patch.stats.as_dict(),
                     )
-                    await _emit("patch", "blocked", {"reason": "protected_paths"})
                     return {"success": False, "error": "protected_paths_blocked"}
 
-            policy_patch_idx, policy_patch_started = _step_start("policy_patch")
-            with start_span(
-                "policy_check_patch",
-                attributes={
-                    "run_id": str(run_id),
-                    "failure_id": str(event.id),
-                    "run_key": str(getattr(event, "idempotency_key", "") or ""),
-                },
-            ):
-                patch_decision = self.policy_engine.evaluate_patch(patch.diff_text)
-            _step_end(
-                policy_patch_idx,
-                status="ok" if patch_decision.allowed else "fail",
-                started=policy_patch_started,
-            )
-            await self.store.update_run(
-                run_id,
-                patch_diff=patch.diff_text,
-                patch_stats_json=patch.stats.as_dict(),
-                patch_policy_json=patch_decision.model_dump(),
-            )
-            await _emit(
-                "policy_patch",
-                "completed" if patch_decision.allowed else "failed",
-                {
-                    "allowed": patch_decision.allowed,
-                    "danger_score": patch_decision.danger_score,
-                },
+            # `git apply --check` is a subprocess; run it while the policy scans
+            # the diff. It writes and removes .patch in the checkout, so it is
+            # always awaited before the real apply or the checkout cleanup.
+            patch_check_task = asyncio.create_task(
+                asyncio.to_thread(
+                    self.repo_manager.apply_patch,
+                    repo_path=repo_path,
+                    diff=patch.diff_text,
+                    check_only=True,
+                )
             )
-            for v in patch_decision.violations:
-                METRICS.policy_violations_total.labels(type=str(v.code).split(".")[0]).inc()
-            METRICS.danger_score_bucket.labels(
-                bucket=bucket_danger_score(int(patch_decision.danger_score))
-            ).inc()
-
-            if not patch_decision.allowed:
-                await self.store.update_run(
-                    run_id,
-                    status=FixPipelineRunStatus.PATCH_BLOCKED.value,
-                    error_message="Patch blocked by safety policy",
+            try:
+                policy_patch_idx = timeline.start("policy_patch")
+                with start_span(
+                    "policy_check_patch",
+                    attributes=span_attrs,
+                ):
+                    patch_decision = await asyncio.to_thread(
+                        self.policy_engine.evaluate_patch, patch.diff_text
+                    )
+                _step_end(policy_patch_idx, status="ok" if patch_decision.allowed else "fail")
+                patch_policy_dump = patch_decision.model_dump()
+                pending_fields.update(
+                    patch_diff=patch.diff_text,
+                    patch_stats_json=patch.stats.as_dict(),
+                    patch_policy_json=patch_policy_dump,
                 )
-                await _emit("patch", "blocked", {"reason": "policy"})
-                return {
-                    "success": False,
-                    "error": "patch_blocked",
-                    "policy": patch_decision.model_dump(),
-                }
+                _emit(
+                    "policy_patch",
+                    "completed" if patch_decision.allowed else "failed",
+                    {
+                        "allowed": patch_decision.allowed,
+                        "danger_score": patch_decision.danger_score,
+                    },
+                )
+                for v in patch_decision.violations:
+                    _metric_child(
+                        METRICS.policy_violations_total, type=str(v.code).split(".")[0]
+                    ).inc()
+                _metric_child(
+                    METRICS.danger_score_bucket,
+                    bucket=bucket_danger_score(int(patch_decision.danger_score)),
+                ).inc()
+
+                if not patch_decision.allowed:
+                    await _block("patch", "policy", "Patch blocked by safety policy")
+                    return {
+                        "success": False,
+                        "error": "patch_blocked",
+                        "policy": patch_policy_dump,
+                    }
+            finally:
+                patch_check = await patch_check_task
 
-            patch_check = self.repo_manager.apply_patch(
-                repo_path=repo_path, diff=patch.diff_text, check_only=True
-            )
             if not patch_check.success:
-                await self.store.update_run(
-                    run_id,
-                    status=FixPipelineRunStatus.PATCH_BLOCKED.value,
-                    error_message=f"Patch does not apply cleanly: {patch_check.error_message}",
+                await _block(
+                    "patch",
+                    "not_applicable",
+                    f"Patch does not apply cleanly: {patch_check.error_message}",
                 )
-                await _emit("patch", "blocked", {"reason": "not_applicable"})
                 return {"success": False, "error": "patch_not_applicable"}
 
             patch_apply = self.repo_manager.apply_patch(
                 repo_path=repo_path, diff=patch.diff_text, check_only=False
             )
             if not patch_apply.success:
-                await self.store.update_run(
-                    run_id,
-                    status=FixPipelineRunStatus.PATCH_BLOCKED.value,
-                    error_message=f"Patch apply failed for AST gate: {patch_apply.error_message}",
+                await _block(
+                    "patch",
+                    "patch_apply_failed",
+                    f"Patch apply failed for AST gate: {patch_apply.error_message}",
                 )
-                await _emit("patch", "blocked", {"reason": "patch_apply_failed"})
                 return {"success": False, "error": "patch_apply_failed"}
 
-            ast_idx, ast_started = _step_start("ast_guard")
-            ast_result = validate_python_ast(
+            ast_idx = timeline.start("ast_guard")
+            ast_result = await validate_python_ast(
                 repo_path=Path(repo_path), touched_files=sorted(touched)
             )
-            _step_end(
-                ast_idx,
-                status="ok" if ast_result.passed else "fail",
-                started=ast_started,
-            )
+            _step_end(ast_idx, status="ok" if ast_result.passed else "fail")
             if not ast_result.passed:
-                await self.store.update_run(
-                    run_id,
+                await _update(
                     status=FixPipelineRunStatus.PATCH_BLOCKED.value,
                     error_message=f"AST validation failed: {[i.message for i in ast_result.issues]}",
                 )
-                await _emit(
+                _emit(
                     "ast_guard",
                     "failed",
                     {"checked_files": ast_result.checked_files, "issues": len(ast_result.issues)},
                 )
                 return {"success": False, "error": "ast_validation_failed"}
-            await _emit(
+            _emit(
                 "ast_guard",
                 "completed",
                 {"checked_files": ast_result.checked_files},
             )
 
             fix = self._build_fix_suggestion(
-                str(run_id), event.id, plan, patch.diff_text, patch_decision
+                run_id_str, event.id, plan, patch.diff_text, patch_decision
             )
+            pr_label = getattr(fix.safety_status, "pr_label", None)
             guardrail_status: GuardrailStatus = self.guardrails.validate(fix)
             fix.guardrail_status = guardrail_status
             if not guardrail_status.passed:
-                await self.store.update_run(
-                    run_id,
-                    status=FixPipelineRunStatus.PATCH_BLOCKED.value,
-                    error_message="Patch blocked by guardrails",
-                )
-                await _emit("patch", "blocked", {"reason": "guardrails"})
+                await _block("patch", "guardrails", "Patch blocked by guardrails")
                 return {"success": False, "error": "guardrails_blocked"}
 
-            await self.store.update_run(run_id, status=FixPipelineRunStatus.PATCH_READY.value)
-            await _emit("patch", "ready")
+            await _update(status=FixPipelineRunStatus.PATCH_READY.value)
+            _emit("patch", "ready")
 
-            validate_idx, validate_started = _step_start("validate")
+            validate_idx = timeline.start("validate")
             with start_span(
                 "sandbox_validate",
                 attributes={
-                    "run_id": str(run_id),
-                    "failure_id": str(event.id),
-                    "run_key": str(getattr(event, "idempotency_key", "") or ""),
+                    **span_attrs,
                     "adapter": str(selected.adapter.name),
                 },
             ):
                 validation = await self.validator.validate(
                     ValidationRequest(
-                        fix_id=str(run_id),
+                        fix_id=run_id_str,
                         event_id=event.id,
                         repo_url=repo_url,
                         branch=event.branch,
@@ -746,12 +901,8 @@ class FixPipelineOrchestrator:
                         ),
                     )
                 )
-            _step_end(
-                validate_idx,
-                status="ok" if validation.is_successful else "fail",
-                started=validate_started,
-            )
-            await _emit(
+            _step_end(validate_idx, status="ok" if validation.is_successful else "fail")
+            _emit(
                 "validate",
                 "completed" if validation.is_successful else "failed",
                 {
@@ -760,78 +911,22 @@ class FixPipelineOrchestrator:
                     "tests_passed": validation.tests_passed,
                 },
             )
+            # Scans run inside the sandbox validation; this documented span
+            # brackets their bookkeeping rather than standing empty.
             with start_span(
                 "run_scans",
                 attributes={
-                    "run_id": str(run_id),
-                    "failure_id": str(event.id),
-                    "run_key": str(getattr(event, "idempotency_key", "") or ""),
+                    **span_attrs,
                     "outcome": "ok" if validation.is_successful else "fail",
                 },
             ):
-                pass
-            scans_status = "skipped"
-            if validation.scans:
-                scans_status = "ok"
-                if validation.scans.gitleaks and validation.scans.gitleaks.status.value in {
-                    "fail",
-                    "error",
-                }:
-                    scans_status = "fail"
-                if validation.scans.trivy and validation.scans.trivy.status.value in {
-                    "fail",
-                    "error",
-                }:
-                    scans_status = "fail"
-                if validation.scans.gitleaks:
-                    METRICS.scan_findings_total.labels(scanner="gitleaks", severity="UNKNOWN").inc(
-                        int(validation.scans.gitleaks.findings_count or 0)
-                    )
-                    if validation.scans.gitleaks.status.value in {"fail", "error"}:
-                        METRICS.scan_fail_total.labels(
-                            scanner="gitleaks",
-                            reason=(
-                                "timeout"
-                                if "timeout"
-                                in str(validation.scans.gitleaks.error_message or "").lower()
-                                else (
-                                    "error"
-                                    if validation.scans.gitleaks.status.value == "error"
-                                    else "unknown"
-                                )
-                            ),
-                        ).inc()
-                if validation.scans.trivy:
-                    for sev, count in (validation.scans.trivy.severity_counts or {}).items():
-                        METRICS.scan_findings_total.labels(
-                            scanner="trivy", severity=str(sev).upper() or "UNKNOWN"
-                        ).inc(int(count or 0))
-                    if validation.scans.trivy.status.value in {"fail", "error"}:
-                        METRICS.scan_fail_total.labels(
-                            scanner="trivy",
-                            reason=(
-                                "timeout"
-                                if "timeout"
-                                in str(validation.scans.trivy.error_message or "").lower()
-                                else (
-                                    "error"
-                                    if validation.scans.trivy.status.value == "error"
-                                    else "unknown"
-                                )
-                            ),
-                        ).inc()
-            timeline.append(
-                {
-                    "step": "scans",
-                    "status": scans_status,
-                    "started_at": None,
-                    "completed_at": None,
-                    "duration_ms": None,
-                }
-            )
+                scans_status = (
+                    _record_scan_metrics(validation.scans) if validation.scans else "skipped"
+                )
+            timeline.add("scans", scans_status)
 
             sbom = validation.scans.sbom if validation.scans else None
-            update_fields: dict = {"validation_json": validation.model_dump(mode="json")}
+            update_fields: dict = {"validation_json": validation}
             if sbom and sbom.path and sbom.sha256 and sbom.size_bytes is not None:
                 update_fields.update(
                     {
@@ -840,28 +935,27 @@ class FixPipelineOrchestrator:
                         "sbom_size_bytes": sbom.size_bytes,
                     }
                 )
-            await self.store.update_run(run_id, **update_fields)
+            # Results and outcome status go out in one write; nothing is emitted between.
             if not validation.is_successful:
-                await self.store.update_run(
-                    run_id,
+                await _update(
+                    **update_fields,
                     status=FixPipelineRunStatus.VALIDATION_FAILED.value,
                     error_message=validation.error_message or "Validation failed",
                 )
-                await _emit("pipeline", "failed", {"reason": "validation_failed"})
+                _emit("pipeline", "failed", {"reason": "validation_failed"})
                 return {"success": False, "error": "validation_failed"}
 
-            await self.store.update_run(run_id, status=FixPipelineRunStatus.VALIDATION_PASSED.value)
-            await _emit("validate", "passed")
+            await _update(**update_fields, status=FixPipelineRunStatus.VALIDATION_PASSED.value)
+            _emit("validate", "passed")
 
             if automation_mode == "suggest" or (
                 automation_mode == "auto_merge" and manual_review_required
             ):
-                await self.store.update_run(
-                    run_id,
+                await _update(
                     status=FixPipelineRunStatus.AWAITING_APPROVAL.value,
                     manual_review_required=manual_review_required,
                 )
-                await _emit(
+                _emit(
                     "approval",
                     "required",
                     {
@@ -869,50 +963,37 @@ class FixPipelineOrchestrator:
                         "manual_review_required": manual_review_required,
                     },
                 )
-                await _emit("pipeline", "completed", {"awaiting_approval": True})
+                _emit("pipeline", "completed", {"awaiting_approval": True})
                 return {
                     "success": True,
-                    "run_id": str(run_id),
+                    "run_id": run_id_str,
                     "awaiting_approval": True,
                     "automation_mode": automation_mode,
                 }
 
-            existing_run = await self.store.get_run(run_id)
-            if existing_run and (
-                existing_run.last_pr_url
-                or (
-                    existing_run.pr_json
-                    and str(existing_run.pr_json.get("status") or "").lower() == "created"
-                )
+            # Pipeline runs hold the run_key lock, so the row loaded at the start
+            # already reflects any PR an earlier attempt created.
+            if run.last_pr_url or (
+                run.pr_json and str(run.pr_json.get("status") or "").lower() == "created"
             ):
                 from sre_agent.ops.metrics import inc
 
                 inc(
                     "pr_create_skipped",
-                    attributes={"run_id": str(run_id), "reason": "already_created"},
-                )
-                timeline.append(
-                    {
-                        "step": "pr_create",
-                        "status": "skipped",
-                        "started_at": None,
-                        "completed_at": None,
-                        "duration_ms": None,
-                    }
+                    attributes={"run_id": run_id_str, "reason": "already_created"},
                 )
-                await self.store.update_run(run_id, status=FixPipelineRunStatus.PR_CREATED.value)
-                await _emit("pr_create", "skipped", {"reason": "already_created"})
-                await _emit("pipeline", "completed")
-                return {"success": True, "run_id": str(run_id), "skipped": "pr_already_created"}
+                timeline.add("pr_create", "skipped")
+                await _update(status=FixPipelineRunStatus.PR_CREATED.value)
+                _emit("pr_create", "skipped", {"reason": "already_created"})
+                _emit("pipeline", "completed")
+                return {"success": True, "run_id": run_id_str, "skipped": "pr_already_created"}
 
-            pr_idx, pr_started = _step_start("pr_create")
+            pr_idx = timeline.start("pr_create")
             with start_span(
                 "create_pr",
                 attributes={
-                    "run_id": str(run_id),
-                    "failure_id": str(event.id),
-                    "run_key": str(getattr(event, "idempotency_key", "") or ""),
-                    "pr_label": str(getattr(fix.safety_status, "pr_label", "") or ""),
+                    **span_attrs,
+                    "pr_label": str(pr_label or ""),
                 },
             ):
                 pr_result = await self._create_pr_for_fix(
@@ -923,89 +1004,98 @@ class FixPipelineOrchestrator:
                     base_branch=event.branch,
                     run_id=run_id,
                 )
-            _step_end(
-                pr_idx,
-                status="ok" if pr_result.status.value == "created" else "fail",
-                started=pr_started,
-            )
-            await self.store.update_run(
-                run_id,
-                pr_json=pr_result.model_dump(),
-                last_pr_url=pr_result.pr_url,
-                last_pr_created_at=pr_result.created_at,
-            )
+            _step_end(pr_idx, status="ok" if pr_result.status.value == "created" else "fail")
+            # Every outcome below returns the same dump.
+            pr_dump = pr_result.model_dump()
+            pr_fields = {
+                "pr_json": pr_result,
+                "last_pr_url": pr_result.pr_url,
+                "last_pr_created_at": pr_result.created_at,
+            }
 
             if pr_result.status.value != "created":
-                await self.store.update_run(
-                    run_id,
+                await _update(
+                    **pr_fields,
                     status=FixPipelineRunStatus.PR_FAILED.value,
                     error_message=pr_result.error_message or "PR creation failed",
                 )
-                await _emit("pr_create", "failed", {"reason": pr_result.error_message})
-                await _emit("pipeline", "failed", {"reason": "pr_failed"})
+                _emit("pr_create", "failed", {"reason": pr_result.error_message})
+                _emit("pipeline", "failed", {"reason": "pr_failed"})
                 return {"success": False, "error": "pr_failed"}
 
-            METRICS.pr_created_total.labels(
-                label=str(getattr(fix.safety_status, "pr_label", "") or "unknown")
+            _metric_child(
+                METRICS.pr_created_total,
+                label=str(pr_label or "unknown"),
             ).inc()
-            await self.store.update_run(run_id, status=FixPipelineRunStatus.PR_CREATED.value)
-            await _emit("pr_create", "completed", {"pr_url": pr_result.pr_url})
+            can_merge = automation_mode == "auto_merge" and _can_auto_merge(
+                validation_passed=validation.is_successful,
+                pr_label=pr_label,
+                manual_review=manual_review_required,
+            )
+            # A mergeable PR's merge API call overlaps the PR_CREATED write.
+            merge_task: asyncio.Task[tuple[bool, dict]] | None = None
+            if can_merge and pr_result.pr_number is not None:
+                merge_task = asyncio.create_task(
+                    self.pr_orchestrator.merge_pr_for_fix(
+                        repo_url=repo_url,
+                        pr_number=pr_result.pr_number,
+                    )
+                )
+            try:
+                await _update(**pr_fields, status=FixPipelineRunStatus.PR_CREATED.value)
+            except BaseException:
+                if merge_task is not None:
+                    merge_task.cancel()
+                raise
+            _emit("pr_create", "completed", {"pr_url": pr_result.pr_url})
 
             if automation_mode == "auto_merge":
-                can_merge = _can_auto_merge(
-                    validation_passed=validation.is_successful,
-                    pr_label=getattr(fix.safety_status, "pr_label", None),
-                    manual_review=manual_review_required,
-                )
                 if not can_merge:
-                    await self.store.update_run(
-                        run_id,
+                    await _update(
                         status=FixPipelineRunStatus.AWAITING_APPROVAL.value,
                         manual_review_required=True,
                     )
-                    await _emit(
+                    _emit(
                         "approval",
                         "required",
                         {"reason": "auto_merge_gate_not_satisfied"},
                     )
-                    await _emit("pipeline", "completed", {"awaiting_approval": True})
+                    _emit("pipeline", "completed", {"awaiting_approval": True})
                     return {
                         "success": True,
-                        "run_id": str(run_id),
-                        "pr": pr_result.model_dump(),
+                        "run_id": run_id_str,
+                        "pr": pr_dump,
                         "awaiting_approval": True,
                     }
 
                 if pr_result.pr_number is None:
-                    await self.store.update_run(
-                        run_id,
+                    await _update(
                         status=FixPipelineRunStatus.MERGE_FAILED.value,
                         error_message="PR number missing; cannot auto-merge",
                     )
                     record_auto_merge(outcome="failed")
-                    await _emit("merge", "failed", {"reason": "pr_number_missing"})
-                    await _emit("pipeline", "failed", {"reason": "merge_failed"})
+                    _emit("merge", "failed", {"reason": "pr_number_missing"})
+                    _emit("pipeline", "failed", {"reason": "merge_failed"})
                     return {"success": False, "error": "merge_failed"}
 
-                merge_ok, merge_result = await self.pr_orchestrator.merge_pr_for_fix(
-                    repo_url=repo_url,
-                    pr_number=pr_result.pr_number,
-                )
-                await self.store.update_run(run_id, merge_result_json=merge_result)
+                merge_ok, merge_result = await merge_task
                 if not merge_ok:
-                    await self.store.update_run(
-                        run_id,
+                    await _update(
+                        merge_result_json=merge_result,
                         status=FixPipelineRunStatus.MERGE_FAILED.value,
                         error_message=str(merge_result.get("message") or "Auto-merge failed"),
                     )
                     record_auto_merge(outcome="failed")
-                    await _emit("merge", "failed", merge_result)
-                    await _emit("pipeline", "failed", {"reason": "merge_failed"})
+                    _emit("merge", "failed", merge_result)
+                    _emit("pipeline", "failed", {"reason": "merge_failed"})
                     return {"success": False, "error": "merge_failed", "merge": merge_result}
 
                 record_auto_merge(outcome="merged")
-                await self.store.update_run(run_id, status=FixPipelineRunStatus.MERGED.value)
-                await _emit("merge", "completed", merge_result)
+                await _update(
+                    merge_result_json=merge_result,
+                    status=FixPipelineRunStatus.MERGED.value,
+                )
+                _emit("merge", "completed", merge_result)
 
                 await self.post_merge_monitor.register(
                     run_id=run_id,
@@ -1013,81 +1103,46 @@ class FixPipelineOrchestrator:
                     branch=event.branch,
                     pr_number=pr_result.pr_number,
                 )
-                await _emit(
-                    "post_merge", "monitoring", {"repo": event.repo, "branch": event.branch}
-                )
-                await _emit("pipeline", "completed")
+                _emit("post_merge", "monitoring", {"repo": event.repo, "branch": event.branch})
+                _emit("pipeline", "completed")
                 return {
                     "success": True,
-                    "run_id": str(run_id),
-                    "pr": pr_result.model_dump(),
+                    "run_id": run_id_str,
+                    "pr": pr_dump,
                     "merge": merge_result,
                     "monitoring": True,
                 }
 
-            await _emit("pipeline", "completed")
-            return {"success": True, "run_id": str(run_id), "pr": pr_result.model_dump()}
+            _emit("pipeline", "completed")
+            return {"success": True, "run_id": run_id_str, "pr": pr_dump}
         finally:
             try:
-                latest = await self.store.get_run(run_id)
-                if latest is not None:
-                    evidence: list[dict] = []
-                    if latest.context_json:
-                        log_content = (latest.context_json or {}).get("log_content") or {}
-                        raw = (log_content or {}).get("raw_content")
-                        summary = (latest.context_json or {}).get("log_summary")
-                        log_text = str(raw or summary or "")
-                        if log_text:
-                            extracted = extract_evidence_lines(log_text, max_lines=30)
-                            linked = attach_operation_links(
-                                extracted,
-                                operations=(
-                                    (latest.plan_json or {}).get("operations")
-                                    if latest.plan_json
-                                    else None
-                                ),
-                            )
-                            evidence = [
-                                {
-                                    "idx": e.idx,
-                                    "line": e.line,
-                                    "tag": e.tag,
-                                    "operation_idx": e.operation_idx,
-                                }
-                                for e in linked
-                            ]
-
-                    with start_span(
-                        "persist_artifact",
-                        attributes={
-                            "run_id": str(run_id),
-                            "failure_id": str(getattr(latest, "event_id", "")),
-                            "run_key": str(getattr(event, "idempotency_key", "") or ""),
-                        },
-                    ):
-                        artifact = build_provenance_artifact(
-                            run_id=latest.id,
-                            failure_id=latest.event_id,
+                with start_span("persist_artifact", attributes=span_attrs):
+                    # Leftover pending fields are written with RETURNING, and
+                    # that row (or a plain read) feeds the artifact write, all
+                    # in one session.
+                    await self.store.update_run_from(
+                        run_id,
+                        partial(
+                            self._artifact_fields,
                             repo=event.repo,
-                            status=str(getattr(latest, "status", "unknown")),
-                            started_at=getattr(latest, "created_at", None),
-                            error_message=getattr(latest, "error_message", None),
-                            plan_json=getattr(latest, "plan_json", None),
-                            plan_policy_json=getattr(latest, "plan_policy_json", None),
-                            patch_stats_json=getattr(latest, "patch_stats_json", None),
-                            patch_policy_json=getattr(latest, "patch_policy_json", None),
-                            validation_json=getattr(latest, "validation_json", None),
-                            adapter_name=getattr(latest, "adapter_name", None),
-                            detection_json=getattr(latest, "detection_json", None),
-                            evidence=evidence,
-                            timeline=timeline,
-                        )
-                        await self.store.update_run(
-                            run_id, artifact_json=artifact.model_dump(mode="json")
-                        )
+                            timeline=timeline.as_dicts(),
+                        ),
+                        **pending_fields,
+                    )
             except Exception:
                 logger.exception("Failed to persist provenance artifact")
 
+            if clone_task is not None and repo_path is None:
+                # An early exit left the clone running, or it failed unawaited.
+                clone_task.cancel()
+                try:
+                    repo_path = await clone_task
+                except asyncio.CancelledError:
+                    pass
+                except Exception:
+                    logger.exception("Background clone failed")
+
             if repo_path is not None:
                 try:
                     if hasattr(self.repo_manager, "cleanup"):
@@ -1095,25 +1150,81 @@ class FixPipelineOrchestrator:
                 except Exception:
                     logger.exception("Failed to cleanup repo")
 
+            emit_queue.put_nowait(None)
+            await emit_task
+
+    def _artifact_fields(self, latest: FixPipelineRun, *, repo: str, timeline: list[dict]) -> dict:
+        evidence: list[dict] = []
+        if latest.context_json:
+            log_content = (latest.context_json or {}).get("log_content") or {}
+            raw = (log_content or {}).get("raw_content")
+            summary = (latest.context_json or {}).get("log_summary")
+            log_text = str(raw or summary or "")
+            if log_text:
+                extracted = extract_evidence_lines(log_text, max_lines=30)
+                linked = attach_operation_links(
+                    extracted,
+                    operations=(
+                        (latest.plan_json or {}).get("operations") if latest.plan_json else None
+                    ),
+                )
+                evidence = [
+                    {
+                        "idx": e.idx,
+                        "line": e.line,
+                        "tag": e.tag,
+                        "operation_idx": e.operation_idx,
+                    }
+                    for e in linked
+                ]
+
+        artifact = build_provenance_artifact(
+            run_id=latest.id,
+            failure_id=latest.event_id,
+            repo=repo,
+            status=str(getattr(latest, "status", "unknown")),
+            started_at=getattr(latest, "created_at", None),
+            error_message=getattr(latest, "error_message", None),
+            plan_json=getattr(latest, "plan_json", None),
+            plan_policy_json=getattr(latest, "plan_policy_json", None),
+            patch_stats_json=getattr(latest, "patch_stats_json", None),
+            patch_policy_json=getattr(latest, "patch_policy_json", None),
+            validation_json=getattr(latest, "validation_json", None),
+            adapter_name=getattr(latest, "adapter_name", None),
+            detection_json=getattr(latest, "detection_json", None),
+            evidence=evidence,
+            timeline=timeline,
+        )
+        return {"artifact_json": artifact}
+
+    async def _review_plan(
+        self, *, rca_result: RCAResult, context: FailureContextBundle, plan: FixPlan
+    ) -> CriticDecision:
+        try:
+            return await self.critic.review(rca_result=rca_result, context=context, plan=plan)
+        except Exception as exc:
+            return _default_critic_decision(f"Critic failed: {exc}")
+
     async def _load_or_build_context(
-        self, event: PipelineEvent, run_id: UUID
-    ) -> tuple[FailureContextBundle, RCAResult]:
-        run = await self.store.get_run(run_id)
-        if run and run.context_json and run.rca_json:
+        self, event: PipelineEvent, run: FixPipelineRun
+    ) -> tuple[FailureContextBundle, RCAResult, dict]:
+        """Reuse the run's stored context and RCA, or build them from the event.
+
+        Freshly built results come back as the fields to persist, so the caller
+        can fold them into its next write instead of a separate round-trip.
+        """
+        if run.context_json and run.rca_json:
             return (
                 FailureContextBundle.model_validate(run.context_json),
                 RCAResult.model_validate(run.rca_json),
+                {},
             )
 
         builder = ContextBuilder()
         context = await builder.build_context(event)
         rca_engine = RCAEngine()
         rca = rca_engine.analyze(context)
-
-        await self.store.update_run(
-            run_id, context_json=context.model_dump(), rca_json=rca.model_dump()
-        )
-        return context, rca
+        return context, rca, {"context_json": context, "rca_json": rca}
 
     async def _generate_plan(
         self, context: FailureContextBundle, rca: RCAResult, run_id: UUID
@@ -1131,7 +1242,7 @@ class FixPipelineOrchestrator:
 
     async def approve_and_create_pr(self, run_id: UUID, *, approved_by: str | None = None) -> dict:
         """Approve a paused run and execute PR/merge flow from persisted artifacts."""
-        run = await self.store.get_run(run_id)
+        run, event = await self.store.get_run_with_event(run_id)
         if run is None:
             return {"success": False, "error": "run_not_found"}
         if run.status != FixPipelineRunStatus.AWAITING_APPROVAL.value:
@@ -1140,9 +1251,6 @@ class FixPipelineOrchestrator:
                 "error": "run_not_awaiting_approval",
                 "status": run.status,
             }
-
-        async with get_async_session() as session:
-            event = await session.get(PipelineEvent, run.event_id)
         if event is None:
             return {"success": False, "error": "event_not_found"}
         repo_url = _derive_repo_url(event)
@@ -1182,9 +1290,10 @@ class FixPipelineOrchestrator:
             base_branch=event.branch,
             run_id=run_id,
         )
+        pr_dump = pr_result.model_dump()
         await self.store.update_run(
             run_id,
-            pr_json=pr_result.model_dump(),
+            pr_json=pr_result,
             last_pr_url=pr_result.pr_url,
             last_pr_created_at=pr_result.created_at,
             manual_review_required=False,
@@ -1203,7 +1312,7 @@ class FixPipelineOrchestrator:
 
         automation_mode = str(getattr(run, "automation_mode", "auto_pr") or "auto_pr")
         if automation_mode != "auto_merge":
-            return {"success": True, "run_id": str(run_id), "pr": pr_result.model_dump()}
+            return {"success": True, "run_id": str(run_id), "pr": pr_dump}
 
         can_merge = _can_auto_merge(
             validation_passed=validation.is_successful,
@@ -1215,7 +1324,7 @@ class FixPipelineOrchestrator:
             return {
                 "success": True,
                 "run_id": str(run_id),
-                "pr": pr_result.model_dump(),
+                "pr": pr_dump,
                 "awaiting_approval": True,
             }
 
@@ -1243,7 +1352,7 @@ class FixPipelineOrchestrator:
         return {
             "success": True,
             "run_id": str(run_id),
-            "pr": pr_result.model_dump(),
+            "pr": pr_dump,
             "merge": merge_result,
             "monitoring": True,
             "approved_by": approved_by,
@@ -1284,15 +1393,19 @@ class FixPipelineOrchestrator:
         self, fix_id: str, event_id: UUID, plan: FixPlan, diff_text: str, patch_decision
     ) -> FixSuggestion:
         file_diffs = _split_file_diffs(diff_text)
-        total_added = sum(d.lines_added for d in file_diffs)
-        total_removed = sum(d.lines_removed for d in file_diffs)
-
-        safety_status = SafetyStatus(
+        total_added = total_removed = 0
+        for d in file_diffs:
+            total_added += d.lines_added
+            total_removed += d.lines_removed
+
+        # The policy decision is already validated, so its fields are copied
+        # across without running the schema validators a second time.
+        safety_status = SafetyStatus.model_construct(
             allowed=patch_decision.allowed,
             pr_label=patch_decision.pr_label,
             danger_score=patch_decision.danger_score,
             violations=[
-                SafetyViolation(
+                SafetyViolation.model_construct(
                     code=v.code,
                     severity=v.severity.value,
                     message=v.message,
@@ -1305,7 +1418,7 @@ class FixPipelineOrchestrator:
 
         summary = f"{plan.category}: {plan.root_cause}".strip()
         explanation = "\n".join(
-            [plan.root_cause] + [f"{op.type} {op.file}: {op.rationale}" for op in plan.operations]
+            [plan.root_cause, *(f"{op.type} {op.file}: {op.rationale}" for op in plan.operations)]
         )
 
         return FixSuggestion(
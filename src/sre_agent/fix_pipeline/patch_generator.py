@@ -50,7 +50,29 @@ def _unified_diff(file_path: str, before: str, after: str) -> str:
     )
 
 
+# Line breaks str.splitlines() honours besides "\n" and "\r\n".
+_OTHER_LINE_BREAKS = re.compile(r"\r(?!\n)|[\v\f\x1c-\x1e\x85\u2028\u2029]")
+
+
+def _only_newline_breaks(text: str) -> bool:
+    if not text.isascii():
+        return _OTHER_LINE_BREAKS.search(text) is None
+    if any(ch in text for ch in "\v\f\x1c\x1d\x1e"):
+        return False
+    return "\r" not in text or text.count("\r") == text.count("\r\n")
+
+
 def _count_diff_changes(diff_text: str) -> tuple[int, int]:
+    if _only_newline_breaks(diff_text):
+        # Every line but the first starts right after a "\n", so C-level counts
+        # of "\n+" minus "\n+++" (one each per header) give the line totals.
+        head = diff_text[:3]
+        added = diff_text.count("\n+") - diff_text.count("\n+++")
+        removed = diff_text.count("\n-") - diff_text.count("\n---")
+        added += head.startswith("+") and head != "+++"
+        removed += head.startswith("-") and head != "---"
+        return added, removed
+
     added = 0
     removed = 0
     for line in diff_text.splitlines():
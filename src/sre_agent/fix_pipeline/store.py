@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.exc import IntegrityError
 
 from sre_agent.database import get_async_session
+from sre_agent.models.events import PipelineEvent
 from sre_agent.models.fix_pipeline import FixPipelineRun
 
 
@@ -65,6 +67,59 @@ class FixPipelineRunStore:
             )
             return result.scalar_one_or_none()
 
+    async def get_run_with_event(
+        self, run_id: UUID
+    ) -> tuple[FixPipelineRun | None, PipelineEvent | None]:
+        """Load a run and the event that triggered it in a single query."""
+        async with get_async_session() as session:
+            result = await session.execute(
+                select(FixPipelineRun, PipelineEvent)
+                .outerjoin(PipelineEvent, PipelineEvent.id == FixPipelineRun.event_id)
+                .where(FixPipelineRun.id == run_id)
+            )
+            row = result.first()
+            if row is None:
+                return None, None
+            return row[0], row[1]
+
+    async def update_run_from(
+        self,
+        run_id: UUID,
+        fields_for: Callable[[FixPipelineRun], dict[str, Any]],
+        **fields: Any,
+    ) -> None:
+        """Update a run with fields computed from its current row.
+
+        The read and the write share one session rather than a pool checkout
+        each. Any ``fields`` are committed first by an ``UPDATE ... RETURNING``
+        whose row stands in for the read, so ``fields_for`` sees them and they
+        persist even if it raises. A missing run is a no-op.
+        """
+        async with get_async_session() as session:
+            if fields:
+                result = await session.execute(
+                    update(FixPipelineRun)
+                    .where(FixPipelineRun.id == run_id)
+                    .values(**fields)
+                    .returning(FixPipelineRun)
+                )
+                run = result.scalar_one_or_none()
+                await session.commit()
+            else:
+                result = await session.execute(
+                    select(FixPipelineRun).where(FixPipelineRun.id == run_id)
+                )
+                run = result.scalar_one_or_none()
+            if run is None:
+                return
+            computed = fields_for(run)
+            if not computed:
+                return
+            await session.execute(
+                update(FixPipelineRun).where(FixPipelineRun.id == run_id).values(**computed)
+            )
+            await session.commit()
+
     async def get_run_by_event_id(self, event_id: UUID) -> FixPipelineRun | None:
         async with get_async_session() as session:
             result = await session.execute(
@@ -73,13 +128,11 @@ class FixPipelineRunStore:
             return result.scalar_one_or_none()
 
     async def update_run(self, run_id: UUID, **fields: Any) -> None:
+        # A single UPDATE (no load-then-flush round-trip); a missing run is a no-op.
+        if not fields:
+            return
         async with get_async_session() as session:
-            result = await session.execute(
-                select(FixPipelineRun).where(FixPipelineRun.id == run_id)
+            await session.execute(
+                update(FixPipelineRun).where(FixPipelineRun.id == run_id).values(**fields)
             )
-            run = result.scalar_one_or_none()
-            if run is None:
-                return
-            for k, v in fields.items():
-                setattr(run, k, v)
             await session.commit()
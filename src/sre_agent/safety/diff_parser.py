@@ -28,6 +28,41 @@ def _normalize_path(path: str) -> str:
     return normalized[2:] if normalized.startswith("./") else normalized
 
 
+def _header_path(line: str) -> str | None:
+    """Return the file a ``diff --git`` or ``+++`` header line switches to, if any."""
+    if line.startswith("diff --git "):
+        parts = line.split()
+        if len(parts) >= 4:
+            b_path = parts[3]
+            if b_path.startswith("b/"):
+                b_path = b_path[2:]
+            return _normalize_path(b_path)
+        return None
+    parts = line.split()
+    if len(parts) >= 2:
+        path_part = parts[1]
+        if path_part.startswith("b/"):
+            path_part = path_part[2:]
+        if path_part != "/dev/null":
+            return _normalize_path(path_part)
+    return None
+
+
+def diff_file_paths(diff_text: str) -> set[str]:
+    """Return the paths ``parse_unified_diff`` would report, reading only headers.
+
+    Hunk lines are skipped without being counted, for callers that need the
+    touched file set but not per-file line totals.
+    """
+    paths: set[str] = set()
+    for line in diff_text.splitlines():
+        if line.startswith(("diff --git ", "+++ ")):
+            path = _header_path(line)
+            if path is not None:
+                paths.add(path)
+    return paths
+
+
 def parse_unified_diff(diff_text: str) -> ParsedDiff:
     diff_bytes = len(diff_text.encode("utf-8"))
     current_file: str | None = None
@@ -37,29 +72,14 @@ def parse_unified_diff(diff_text: str) -> ParsedDiff:
     for raw_line in diff_text.splitlines():
         line = raw_line.rstrip("\n")
 
-        if line.startswith("diff --git "):
-            parts = line.split()
-            if len(parts) >= 4:
-                b_path = parts[3]
-                if b_path.startswith("b/"):
-                    b_path = b_path[2:]
-                current_file = _normalize_path(b_path)
+        if line.startswith(("diff --git ", "+++ ")):
+            path = _header_path(line)
+            if path is not None:
+                current_file = path
                 per_file_added.setdefault(current_file, 0)
                 per_file_removed.setdefault(current_file, 0)
             continue
 
-        if line.startswith("+++ "):
-            parts = line.split()
-            if len(parts) >= 2:
-                path_part = parts[1]
-                if path_part.startswith("b/"):
-                    path_part = path_part[2:]
-                if path_part != "/dev/null":
-                    current_file = _normalize_path(path_part)
-                    per_file_added.setdefault(current_file, 0)
-                    per_file_removed.setdefault(current_file, 0)
-            continue
-
         if current_file is None:
             continue
 
@@ -3,6 +3,7 @@
 Handles git operations and diff application.
 """
 
+import asyncio
 import logging
 import subprocess
 import tempfile
@@ -19,6 +20,30 @@ class RepoError(Exception):
     pass
 
 
+async def _run_git(
+    cmd: list[str], *, cwd: Path | None = None, timeout: float
+) -> subprocess.CompletedProcess[str]:
+    """Run a git command without blocking the event loop.
+
+    Mirrors ``subprocess.run(capture_output=True, text=True, timeout=...)``,
+    but the process is also killed when the awaiting task is cancelled.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, cwd=cwd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except (TimeoutError, asyncio.CancelledError) as exc:
+        proc.kill()
+        await proc.wait()
+        if isinstance(exc, TimeoutError):
+            raise subprocess.TimeoutExpired(cmd, timeout) from None
+        raise
+    return subprocess.CompletedProcess(
+        cmd, proc.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+    )
+
+
 class RepoManager:
     """
     Manages repository cloning and patching.
@@ -29,14 +54,18 @@ class RepoManager:
     - Validate patches before applying
     """
 
-    def __init__(self, base_dir: Path | None = None):
+    def __init__(self, base_dir: Path | None = None, partial_clone: bool = False):
         """
         Initialize repository manager.
 
         Args:
             base_dir: Base directory for cloned repos (uses temp if not provided)
+            partial_clone: Clone blobless (``--filter=blob:none``) so only the
+                checked-out tree's file contents are downloaded, not the
+                contents of every commit in the fetched history
         """
         self.base_dir = base_dir or Path(tempfile.gettempdir()) / "sre_repos"
+        self.partial_clone = partial_clone
         self.base_dir.mkdir(parents=True, exist_ok=True)
 
     async def clone(
@@ -92,13 +121,16 @@ class RepoManager:
                 repo_url,
                 str(repo_path),
             ]
+            # Blobless clones fetch file contents lazily at checkout; skipping
+            # the branch-tip checkout avoids fetching a tree that is replaced
+            # right away when a specific commit is requested.
+            no_checkout = self.partial_clone and bool(commit)
+            if self.partial_clone:
+                clone_cmd[2:2] = ["--filter=blob:none"]
+            if no_checkout:
+                clone_cmd[2:2] = ["--no-checkout"]
 
-            result = subprocess.run(
-                clone_cmd,
-                capture_output=True,
-                text=True,
-                timeout=120,
-            )
+            result = await _run_git(clone_cmd, timeout=120)
 
             if result.returncode != 0:
                 raise RepoError(f"Clone failed: {result.stderr}")
@@ -106,19 +138,25 @@ class RepoManager:
             # Checkout specific commit if provided
             if commit:
                 checkout_cmd = ["git", "checkout", commit]
-                result = subprocess.run(
-                    checkout_cmd,
-                    cwd=repo_path,
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
-                )
+                result = await _run_git(checkout_cmd, cwd=repo_path, timeout=30)
                 if result.returncode != 0:
                     logger.warning(f"Checkout failed, using HEAD: {result.stderr}")
+                    if no_checkout:
+                        result = await _run_git(
+                            ["git", "checkout", branch], cwd=repo_path, timeout=30
+                        )
+                        if result.returncode != 0:
+                            raise RepoError(f"Checkout failed: {result.stderr}")
 
             logger.info("Repository cloned successfully")
             return repo_path
 
+        except asyncio.CancelledError:
+            # git was killed mid-clone; don't leave a partial checkout behind.
+            import shutil
+
+            shutil.rmtree(repo_path, ignore_errors=True)
+            raise
         except subprocess.TimeoutExpired:
             raise RepoError("Clone timed out")
         except Exception as e:
@@ -18,17 +18,19 @@ async def publish_dashboard_event(
     run_id: str | None = None,
     correlation_id: str | None = None,
     metadata: dict[str, Any] | None = None,
+    timestamp: datetime | None = None,
 ) -> None:
     """Publish a structured dashboard event for SSE consumers.
 
     Publishing is best-effort and never raises, so pipeline stages cannot fail
-    because of observability backends.
+    because of observability backends. ``timestamp`` defaults to now; callers
+    that publish after the fact pass the time the event happened.
     """
     payload: dict[str, Any] = {
         "type": event_type,
         "stage": stage,
         "status": status,
-        "timestamp": datetime.now(UTC).isoformat(),
+        "timestamp": (timestamp or datetime.now(UTC)).isoformat(),
     }
     if failure_id:
         payload["failure_id"] = failure_id
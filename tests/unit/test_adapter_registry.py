@@ -14,3 +14,46 @@ def test_select_adapter_picks_highest_confidence() -> None:
     assert selected.adapter.name == "node"
     assert selected.detection.category == "node_missing_dependency"
     assert selected.detection.confidence >= 0.8
+
+
+def test_select_adapter_reuses_log_analysis_across_file_lists(monkeypatch) -> None:
+    from sre_agent.adapters import registry
+    from sre_agent.adapters.python import PythonAdapter
+
+    calls: list[list[str]] = []
+    original = PythonAdapter.detect
+
+    def counting_detect(self, log_text, repo_files):
+        calls.append(repo_files)
+        return original(self, log_text, repo_files)
+
+    monkeypatch.setattr(PythonAdapter, "detect", counting_detect)
+    monkeypatch.setattr(registry, "_detection_cache", {})
+    log_text = "ModuleNotFoundError: No module named 'requests'"
+
+    first = select_adapter(log_text, ["requirements.txt"])
+    second = select_adapter(log_text, ["requirements.txt", "src/app.py", "tests/test_app.py"])
+    third = select_adapter(log_text, ["src/app.py"])
+
+    assert first is not None and second is not None and third is not None
+    assert second.detection == first.detection
+    assert third.detection.confidence == first.detection.confidence == 0.9
+    assert len(calls) == 2  # one per distinct has_markers value
+
+
+def test_repo_marker_suffixes_require_every_adapter_to_declare_markers() -> None:
+    from sre_agent.adapters import registry
+
+    suffixes = registry.repo_marker_suffixes()
+    assert suffixes is not None
+    assert {"pyproject.toml", "package.json", "go.mod", "pom.xml", "Dockerfile"} <= set(suffixes)
+
+    class BareAdapter:
+        marker_suffixes = ()
+
+    original = registry.get_adapters()
+    try:
+        registry.register_adapters([*original, BareAdapter()])
+        assert registry.repo_marker_suffixes() is None
+    finally:
+        registry.register_adapters(original)
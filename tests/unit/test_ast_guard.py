@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from sre_agent.fix_pipeline.ast_guard import validate_python_ast
+
+
+async def test_validate_python_ast_inline_for_small_patchsets(tmp_path: Path) -> None:
+    (tmp_path / "ok.py").write_text("x = 1\n")
+    (tmp_path / "bad.py").write_text("def broken(:\n")
+
+    result = await validate_python_ast(
+        repo_path=tmp_path, touched_files=["ok.py", "bad.py", "README.md", "ok.py"]
+    )
+
+    assert result.passed is False
+    assert result.checked_files == ["bad.py", "ok.py"]
+    assert len(result.issues) == 1
+    assert result.issues[0].file == "bad.py"
+    assert result.issues[0].phase == "post_patch_parse"
+    assert result.issues[0].message.startswith("SyntaxError at line 1")
+
+
+async def test_validate_python_ast_parallel_for_large_patchsets(tmp_path: Path) -> None:
+    touched = []
+    for i in range(8):
+        (tmp_path / f"mod_{i}.py").write_text(f"value_{i} = {i}\n")
+        touched.append(f"mod_{i}.py")
+    (tmp_path / "mod_3.py").write_text("if True\n    pass\n")
+    touched.append("missing.py")
+
+    result = await validate_python_ast(repo_path=tmp_path, touched_files=touched)
+
+    assert result.passed is False
+    assert len(result.checked_files) == 9
+    assert [(i.file, i.phase) for i in result.issues] == [
+        ("missing.py", "post_patch_read"),
+        ("mod_3.py", "post_patch_parse"),
+    ]
+
+
+async def test_validate_python_ast_reports_compile_time_errors(tmp_path: Path) -> None:
+    (tmp_path / "ret.py").write_text("return 1\n")
+    (tmp_path / "latin.py").write_bytes(b"# -*- coding: latin-1 -*-\nname = '\xe9'\n")
+
+    result = await validate_python_ast(repo_path=tmp_path, touched_files=["ret.py", "latin.py"])
+
+    assert [i.file for i in result.issues] == ["ret.py"]
+    assert "'return' outside function" in result.issues[0].message
+
+
+async def test_validate_python_ast_caches_by_content(tmp_path: Path, monkeypatch) -> None:
+    from sre_agent.fix_pipeline import ast_guard
+
+    calls: list[str] = []
+    real_compile_error = ast_guard._compile_error
+
+    def counting_compile_error(source: bytes, rel_path: str) -> str | None:
+        calls.append(rel_path)
+        return real_compile_error(source, rel_path)
+
+    monkeypatch.setattr(ast_guard, "_compile_cache", {})
+    monkeypatch.setattr(ast_guard, "_compile_error", counting_compile_error)
+    (tmp_path / "a.py").write_text("def f(:\n")
+    (tmp_path / "b.py").write_text("def f(:\n")
+
+    result = await validate_python_ast(repo_path=tmp_path, touched_files=["a.py", "b.py"])
+
+    assert calls == ["a.py"]
+    assert [i.file for i in result.issues] == ["a.py", "b.py"]
+    assert result.issues[0].message == result.issues[1].message
+
+
+async def test_validate_python_ast_offloads_large_files(tmp_path: Path, monkeypatch) -> None:
+    from sre_agent.fix_pipeline import ast_guard
+
+    pooled: list[list[tuple[str, str]]] = []
+    real_parse_in_pool = ast_guard._parse_in_pool
+
+    async def recording_parse_in_pool(jobs):
+        pooled.append(jobs)
+        return await real_parse_in_pool(jobs)
+
+    monkeypatch.setattr(ast_guard, "_parse_in_pool", recording_parse_in_pool)
+    monkeypatch.setattr(ast_guard, "_INLINE_PARSE_MAX_BYTES", 64)
+    (tmp_path / "small.py").write_text("x = 1\n")
+    (tmp_path / "big.py").write_text("".join(f"v{i} = {i}\n" for i in range(20)))
+
+    small = await validate_python_ast(repo_path=tmp_path, touched_files=["small.py", "gone.py"])
+    big = await validate_python_ast(repo_path=tmp_path, touched_files=["big.py"])
+
+    assert [i.phase for i in small.issues] == ["post_patch_read"]
+    assert big.passed is True
+    assert pooled == [[(str(tmp_path / "big.py"), "big.py")]]
+
+
+def test_process_pool_sized_from_settings_without_fork(monkeypatch) -> None:
+    from sre_agent.config import get_settings
+    from sre_agent.fix_pipeline import ast_guard
+
+    monkeypatch.setattr(ast_guard, "_process_pool", None)
+    monkeypatch.setenv("AST_GUARD_MAX_WORKERS", "3")
+    get_settings.cache_clear()
+    try:
+        pool = ast_guard._get_process_pool()
+    finally:
+        get_settings.cache_clear()
+
+    try:
+        assert pool._max_workers == 3
+        assert pool._mp_context.get_start_method() in {"forkserver", "spawn"}
+    finally:
+        pool.shutdown()
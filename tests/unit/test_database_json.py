@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import json
+
+from sre_agent.database import _json_dumps
+
+
+def test_json_dumps_matches_stdlib_round_trip() -> None:
+    values = [
+        {"plan": {"files": ["a.py"], "confidence": 0.7, "ok": True, "none": None}},
+        {"text": "naïve ✓  ", "nested": [[1, 2], {"k": "v"}]},
+        {1: "int key"},
+        {"big": 2**70},
+        [],
+    ]
+
+    for value in values:
+        assert json.loads(_json_dumps(value)) == json.loads(json.dumps(value))
+
+
+def test_json_dumps_encodes_pydantic_models_like_json_mode_dump() -> None:
+    from datetime import UTC, datetime
+    from uuid import uuid4
+
+    from sre_agent.schemas.pr import PRResult, PRStatus
+
+    pr = PRResult(
+        status=PRStatus.CREATED,
+        branch_name="fix/test",
+        base_branch="main",
+        fix_id="fix-1",
+        event_id=uuid4(),
+        pr_number=1,
+        pr_url="https://example/pr/1",
+        created_at=datetime(2026, 1, 9, tzinfo=UTC),
+    )
+
+    assert json.loads(_json_dumps(pr)) == pr.model_dump(mode="json")
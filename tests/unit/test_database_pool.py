@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import pytest
+
+from sre_agent import database
+from sre_agent.config import get_settings
+
+_PG_URL = "postgresql+asyncpg://sre:secret@db:5432/sre_agent"
+
+
+class _FakePool:
+    closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def _configure(monkeypatch: pytest.MonkeyPatch, **env: str) -> None:
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    get_settings.cache_clear()
+
+
+async def test_native_pool_counts_against_connection_budget(monkeypatch) -> None:
+    _configure(
+        monkeypatch,
+        DATABASE_URL=_PG_URL,
+        DATABASE_MAX_CONNECTIONS="40",
+        DATABASE_ASYNCPG_POOL_MAX_SIZE="8",
+    )
+    created: list[tuple[str, dict]] = []
+
+    async def fake_create_pool(dsn: str, **kwargs):
+        created.append((dsn, kwargs))
+        return _FakePool()
+
+    monkeypatch.setattr(database.asyncpg, "create_pool", fake_create_pool)
+
+    engine = database.get_engine()
+    pool = await database.get_asyncpg_pool()
+
+    assert engine.pool.size() + engine.pool._max_overflow == 40 - 8
+    assert engine.pool.size() == 20
+    assert [dsn for dsn, _ in created] == ["postgresql://sre:secret@db:5432/sre_agent"]
+    assert (created[0][1]["min_size"], created[0][1]["max_size"]) == (5, 8)
+    assert await database.get_asyncpg_pool() is pool
+    await database.reset_engine()
+    assert pool.closed is True
+
+
+async def test_native_pool_disabled_gives_orm_whole_budget(monkeypatch) -> None:
+    _configure(
+        monkeypatch,
+        DATABASE_URL=_PG_URL,
+        DATABASE_MAX_CONNECTIONS="12",
+        DATABASE_ASYNCPG_POOL_MAX_SIZE="0",
+    )
+
+    engine = database.get_engine()
+
+    assert await database.get_asyncpg_pool() is None
+    assert (engine.pool.size(), engine.pool._max_overflow) == (12, 0)
+    await database.reset_engine()
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from sre_agent.safety.diff_parser import diff_file_paths, parse_unified_diff
+
+
+def test_diff_file_paths_matches_parsed_files() -> None:
+    diff = (
+        "diff --git a/src/app.py b/src/app.py\n"
+        "--- a/src/app.py\n"
+        "+++ b/src/app.py\n"
+        "@@ -1,2 +1,2 @@\n"
+        "-import os\n"
+        "+import sys\n"
+        "diff --git a/old.txt b/old.txt\n"
+        "--- a/old.txt\n"
+        "+++ /dev/null\n"
+        "@@ -1 +0,0 @@\n"
+        "-gone\n"
+    )
+
+    assert diff_file_paths(diff) == {"src/app.py", "old.txt"}
+    assert diff_file_paths(diff) == {f.path for f in parse_unified_diff(diff).files}
+    assert diff_file_paths("") == set()
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from evals.runner import run_eval_cases
+
+_DATASET = Path(__file__).resolve().parents[2] / "evals" / "dataset"
+
+
+async def test_run_eval_cases_batches_cases_across_workers(tmp_path: Path) -> None:
+    serial, serial_metrics, _ = await run_eval_cases(
+        dataset_path=_DATASET,
+        out_dir=tmp_path / "serial",
+        model="mock",
+        limit=3,
+        real_sandbox=False,
+        fail_fast=False,
+    )
+    batched, batched_metrics, _ = await run_eval_cases(
+        dataset_path=_DATASET,
+        out_dir=tmp_path / "batched",
+        model="mock",
+        limit=3,
+        real_sandbox=False,
+        fail_fast=False,
+        workers=2,
+    )
+
+    assert [r.case_id for r in batched] == [r.case_id for r in serial]
+    for a, b in zip(serial, batched, strict=True):
+        assert a.to_json_dict() | {"time_ms": 0} == b.to_json_dict() | {"time_ms": 0}
+        assert b.time_ms >= 1
+        assert (tmp_path / "batched" / f"{b.case_id}.json").is_file()
+    assert batched_metrics.to_json_dict() | {"avg_mttr_seconds": 0} == (
+        serial_metrics.to_json_dict() | {"avg_mttr_seconds": 0}
+    )
+
+
+async def test_run_eval_cases_fail_fast_stops_at_first_error(monkeypatch, tmp_path: Path) -> None:
+    from sre_agent.fix_pipeline import offline
+
+    calls: list[str] = []
+
+    async def boom(log_text: str, **kwargs):
+        calls.append(kwargs["case_id"])
+        raise RuntimeError("pipeline exploded")
+
+    monkeypatch.setattr(offline, "run_pipeline_from_logs", boom)
+
+    results, _, _ = await run_eval_cases(
+        dataset_path=_DATASET,
+        out_dir=tmp_path,
+        model="mock",
+        limit=3,
+        real_sandbox=False,
+        fail_fast=True,
+    )
+
+    assert len(calls) == 1
+    assert [r.category for r in results] == ["error"]
+    assert results[0].notes == "pipeline exploded"
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import pytest
+
+from sre_agent.explainability.evidence_extractor import (
+    attach_operation_links,
+    extract_evidence_lines,
+)
+
+
+def test_extract_evidence_tags_and_ranks_lines() -> None:
+    log = "\n".join(
+        [
+            "INFO collecting",
+            "FAILED tests/test_api.py::test_health - AssertionError",
+            "go: downloading example.com/mod v1.0.0",
+            "E   ModuleNotFoundError: No module named 'requests'",
+            "",
+            "[ERROR] Failed to execute goal",
+        ]
+    )
+    evidence = extract_evidence_lines(log)
+    assert [(e.idx, e.tag) for e in evidence] == [
+        (4, "root-cause"),
+        (2, "test-failure"),
+        (3, "go"),
+        (6, "maven"),
+    ]
+
+
+def test_extract_evidence_collects_first_traceback_window() -> None:
+    log = "\n".join(
+        ["noise"]
+        + ["Traceback (most recent call last):"]
+        + [f'  File "x.py", line {n}' for n in range(30)]
+        + ["Traceback (most recent call last):"]
+    )
+    evidence = extract_evidence_lines(log, max_lines=100)
+    assert [e.idx for e in evidence] == list(range(2, 22))
+    assert {e.tag for e in evidence} == {"stack-trace"}
+
+
+def test_extract_evidence_redacts_and_limits_lines() -> None:
+    log = "\n".join(f"FAIL case {n} token=abc{n}" for n in range(50))
+    evidence = extract_evidence_lines(log, max_lines=5)
+    assert [e.idx for e in evidence] == [1, 2, 3, 4, 5]
+    assert all("abc" not in e.line for e in evidence)
+
+
+def test_attach_operation_links_uses_first_matching_operation() -> None:
+    evidence = extract_evidence_lines("FAILED tests/test_a.py\n--- FAIL: TestB")
+    linked = attach_operation_links(
+        evidence,
+        operations=[{"evidence": ["  "]}, {"evidence": ["TestB"]}, {"evidence": ["FAIL"]}],
+    )
+    assert [(e.idx, e.operation_idx) for e in linked] == [(1, 2), (2, 1)]
+
+
+def test_extract_evidence_keeps_best_priority_lines_when_truncated() -> None:
+    log = "\n".join([f"FAILED tests/test_a.py::test_{i}" for i in range(50)])
+    log += "\nModuleNotFoundError: No module named 'requests'"
+
+    evidence = extract_evidence_lines(log, max_lines=3)
+
+    assert [e.tag for e in evidence] == ["root-cause", "test-failure", "test-failure"]
+    assert [e.idx for e in evidence] == [51, 1, 2]
+
+
+def test_iter_lines_matches_splitlines_across_blocks(monkeypatch) -> None:
+    from sre_agent.explainability import evidence_extractor
+
+    monkeypatch.setattr(evidence_extractor, "_SPLIT_BLOCK_CHARS", 4)
+    text = "first line\r\nsecond\n\nthird\rfourth\x0cfifth\n"
+
+    assert list(evidence_extractor._iter_lines(text)) == text.splitlines()
+    assert list(evidence_extractor._iter_lines("")) == []
+
+
+def test_candidate_scan_matches_full_scan() -> None:
+    from sre_agent.explainability import evidence_extractor
+
+    log = "\n".join(
+        [
+            "Collecting requests",
+            "Traceback (most recent call last):",
+            '  File "app.py", line 1, in <module>',
+            "",
+            "ModuleNotFoundError: No module named 'requests'",
+            "ok " * 10,
+            "npm ERR! code E404",
+            "  go: downloading example.com/mod v1.0.0",
+            "--- FAIL: TestThing (0.00s)",
+        ]
+        + ["filler"] * 30
+        + ["[ERROR] Failed to execute goal", "Traceback (most recent call last):"]
+    )
+
+    def ranked(lines):
+        return [
+            (i, raw, evidence_extractor._rank_line(raw, in_stack))
+            for i, raw, in_stack in lines
+            if evidence_extractor._rank_line(raw, in_stack) is not None
+        ]
+
+    full = ranked(evidence_extractor._scan_all_lines(log))
+    assert ranked(evidence_extractor._scan_candidate_lines(log)) == full
+    assert [i for i, _, _ in full][:4] == [2, 3, 5, 6]
+
+
+def test_extract_evidence_lines_memoized_by_content(monkeypatch) -> None:
+    from sre_agent.explainability import evidence_extractor
+
+    calls: list[int] = []
+    real_extract = evidence_extractor._extract_evidence_lines
+
+    def counting_extract(log_text: str, max_lines: int):
+        calls.append(max_lines)
+        return real_extract(log_text, max_lines)
+
+    monkeypatch.setattr(evidence_extractor, "_evidence_cache", {})
+    monkeypatch.setattr(evidence_extractor, "_extract_evidence_lines", counting_extract)
+    log = "collecting\nModuleNotFoundError: No module named 'yaml'\n"
+
+    first = extract_evidence_lines(log)
+    first.clear()
+    again = extract_evidence_lines("".join([log]))
+    fewer = extract_evidence_lines(log, max_lines=1)
+
+    assert calls == [30, 1]
+    assert [e.idx for e in again] == [2]
+    assert fewer == again
+
+
+def test_hyperscan_trigger_scan_matches_fallback_across_threads(monkeypatch) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    pytest.importorskip("hyperscan")
+    from sre_agent.explainability import evidence_extractor
+
+    assert evidence_extractor._HYPERSCAN_DB is not None
+    logs = [
+        "\n".join(
+            [f"step {n}-{i}" for i in range(2000)]
+            + ["npm ERR! code E404", "--- FAIL: TestThing", "[error] Failed", "GO: x"]
+        )
+        for n in range(8)
+    ]
+
+    def lines_hit(text: str) -> set[int]:
+        return {text.count("\n", 0, offset) for offset in evidence_extractor._trigger_offsets(text)}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        scanned = list(pool.map(lines_hit, logs * 4))
+
+    monkeypatch.setattr(evidence_extractor, "_HYPERSCAN_DB", None)
+    expected = [lines_hit(log) for log in logs * 4]
+    assert scanned == expected
+    assert expected[0] == {2000, 2001, 2002, 2003}
+
+
+def test_log_digest_matches_whole_log_digest_across_blocks(monkeypatch) -> None:
+    import hashlib
+
+    from sre_agent.explainability import evidence_extractor
+
+    monkeypatch.setattr(evidence_extractor, "_SPLIT_BLOCK_CHARS", 3)
+    text = "FAIL café \ud800 \U0001f600 done\n"
+    whole = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    assert evidence_extractor._log_digest(text) == whole
+    assert evidence_extractor._log_digest("") == hashlib.blake2b(digest_size=16).digest()
+
+
+def test_evidence_cache_stays_bounded_under_threads(monkeypatch) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from sre_agent.explainability import evidence_extractor
+
+    monkeypatch.setattr(evidence_extractor, "_evidence_cache", {})
+    monkeypatch.setattr(evidence_extractor, "_EVIDENCE_CACHE_MAX_ENTRIES", 4)
+    logs = [f"step {n}\nFAILED tests/test_{n}.py::test_x\n" for n in range(64)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(extract_evidence_lines, logs * 4))
+
+    assert [r[0].line for r in results] == [log.splitlines()[1] for log in logs * 4]
+    assert len(evidence_extractor._evidence_cache) <= 4
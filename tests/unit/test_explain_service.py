@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import pytest
+
+from sre_agent.explainability.explain_service import compute_confidence_breakdown
+
+
+def test_compute_confidence_breakdown_weights_available_factors() -> None:
+    confidence, factors = compute_confidence_breakdown(
+        detection_confidence=0.5, plan_confidence=None, validation_status="validation_passed"
+    )
+
+    assert [f.factor for f in factors] == ["adapter_detection", "validation"]
+    assert confidence == pytest.approx((0.5 * 0.4 + 1.0 * 0.2) / 0.6)
+
+    assert compute_confidence_breakdown(
+        detection_confidence=None, plan_confidence=None, validation_status="running"
+    ) == (0.0, [])
+
+
+def _event(**overrides):
+    from datetime import UTC, datetime
+    from uuid import uuid4
+
+    from sre_agent.models.events import PipelineEvent
+
+    fields = {
+        "id": uuid4(),
+        "idempotency_key": f"github:org/repo:{uuid4()}",
+        "ci_provider": "github",
+        "raw_payload": {"job": 1},
+        "pipeline_id": "987",
+        "repo": "org/repo",
+        "commit_sha": "a" * 40,
+        "branch": "main",
+        "stage": "test",
+        "failure_type": "test",
+        "status": "pending",
+        "event_timestamp": datetime(2026, 1, 9, tzinfo=UTC),
+        "created_at": datetime(2026, 1, 9, tzinfo=UTC),
+    }
+    fields.update(overrides)
+    return PipelineEvent(**fields)
+
+
+def _run(event_id, created_at, **overrides):
+    from uuid import uuid4
+
+    from sre_agent.models.fix_pipeline import FixPipelineRun
+
+    fields = {
+        "id": uuid4(),
+        "event_id": event_id,
+        "status": "pending",
+        "plan_json": {"operations": []},
+        "attempt_count": 1,
+        "retry_limit_snapshot": 3,
+        "automation_mode": "auto_pr",
+        "manual_review_required": False,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+    fields.update(overrides)
+    return FixPipelineRun(**fields)
+
+
+def _columns(obj) -> dict:
+    return {attr.key: getattr(obj, attr.key) for attr in obj.__mapper__.column_attrs}
+
+
+def _column_names(model) -> list:
+    return [(attr.key, attr.columns[0]) for attr in model.__mapper__.column_attrs]
+
+
+def test_failure_with_latest_run_sql_aliases_every_mapped_column() -> None:
+    import re
+
+    from sre_agent.explainability.explain_service import _FAILURE_WITH_LATEST_RUN_SQL
+    from sre_agent.models.events import PipelineEvent
+    from sre_agent.models.fix_pipeline import FixPipelineRun
+
+    aliases = re.findall(r'AS "(\w+)"', _FAILURE_WITH_LATEST_RUN_SQL)
+
+    assert aliases == [f"e__{c.name}" for c in PipelineEvent.__table__.columns] + [
+        f"r__{c.name}" for c in FixPipelineRun.__table__.columns
+    ]
+    assert "FROM pipeline_events AS e LEFT JOIN LATERAL" in _FAILURE_WITH_LATEST_RUN_SQL
+    assert "ORDER BY created_at DESC LIMIT 1" in _FAILURE_WITH_LATEST_RUN_SQL
+    assert _FAILURE_WITH_LATEST_RUN_SQL.endswith("WHERE e.id = $1")
+
+
+def test_model_from_record_rebuilds_detached_instances() -> None:
+    from datetime import UTC, datetime
+
+    from sre_agent.explainability.explain_service import _model_from_record
+    from sre_agent.models.events import PipelineEvent
+    from sre_agent.models.fix_pipeline import FixPipelineRun
+
+    event = _event()
+    run = _run(event.id, datetime(2026, 1, 10, tzinfo=UTC))
+    record = {f"e__{c.name}": getattr(event, a) for a, c in _column_names(PipelineEvent)}
+    record |= {f"r__{c.name}": getattr(run, a) for a, c in _column_names(FixPipelineRun)}
+
+    rebuilt_event = _model_from_record(PipelineEvent, record, "e")
+    rebuilt_run = _model_from_record(FixPipelineRun, record, "r")
+
+    assert isinstance(rebuilt_event, PipelineEvent)
+    assert _columns(rebuilt_event) == _columns(event)
+    assert _columns(rebuilt_run) == _columns(run)
+
+
+async def test_load_failure_and_latest_run_native_path(monkeypatch) -> None:
+    from contextlib import asynccontextmanager
+    from datetime import UTC, datetime
+
+    from sre_agent.explainability import explain_service
+    from sre_agent.models.events import PipelineEvent
+    from sre_agent.models.fix_pipeline import FixPipelineRun
+
+    event = _event()
+    run = _run(event.id, datetime(2026, 1, 10, tzinfo=UTC))
+    queries: list[tuple[str, object]] = []
+
+    class _Conn:
+        async def fetchrow(self, sql, failure_id):
+            queries.append((sql, failure_id))
+            if failure_id != event.id:
+                return None
+            row = {f"e__{c.name}": getattr(event, a) for a, c in _column_names(PipelineEvent)}
+            row |= {f"r__{c.name}": getattr(run, a) for a, c in _column_names(FixPipelineRun)}
+            return row
+
+    @asynccontextmanager
+    async def fake_conn():
+        yield _Conn()
+
+    async def fake_pool():
+        return object()
+
+    monkeypatch.setattr(explain_service, "get_asyncpg_pool", fake_pool)
+    monkeypatch.setattr(explain_service, "get_asyncpg_conn", fake_conn)
+
+    loaded_event, loaded_run = await explain_service.load_failure_and_latest_run(
+        failure_id=event.id
+    )
+    missing = await explain_service.load_failure_and_latest_run(failure_id=run.id)
+
+    assert queries[0] == (explain_service._FAILURE_WITH_LATEST_RUN_SQL, event.id)
+    assert _columns(loaded_event) == _columns(event)
+    assert _columns(loaded_run) == _columns(run)
+    assert missing == (None, None)
+
+
+async def test_load_failure_and_latest_run_sqlalchemy_fallback() -> None:
+    from datetime import UTC, datetime
+    from uuid import uuid4
+
+    from sre_agent.database import get_async_session, get_engine
+    from sre_agent.explainability.explain_service import load_failure_and_latest_run
+    from sre_agent.models.events import Base, PipelineEvent
+    from sre_agent.models.fix_pipeline import FixPipelineRun
+
+    async with get_engine().begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[PipelineEvent.__table__, FixPipelineRun.__table__],
+        )
+
+    event, lonely = _event(), _event()
+    run = _run(event.id, datetime(2026, 1, 10, tzinfo=UTC), status="pr_created")
+    async with get_async_session() as session:
+        session.add_all([event, lonely])
+        await session.flush()
+        session.add(run)
+        await session.commit()
+
+    loaded_event, loaded_run = await load_failure_and_latest_run(failure_id=event.id)
+    lonely_event, lonely_run = await load_failure_and_latest_run(failure_id=lonely.id)
+
+    assert loaded_event.id == event.id
+    assert (loaded_run.id, loaded_run.plan_json) == (run.id, {"operations": []})
+    assert (lonely_event.id, lonely_run) == (lonely.id, None)
+    assert await load_failure_and_latest_run(failure_id=uuid4()) == (None, None)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from contextlib import asynccontextmanager
+import asyncio
+import json
 from types import SimpleNamespace
 from uuid import UUID, uuid4
 
 import pytest
 import sre_agent.fix_pipeline.orchestrator as orchestrator_module
+from sre_agent.database import _json_dumps
 from sre_agent.fix_pipeline.orchestrator import FixPipelineOrchestrator
 from sre_agent.fix_pipeline.store import FixPipelineRunStore
 from sre_agent.models.events import CIProvider
@@ -34,6 +36,7 @@ class FakeRun:
 class FakeStore(FixPipelineRunStore):
     def __init__(self, run: FakeRun):
         self._run = run
+        self.event = None
         self.updates: list[dict] = []
 
     async def create_run(self, event_id: UUID, context_json=None, rca_json=None) -> UUID:
@@ -42,9 +45,20 @@ class FakeStore(FixPipelineRunStore):
     async def get_run(self, run_id: UUID):
         return self._run if run_id == self._run.id else None
 
+    async def get_run_with_event(self, run_id: UUID):
+        if run_id != self._run.id:
+            return None, None
+        return self._run, self.event
+
     async def update_run(self, run_id: UUID, **fields):
         self.updates.append(fields)
 
+    async def update_run_from(self, run_id: UUID, fields_for, **fields):
+        if run_id == self._run.id:
+            if fields:
+                self.updates.append(fields)
+            self.updates.append(fields_for(self._run))
+
 
 def _make_context(event_id: UUID) -> FailureContextBundle:
     return FailureContextBundle(
@@ -75,7 +89,10 @@ def _make_rca(event_id: UUID) -> RCAResult:
 
 
 @pytest.mark.asyncio
-async def test_pipeline_happy_path_creates_pr_and_persists(monkeypatch, tmp_path) -> None:
+@pytest.mark.parametrize("existing_pr_url", [None, "https://example/pr/0"])
+async def test_pipeline_happy_path_creates_pr_and_persists(
+    monkeypatch, tmp_path, existing_pr_url
+) -> None:
     event_id = uuid4()
     run_id = uuid4()
 
@@ -83,6 +100,7 @@ async def test_pipeline_happy_path_creates_pr_and_persists(monkeypatch, tmp_path
     rca = _make_rca(event_id)
 
     fake_run = FakeRun(run_id, event_id, context.model_dump(), rca.model_dump())
+    fake_run.last_pr_url = existing_pr_url
     store = FakeStore(fake_run)
 
     event = SimpleNamespace(
@@ -94,15 +112,7 @@ async def test_pipeline_happy_path_creates_pr_and_persists(monkeypatch, tmp_path
         raw_payload={"repository": {"clone_url": "https://github.com/acme/repo.git"}},
     )
 
-    class FakeSession:
-        async def get(self, model, pk):
-            return event
-
-    @asynccontextmanager
-    async def fake_get_async_session():
-        yield FakeSession()
-
-    monkeypatch.setattr(orchestrator_module, "get_async_session", fake_get_async_session)
+    store.event = event
 
     class FakeRepoManager:
         async def clone(
@@ -184,13 +194,32 @@ async def test_pipeline_happy_path_creates_pr_and_persists(monkeypatch, tmp_path
     orch.pr_orchestrator = FakePROrchestrator()
 
     result = await orch.run(run_id)
+    if existing_pr_url:
+        assert result == {"success": True, "run_id": str(run_id), "skipped": "pr_already_created"}
+        assert created["called"] is False
+        return
     assert result["success"] is True
     assert created["called"] is True
     assert created["label"] in {"safe", "needs-review"}
     assert any("plan_json" in u for u in store.updates)
     assert any("patch_diff" in u for u in store.updates)
     assert any("validation_json" in u for u in store.updates)
-    assert any("pr_json" in u for u in store.updates)
+    pr_write = next(u for u in store.updates if "pr_json" in u)
+    assert pr_write["pr_json"].model_dump() == result["pr"]
+    # What the JSONB column would store.
+    artifact = json.loads(_json_dumps(store.updates[-1]["artifact_json"]))
+    assert [step["step"] for step in artifact["timeline"]][:2] == ["ingest", "issue_graph"]
+    first_plan_write = next(u for u in store.updates if "plan_json" in u)
+    assert {"automation_mode", "issue_graph_json", "adapter_name"} <= first_plan_write.keys()
+    assert sum("issue_graph_json" in u for u in store.updates) == 1
+    # Status-free results ride along with the next status transition.
+    # The plan write overlaps the critic review; every later one carries a status.
+    assert all("status" in u for u in store.updates[1:-1])
+    assert store.updates[-1].keys() == {"artifact_json"}
+    plan_ready = next(u for u in store.updates if u.get("status") == "plan_ready")
+    assert {"critic_json", "manual_review_required"} <= plan_ready.keys()
+    patch_ready = next(u for u in store.updates if u.get("status") == "patch_ready")
+    assert {"patch_diff", "patch_stats_json", "patch_policy_json"} <= patch_ready.keys()
 
 
 @pytest.mark.asyncio
@@ -210,15 +239,16 @@ async def test_pipeline_blocks_when_plan_unsafe(monkeypatch) -> None:
         raw_payload={"repository": {"clone_url": "https://github.com/acme/repo.git"}},
     )
 
-    class FakeSession:
-        async def get(self, model, pk):
-            return event
+    store.event = event
+    published: list[tuple[str, str]] = []
 
-    @asynccontextmanager
-    async def fake_get_async_session():
-        yield FakeSession()
+    async def record_event(**event) -> None:
+        await asyncio.sleep(0)
+        published.append((event["stage"], event["status"]))
+        if event["stage"] == "pipeline":
+            raise RuntimeError("broker unavailable")
 
-    monkeypatch.setattr(orchestrator_module, "get_async_session", fake_get_async_session)
+    monkeypatch.setattr(orchestrator_module, "publish_dashboard_event", record_event)
 
     class FakePlanGenerator:
         last_model_name = "fake-model"
@@ -244,12 +274,414 @@ async def test_pipeline_blocks_when_plan_unsafe(monkeypatch) -> None:
         def __getattr__(self, item):
             raise AssertionError("Should not be called")
 
+    clone_calls: list[str] = []
+
+    class SlowRepoManager:
+        async def clone(self, repo_url: str, branch: str, commit: str | None, depth: int):
+            clone_calls.append("started")
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                clone_calls.append("cancelled")
+                raise
+
+        def cleanup(self, repo_path) -> None:
+            raise AssertionError("nothing was cloned")
+
     orch = FixPipelineOrchestrator(store=store)
     orch.plan_generator = FakePlanGenerator()
-    orch.repo_manager = NeverCalled()
+    orch.repo_manager = SlowRepoManager()
     orch.validator = NeverCalled()
     orch.pr_orchestrator = NeverCalled()
 
     result = await orch.run(run_id)
     assert result["success"] is False
     assert result["error"] == "plan_blocked"
+    # The clone overlaps planning and is cancelled once the plan is blocked.
+    assert clone_calls == ["started", "cancelled"]
+    persisted = [u["plan_policy_json"] for u in store.updates if "plan_policy_json" in u]
+    assert persisted == [result["policy"]]
+    assert result["policy"]["allowed"] is False
+    assert published[0] == ("pipeline", "started")
+    assert published[-2:] == [("policy_plan", "failed"), ("plan", "blocked")]
+
+
+def test_extract_runtime_config_reuses_validated_config() -> None:
+    def event(cfg: dict) -> SimpleNamespace:
+        return SimpleNamespace(raw_payload={"_sre_agent": {"repo_config": cfg}})
+
+    first = orchestrator_module._extract_runtime_config(
+        event({"automation_mode": "suggest", "protected_paths": ["infra/**"]})
+    )
+    second = orchestrator_module._extract_runtime_config(
+        event({"protected_paths": ["infra/**"], "automation_mode": "suggest"})
+    )
+    invalid = orchestrator_module._extract_runtime_config(event({"retry_limit": "many"}))
+
+    assert first is second
+    assert first.protected_paths == ["infra/**"]
+    assert invalid.automation_mode == "auto_pr"
+
+
+def test_iter_repo_files_skips_git_and_directories(tmp_path) -> None:
+    (tmp_path / ".git" / "objects").mkdir(parents=True)
+    (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("")
+    (tmp_path / "README.md").write_text("")
+    (tmp_path / "linked").symlink_to(tmp_path / "src", target_is_directory=True)
+    (tmp_path / "dangling").symlink_to(tmp_path / "missing")
+
+    expected = sorted(
+        rel
+        for rel in (
+            p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*") if not p.is_dir()
+        )
+        if not rel.startswith(".git/")
+    )
+    assert sorted(orchestrator_module._iter_repo_files(tmp_path)) == expected
+    assert expected == ["README.md", "dangling", "src/app.py"]
+
+
+def test_protected_path_matcher_matches_fnmatch_semantics() -> None:
+    protected = orchestrator_module._compile_protected_paths(("deploy/*.yml", "infra/**"))
+
+    assert orchestrator_module._compile_protected_paths(()) is None
+    assert orchestrator_module._matches_protected_path("./deploy/prod.yml", protected)
+    assert orchestrator_module._matches_protected_path("infra\\prod\\main.tf", protected)
+    assert not orchestrator_module._matches_protected_path("src/app.py", protected)
+
+
+def test_protected_paths_compile_once_across_runs() -> None:
+    def compiled_for_new_run():
+        event = SimpleNamespace(
+            raw_payload={"_sre_agent": {"repo_config": {"protected_paths": ["ops/**", "*.pem"]}}}
+        )
+        config = orchestrator_module._extract_runtime_config(event)
+        return orchestrator_module._compile_protected_paths(tuple(config.protected_paths))
+
+    first = compiled_for_new_run()
+    hits = orchestrator_module._compile_protected_paths.cache_info().hits
+
+    assert compiled_for_new_run() is first
+    assert orchestrator_module._compile_protected_paths.cache_info().hits == hits + 1
+
+
+def test_split_file_diffs_counts_changes_per_file() -> None:
+    diff = (
+        "--- a/src/app.py\n"
+        "+++ b/src/app.py\n"
+        "@@ -1,2 +1,2 @@\n"
+        "-import os\n"
+        "+import sys\n"
+        "+import json\n"
+        "--- a/requirements.txt\n"
+        "+++ b/requirements.txt\n"
+        "@@ -1 +0,0 @@\n"
+        "-flask\n"
+    )
+
+    diffs = orchestrator_module._split_file_diffs(diff)
+
+    assert [(d.filename, d.lines_added, d.lines_removed) for d in diffs] == [
+        ("src/app.py", 2, 1),
+        ("requirements.txt", 0, 1),
+    ]
+    assert "".join(d.diff for d in diffs) == diff
+
+
+def test_split_file_diffs_matches_line_scan_counts() -> None:
+    def line_scan(text: str) -> tuple[int, int]:
+        lines = text.splitlines()
+        added = sum(1 for ln in lines if ln.startswith("+") and not ln.startswith("+++"))
+        removed = sum(1 for ln in lines if ln.startswith("-") and not ln.startswith("---"))
+        return added, removed
+
+    diff = (
+        "--- a/a.txt\n+++ b/a.txt\n@@ -1 +1 @@\n-old\r\n+new\r\n+++plus\n"
+        "--- a/b.txt\n+++ b/b.txt\n@@ -1,2 +1 @@\n--dash\n-x\x0c+y\n+\n"
+    )
+
+    diffs = orchestrator_module._split_file_diffs(diff)
+
+    assert [d.filename for d in diffs] == ["a.txt", "b.txt"]
+    for d in diffs:
+        assert (d.lines_added, d.lines_removed) == line_scan(d.diff)
+
+
+def test_timeline_derives_iso_times_from_monotonic_clock() -> None:
+    from datetime import UTC, datetime
+
+    timeline = orchestrator_module._Timeline(
+        anchor=(datetime(2026, 1, 20, tzinfo=UTC), 1_000_000_000),
+        steps=["plan", "scans", "patch"],
+        statuses=["ok", "skipped", "running"],
+        durations_ms=[250, None, None],
+        started_ns=[1_000_000_000, None, 1_500_000_000],
+        completed_ns=[1_250_000_000, None, None],
+    )
+
+    stamped = timeline.as_dicts()
+
+    assert stamped[0] == {
+        "step": "plan",
+        "status": "ok",
+        "started_at": "2026-01-20T00:00:00+00:00",
+        "completed_at": "2026-01-20T00:00:00.250000+00:00",
+        "duration_ms": 250,
+    }
+    assert stamped[1]["started_at"] is None
+    assert stamped[2]["started_at"] == "2026-01-20T00:00:00.500000+00:00"
+    assert stamped[2]["completed_at"] is None
+
+
+def test_timeline_start_end_records_duration() -> None:
+    timeline = orchestrator_module._Timeline()
+
+    index = timeline.start("clone")
+    timeline.add("scans", "skipped")
+    duration_ms = timeline.end(index, "ok")
+
+    entries = timeline.as_dicts()
+    assert [(e["step"], e["status"]) for e in entries] == [("clone", "ok"), ("scans", "skipped")]
+    assert entries[0]["duration_ms"] == duration_ms >= 0
+    assert entries[0]["completed_at"] >= entries[0]["started_at"]
+    assert entries[1]["duration_ms"] is None
+
+
+def test_relevant_repo_files_keep_adapter_selection(tmp_path) -> None:
+    from sre_agent.adapters.registry import repo_marker_suffixes, select_adapter
+
+    (tmp_path / "node_modules" / "left-pad").mkdir(parents=True)
+    (tmp_path / "node_modules" / "left-pad" / "package.json").write_text("{}")
+    (tmp_path / "node_modules" / "left-pad" / "index.js").write_text("")
+    (tmp_path / "svc").mkdir()
+    (tmp_path / "svc" / "go.mod").write_text("module x\n")
+    (tmp_path / "svc" / "main.go").write_text("")
+    log = "main.go:3:2: no required module provides package github.com/x/y; to add"
+
+    suffixes = repo_marker_suffixes()
+    relevant = orchestrator_module._list_relevant_repo_files(tmp_path, suffixes)
+    everything = sorted(orchestrator_module._iter_repo_files(tmp_path))
+
+    assert relevant == ["node_modules/left-pad/package.json", "svc/go.mod"]
+    assert orchestrator_module._list_relevant_repo_files(tmp_path, None) == everything
+    assert select_adapter(log, relevant) == select_adapter(log, everything)
+
+
+def test_decisive_detection_cannot_be_outranked_by_checkout_markers() -> None:
+    from sre_agent.adapters.registry import repo_marker_suffixes, select_adapter
+
+    markers = list(repo_marker_suffixes())
+    logs = [
+        "ModuleNotFoundError: No module named 'requests'",
+        "npm ERR! code MODULE_NOT_FOUND\nError: Cannot find module 'express'",
+        "main.go:3:2: no required module provides package github.com/x/y; to add",
+        "[ERROR] 'dependencies.dependency.version' for org.acme:core is missing.",
+        "ERROR: failed to solve: dockerfile parse error",
+    ]
+
+    for log in logs:
+        with_markers = select_adapter(log, markers)
+        assert with_markers is not None
+        assert (
+            with_markers.detection.confidence <= orchestrator_module._DECISIVE_DETECTION_CONFIDENCE
+        )
+        hinted = select_adapter(log, [])
+        if (
+            hinted is not None
+            and hinted.detection.confidence >= orchestrator_module._DECISIVE_DETECTION_CONFIDENCE
+        ):
+            assert with_markers.adapter.name == hinted.adapter.name
+
+
+def test_relevant_repo_files_filter_names_before_resolving_links(tmp_path) -> None:
+    (tmp_path / "reqs").mkdir()
+    (tmp_path / "reqs" / "base.txt").write_text("flask\n")
+    (tmp_path / "requirements.txt").symlink_to(tmp_path / "reqs" / "base.txt")
+    (tmp_path / "vendor.go.mod").symlink_to(tmp_path / "reqs", target_is_directory=True)
+    (tmp_path / "broken.json").symlink_to(tmp_path / "missing")
+
+    relevant = orchestrator_module._list_relevant_repo_files(
+        tmp_path, ("requirements.txt", "go.mod", ".json")
+    )
+
+    assert relevant == ["broken.json", "requirements.txt"]
+    assert relevant == [
+        p
+        for p in sorted(orchestrator_module._iter_repo_files(tmp_path))
+        if p.endswith(("requirements.txt", "go.mod", ".json"))
+    ]
+
+
+def test_record_scan_metrics_counts_failures_per_scanner() -> None:
+    from sre_agent.observability.metrics import METRICS
+    from sre_agent.schemas.scans import (
+        GitleaksScanResult,
+        SbomResult,
+        ScanStatus,
+        ScanSummary,
+        TrivyScanResult,
+    )
+
+    def value(counter, **labels) -> float:
+        return counter.labels(**labels)._value.get()
+
+    before = {
+        "leak_timeout": value(METRICS.scan_fail_total, scanner="gitleaks", reason="timeout"),
+        "trivy_unknown": value(METRICS.scan_fail_total, scanner="trivy", reason="unknown"),
+        "leaks": value(METRICS.scan_findings_total, scanner="gitleaks", severity="UNKNOWN"),
+        "high": value(METRICS.scan_findings_total, scanner="trivy", severity="HIGH"),
+    }
+    scans = ScanSummary(
+        gitleaks=GitleaksScanResult(
+            status=ScanStatus.ERROR, findings_count=2, error_message="Scan Timeout"
+        ),
+        trivy=TrivyScanResult(status=ScanStatus.FAIL, severity_counts={"high": 3}),
+        sbom=SbomResult(status=ScanStatus.SKIPPED),
+    )
+
+    assert orchestrator_module._record_scan_metrics(scans) == "fail"
+    assert value(METRICS.scan_fail_total, scanner="gitleaks", reason="timeout") == (
+        before["leak_timeout"] + 1
+    )
+    assert value(METRICS.scan_fail_total, scanner="trivy", reason="unknown") == (
+        before["trivy_unknown"] + 1
+    )
+    assert value(METRICS.scan_findings_total, scanner="gitleaks", severity="UNKNOWN") == (
+        before["leaks"] + 2
+    )
+    assert value(METRICS.scan_findings_total, scanner="trivy", severity="HIGH") == (
+        before["high"] + 3
+    )
+
+    passing = scans.model_copy(
+        update={
+            "gitleaks": GitleaksScanResult(status=ScanStatus.PASS),
+            "trivy": TrivyScanResult(status=ScanStatus.PASS),
+        }
+    )
+    assert orchestrator_module._record_scan_metrics(passing) == "ok"
+
+
+def test_metric_child_reuses_labelled_child() -> None:
+    from sre_agent.observability.metrics import METRICS
+
+    child = orchestrator_module._metric_child(METRICS.pr_created_total, label="safe")
+
+    assert orchestrator_module._metric_child(METRICS.pr_created_total, label="safe") is child
+    assert child is METRICS.pr_created_total.labels(label="safe")
+
+
+async def test_load_or_build_context_defers_persisting_built_context(monkeypatch) -> None:
+    event_id = uuid4()
+    context = _make_context(event_id)
+    rca = _make_rca(event_id)
+    store = FakeStore(FakeRun(uuid4(), event_id, None, None))
+
+    class FakeBuilder:
+        async def build_context(self, event):
+            return context
+
+    class FakeEngine:
+        def analyze(self, ctx):
+            return rca
+
+    monkeypatch.setattr(orchestrator_module, "ContextBuilder", FakeBuilder)
+    monkeypatch.setattr(orchestrator_module, "RCAEngine", FakeEngine)
+    orch = FixPipelineOrchestrator(store=store)
+
+    built = await orch._load_or_build_context(SimpleNamespace(id=event_id), store._run)
+    stored = await orch._load_or_build_context(
+        SimpleNamespace(id=event_id),
+        FakeRun(uuid4(), event_id, context.model_dump(), rca.model_dump()),
+    )
+
+    assert built == (
+        context,
+        rca,
+        {"context_json": context, "rca_json": rca},
+    )
+    assert stored == (context, rca, {})
+    assert store.updates == []
+
+
+async def test_pipeline_flushes_pending_fields_with_artifact_write() -> None:
+    event_id = uuid4()
+    run_id = uuid4()
+    context = _make_context(event_id)
+    rca = _make_rca(event_id)
+    store = FakeStore(FakeRun(run_id, event_id, context.model_dump(), rca.model_dump()))
+    store.event = SimpleNamespace(
+        id=event_id,
+        repo="acme/repo",
+        branch="main",
+        commit_sha="a" * 40,
+        ci_provider=CIProvider.GITHUB_ACTIONS,
+        raw_payload={},
+    )
+
+    class FailingPlanGenerator:
+        last_model_name = None
+
+        async def generate_plan(self, rca_result, context):
+            raise RuntimeError("model unavailable")
+
+    class IdleRepoManager:
+        async def clone(self, **kwargs):
+            await asyncio.Event().wait()
+
+    orch = FixPipelineOrchestrator(store=store)
+    orch.plan_generator = FailingPlanGenerator()
+    orch.repo_manager = IdleRepoManager()
+
+    result = await orch.run(run_id)
+
+    assert result == {"success": False, "error": "plan_failed"}
+    blocked, leftover, artifact = store.updates
+    assert blocked["status"] == "plan_blocked"
+    assert {"automation_mode", "issue_graph_json", "adapter_name"} <= leftover.keys()
+    assert "status" not in leftover
+    assert artifact.keys() == {"artifact_json"}
+
+
+def test_build_fix_suggestion_copies_policy_decision_into_safety_status() -> None:
+    from sre_agent.safety.policy_models import (
+        DangerReason,
+        PolicyDecision,
+        PolicySeverity,
+        PolicyViolation,
+    )
+    from sre_agent.schemas.fix import SafetyStatus
+
+    decision = PolicyDecision(
+        allowed=False,
+        violations=[
+            PolicyViolation(
+                code="forbidden_path",
+                severity=PolicySeverity.BLOCK,
+                message="workflow edits are not allowed",
+                file_path=".github/workflows/ci.yml",
+            ),
+            PolicyViolation(code="large_diff", severity=PolicySeverity.WARN, message="big"),
+        ],
+        danger_score=42,
+        danger_reasons=[DangerReason(code="ci", weight=42, message="touches CI config")],
+    )
+    plan = FixPlan(
+        root_cause="unsafe",
+        category="python_missing_dependency",
+        confidence=0.7,
+        files=["pyproject.toml"],
+        operations=[],
+    )
+    orch = FixPipelineOrchestrator(store=FakeStore(None))
+
+    fix = orch._build_fix_suggestion("fix-1", uuid4(), plan, "", decision)
+
+    dumped = fix.safety_status.model_dump()
+    assert SafetyStatus.model_validate(dumped).model_dump() == dumped
+    assert dumped["pr_label"] == "needs-review"
+    assert [v["severity"] for v in dumped["violations"]] == ["block", "warn"]
+    assert dumped["violations"][1]["file_path"] is None
+    assert dumped["danger_reasons"] == ["touches CI config"]
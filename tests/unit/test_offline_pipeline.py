@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from sre_agent.fix_pipeline.offline import (
+    _HANDLERS,
+    _MAVEN_PLUGIN_RE,
+    _list_repo_files,
+    _mock_plan,
+    _search_from_literal,
+)
+from sre_agent.schemas.fix_plan import FixPlan
+
+
+def test_mock_plan_extracts_python_module_name(tmp_path: Path) -> None:
+    (tmp_path / "requirements.txt").write_text("flask==3.0.0\n")
+
+    plan = _mock_plan(
+        fix_category_hint="python_missing_dependency",
+        allowed_fix_types=None,
+        log_text="E   ModuleNotFoundError: No module named 'yaml.loader'",
+        repo_fixture_dir=tmp_path,
+    )
+
+    assert plan.files == ["requirements.txt"]
+    assert plan.operations[0].type == "add_dependency"
+    assert plan.operations[0].details == {"name": "yaml", "spec": "==1.0.0"}
+
+
+def test_mock_plan_extracts_maven_coordinates() -> None:
+    plan = _mock_plan(
+        fix_category_hint="java_dependency_version_missing",
+        allowed_fix_types=["pin_dependency"],
+        log_text="[ERROR] 'dependencies.dependency.version' for org.acme:core is missing.",
+        repo_fixture_dir=None,
+    )
+
+    assert plan.operations[0].details["group_id"] == "org.acme"
+    assert plan.operations[0].details["artifact_id"] == "core"
+
+
+def test_mock_plan_keeps_go_module_root() -> None:
+    plan = _mock_plan(
+        fix_category_hint="go_add_missing_module",
+        allowed_fix_types=None,
+        log_text="main.go:3:2: no required module provides package github.com/x/y/z/w; to add",
+        repo_fixture_dir=None,
+    )
+
+    assert plan.operations[0].details["name"] == "github.com/x/y"
+
+
+def test_mock_plan_falls_back_to_defaults_without_matches() -> None:
+    plan = _mock_plan(
+        fix_category_hint="go_add_missing_module",
+        allowed_fix_types=None,
+        log_text="build failed",
+        repo_fixture_dir=None,
+    )
+
+    assert plan.operations[0].details == {"name": "github.com/acme/foo", "spec": "v1.0.0"}
+
+
+def test_mock_plan_handlers_build_valid_plans() -> None:
+    for category in _HANDLERS:
+        plan = _mock_plan(
+            fix_category_hint=category,
+            allowed_fix_types=None,
+            log_text="  first  \n\nlast line\n",
+            repo_fixture_dir=None,
+        )
+
+        assert FixPlan.model_validate(plan.model_dump()) == plan
+
+
+def test_mock_plan_unknown_category_has_no_operations() -> None:
+    plan = _mock_plan(
+        fix_category_hint="not_a_category",
+        allowed_fix_types=None,
+        log_text="build failed",
+        repo_fixture_dir=None,
+    )
+
+    assert plan.category == "not_a_category"
+    assert plan.files == ["src/app.py"]
+    assert plan.operations == []
+
+
+def test_mock_plan_module_name_does_not_span_lines() -> None:
+    plan = _mock_plan(
+        fix_category_hint="node_missing_dependency",
+        allowed_fix_types=None,
+        log_text='Cannot find module \'broken\nCannot find module "left-pad"',
+        repo_fixture_dir=None,
+    )
+
+    assert plan.operations[0].details["name"] == "left-pad"
+
+
+def test_search_from_literal_matches_full_search() -> None:
+    text = (
+        "Plugin list loaded\n"
+        "Plugin org.apache:surefire:3.0 or one of its dependencies could not be resolved\n"
+    )
+
+    m = _search_from_literal(_MAVEN_PLUGIN_RE, "Plugin", text, required="could not be resolved")
+    assert m is not None
+    assert m.span() == _MAVEN_PLUGIN_RE.search(text).span()
+    assert _search_from_literal(_MAVEN_PLUGIN_RE, "Plugin", text, required="absent") is None
+    assert _search_from_literal(_MAVEN_PLUGIN_RE, "Nope", text) is None
+
+
+def test_list_repo_files_matches_rglob_without_git_dir(tmp_path: Path) -> None:
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "pkg" / "mod.py").write_text("")
+    (tmp_path / ".github").mkdir()
+    (tmp_path / ".github" / "ci.yml").write_text("")
+    (tmp_path / "requirements.txt").write_text("")
+    (tmp_path / "linked").symlink_to(tmp_path / "src", target_is_directory=True)
+    (tmp_path / ".git" / "objects").mkdir(parents=True)
+    (tmp_path / ".git" / "objects" / "pack").write_text("")
+
+    expected = sorted(
+        p.relative_to(tmp_path).as_posix()
+        for p in tmp_path.rglob("*")
+        if p.is_file() and not p.relative_to(tmp_path).as_posix().startswith(".git/")
+    )
+    assert _list_repo_files(tmp_path) == expected
+    assert expected == [".github/ci.yml", "requirements.txt", "src/pkg/mod.py"]
+
+
+async def test_run_pipeline_skips_tree_walk_when_root_marker_found(
+    tmp_path: Path, monkeypatch
+) -> None:
+    from sre_agent.fix_pipeline import offline
+
+    def no_walk(root: Path) -> list[str]:
+        raise AssertionError("full tree walk should not be needed")
+
+    monkeypatch.setattr(offline, "_list_repo_files", no_walk)
+    (tmp_path / "requirements.txt").write_text("flask==3.0.0\n")
+
+    result = await offline.run_pipeline_from_logs(
+        "ModuleNotFoundError: No module named 'yaml'",
+        case_id="case-1",
+        model="mock",
+        repo_fixture_dir=tmp_path,
+    )
+
+    assert result["adapter"] == "python"
+    assert result["plan"].category == "python_missing_dependency"
+
+
+async def test_run_pipeline_drop_raw_keeps_log_metadata() -> None:
+    from sre_agent.fix_pipeline import offline
+
+    result = await offline.run_pipeline_from_logs(
+        "ModuleNotFoundError: No module named 'yaml'",
+        case_id="case-1",
+        model="mock",
+        repo_fixture_dir=None,
+        drop_raw=True,
+        serialize_detection=False,
+    )
+
+    log_content = result["context"].log_content
+    assert log_content.raw_content == ""
+    assert log_content.truncated is True
+    assert log_content.size_bytes == 43
+    assert result["plan"].operations[0].details["name"] == "yaml"
+    assert result["detection"].category == "python_missing_dependency"
+
+
+async def test_run_pipeline_batch_matches_single_runs() -> None:
+    from sre_agent.fix_pipeline import offline
+
+    inputs = [
+        {
+            "log_text": "ModuleNotFoundError: No module named 'yaml'",
+            "case_id": "py",
+            "model": "mock",
+            "repo_fixture_dir": None,
+        },
+        {
+            "log_text": "Error: Cannot find module 'left-pad'",
+            "case_id": "node",
+            "model": "mock",
+            "repo_fixture_dir": None,
+            "fix_category_hint": "node_missing_dependency",
+        },
+    ]
+
+    results = await offline.run_pipeline_batch(inputs, workers=2)
+
+    assert [r["case_id"] for r in results] == ["py", "node"]
+    for kwargs, result in zip(inputs, results, strict=True):
+        single = await offline.run_pipeline_from_logs(**kwargs)
+        assert result["plan"] == single["plan"]
+        assert result["detection"] == single["detection"]
+
+
+async def test_run_pipeline_batch_returns_case_errors_in_place() -> None:
+    from sre_agent.fix_pipeline import offline
+
+    ok = {
+        "log_text": "ModuleNotFoundError: No module named 'yaml'",
+        "case_id": "py",
+        "model": "mock",
+        "repo_fixture_dir": None,
+    }
+    bad = {"log_text": "boom", "case_id": "bad", "model": "mock", "unknown": 1}
+
+    results = await offline.run_pipeline_batch([ok, bad, ok], workers=2)
+    assert results[0]["case_id"] == "py"
+    assert isinstance(results[1], TypeError)
+    assert results[2]["case_id"] == "py"
+
+    stopped = await offline.run_pipeline_batch([ok, bad, ok], workers=2, stop_on_error=True)
+    assert len(stopped) == 2
+    assert isinstance(stopped[1], TypeError)
+
+
+def test_policy_engine_cached_until_policy_file_changes(tmp_path: Path) -> None:
+    import os
+
+    from sre_agent.fix_pipeline.offline import _get_policy_engine
+
+    policy = tmp_path / "policy.yaml"
+    policy.write_text("patch_limits:\n  max_files: 2\n")
+
+    first = _get_policy_engine(policy)
+    assert _get_policy_engine(policy) is first
+    assert first.policy.patch_limits.max_files == 2
+
+    policy.write_text("patch_limits:\n  max_files: 7\n")
+    stat = policy.stat()
+    os.utime(policy, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    refreshed = _get_policy_engine(policy)
+    assert refreshed is not first
+    assert refreshed.policy.patch_limits.max_files == 7
+
+
+def test_utf8_size_matches_encoded_length() -> None:
+    from sre_agent.fix_pipeline.offline import _utf8_size
+
+    for text in ("", "plain ascii log\n", "naïve café ✓", "emoji 🚀"):
+        assert _utf8_size(text) == len(text.encode("utf-8"))
+
+
+def test_last_nonblank_lines_widens_tail_window(monkeypatch) -> None:
+    from sre_agent.fix_pipeline import offline
+
+    monkeypatch.setattr(offline, "_EVIDENCE_TAIL_CHARS", 4)
+    log = "first\n  second  \n\nthird line is long\r\n   \n"
+
+    assert offline._last_nonblank_lines(log, 3) == ["first", "second", "third line is long"]
+    assert offline._last_nonblank_lines("\n \n", 3) == []
@@ -116,3 +116,24 @@ def test_operation_outside_plan_files_is_blocked(tmp_path: Path) -> None:
                 )
             ],
         )
+
+
+def test_count_diff_changes_matches_line_scan() -> None:
+    from sre_agent.fix_pipeline.patch_generator import _count_diff_changes
+
+    def line_scan(text: str) -> tuple[int, int]:
+        lines = text.splitlines()
+        added = sum(1 for ln in lines if ln.startswith("+") and not ln.startswith("+++"))
+        removed = sum(1 for ln in lines if ln.startswith("-") and not ln.startswith("---"))
+        return added, removed
+
+    samples = [
+        "--- a/x.py\n+++ b/x.py\n@@ -1 +1,2 @@\n-old\n+new\n+++plus content\n",
+        "+first\r\n---\r\n-gone\r\n",
+        "-only\r+split on bare CR\n",
+        "+a\x0b-b +c",
+        "",
+    ]
+    for text in samples:
+        assert _count_diff_changes(text) == line_scan(text)
+    assert _count_diff_changes(samples[0]) == (1, 1)
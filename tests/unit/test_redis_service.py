@@ -0,0 +1,225 @@
+"""Unit tests for RedisService batching, transport and blocklist behaviour."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from sre_agent.core.redis_service import RedisConfig, RedisService
+
+
+class _Pipeline:
+    def __init__(self, client: _Client) -> None:
+        self._client = client
+        self._ops: list[tuple[str, str]] = []
+
+    async def __aenter__(self) -> _Pipeline:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    def publish(self, channel: str, data: str) -> None:
+        self._ops.append((channel, data))
+
+    async def execute(self) -> list[int]:
+        self._client.batches.append(list(self._ops))
+        return [1] * len(self._ops)
+
+
+class _Client:
+    def __init__(self) -> None:
+        self.batches: list[list[tuple[str, str]]] = []
+        self.direct: list[tuple[str, str]] = []
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+    async def publish(self, channel: str, data: str) -> int:
+        self.direct.append((channel, data))
+        return 1
+
+
+def _service(**config) -> tuple[RedisService, _Client]:
+    service = RedisService(RedisConfig(**config))
+    client = _Client()
+    service._client = client
+    return service, client
+
+
+@pytest.mark.asyncio
+async def test_publish_batches_messages_into_one_pipeline() -> None:
+    service, client = _service(publish_flush_interval_ms=5, publish_batch_size=50)
+    try:
+        for i in range(3):
+            assert await service.publish("dashboard_events", {"i": i}) == 0
+        await asyncio.sleep(0.05)
+    finally:
+        await service._stop_publish_flusher()
+
+    assert client.direct == []
+    assert len(client.batches) == 1
+    assert [channel for channel, _ in client.batches[0]] == [
+        "sre_agent:channel:dashboard_events"
+    ] * 3
+
+
+@pytest.mark.asyncio
+async def test_publish_is_immediate_by_default() -> None:
+    service, client = _service()
+
+    assert await service.publish("dashboard_events", {"i": 1}) == 1
+    assert client.direct == [("sre_agent:channel:dashboard_events", '{"i": 1}')]
+    assert service._publish_flusher_task is None
+
+
+def test_publish_flusher_follows_each_event_loop() -> None:
+    service, client = _service(publish_flush_interval_ms=5)
+
+    async def one_run(i: int) -> None:
+        await service.publish("dashboard_events", {"i": i})
+
+    async def last_run() -> None:
+        await service.publish("dashboard_events", {"i": 2})
+        await service._stop_publish_flusher()
+        await service._flush_publish_buffer()
+
+    # Each asyncio.run closes its loop before the flusher gets to the batch.
+    asyncio.run(one_run(0))
+    asyncio.run(one_run(1))
+    asyncio.run(last_run())
+
+    sent = [data for batch in client.batches for _, data in batch]
+    assert sent == ['{"i": 0}', '{"i": 1}', '{"i": 2}']
+    assert service._publish_buffer == []
+
+
+@pytest.mark.asyncio
+async def test_stop_publish_flusher_keeps_in_flight_batch(monkeypatch) -> None:
+    service, client = _service(publish_flush_interval_ms=1)
+    release = asyncio.Event()
+    real_execute = _Pipeline.execute
+
+    async def slow_execute(self) -> list[int]:
+        await release.wait()
+        return await real_execute(self)
+
+    monkeypatch.setattr(_Pipeline, "execute", slow_execute)
+    await service.publish("dashboard_events", {"i": 0})
+    await asyncio.sleep(0.02)  # the flusher is now blocked mid-batch
+    stopping = asyncio.create_task(service._stop_publish_flusher())
+    await asyncio.sleep(0)
+    release.set()
+    await stopping
+
+    assert [data for batch in client.batches for _, data in batch] == ['{"i": 0}']
+
+
+@pytest.mark.asyncio
+async def test_connect_uses_unix_socket_with_url_credentials(monkeypatch, tmp_path) -> None:
+    from redis.asyncio import Redis
+    from redis.asyncio.connection import UnixDomainSocketConnection
+
+    async def ping(self) -> bool:
+        return True
+
+    monkeypatch.setattr(Redis, "ping", ping)
+    socket_path = tmp_path / "redis.sock"
+    socket_path.touch()
+    service = RedisService(
+        RedisConfig(url="redis://:secret@redis-host:6380/3", unix_socket_path=str(socket_path))
+    )
+
+    await service.connect()
+
+    pool = service._pool
+    assert pool.connection_class is UnixDomainSocketConnection
+    assert pool.connection_kwargs["path"] == str(socket_path)
+    assert pool.connection_kwargs["db"] == 3
+    assert pool.connection_kwargs["password"] == "secret"
+    assert "host" not in pool.connection_kwargs
+    await service.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_connect_rejects_unix_socket_with_tls_url(tmp_path) -> None:
+    socket_path = tmp_path / "redis.sock"
+    socket_path.touch()
+    service = RedisService(
+        RedisConfig(url="rediss://redis-host:6380/0", unix_socket_path=str(socket_path))
+    )
+
+    with pytest.raises(ValueError, match="bypass TLS"):
+        await service.connect()
+    assert service._pool is None
+
+
+def test_get_redis_service_reads_publish_batching_from_settings(monkeypatch) -> None:
+    from sre_agent.config import get_settings
+    from sre_agent.core import redis_service
+
+    monkeypatch.setenv("REDIS_PUBLISH_FLUSH_INTERVAL_MS", "5")
+    monkeypatch.setenv("REDIS_PUBLISH_BATCH_SIZE", "100")
+    monkeypatch.setattr(redis_service, "_redis_service", None)
+    get_settings.cache_clear()
+    try:
+        config = redis_service.get_redis_service().config
+    finally:
+        get_settings.cache_clear()
+
+    assert config.publish_flush_interval_ms == 5
+    assert config.publish_batch_size == 100
+
+
+class _ExistsPipeline:
+    def __init__(self, client: _BlocklistClient, transaction: bool) -> None:
+        self._client = client
+        self._keys: list[str] = []
+        client.transactions.append(transaction)
+
+    async def __aenter__(self) -> _ExistsPipeline:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    def exists(self, key: str) -> None:
+        self._keys.append(key)
+
+    async def execute(self) -> list[int]:
+        self._client.executed.append(list(self._keys))
+        return [int(key in self._client.keys) for key in self._keys]
+
+
+class _BlocklistClient:
+    def __init__(self, keys: set[str]) -> None:
+        self.keys = keys
+        self.executed: list[list[str]] = []
+        self.transactions: list[bool] = []
+
+    def pipeline(self, transaction: bool = True) -> _ExistsPipeline:
+        return _ExistsPipeline(self, transaction)
+
+
+@pytest.mark.asyncio
+async def test_are_blocklisted_checks_all_jtis_in_one_pipeline() -> None:
+    service = RedisService(RedisConfig())
+    client = _BlocklistClient({"sre_agent:blocklist:b", "sre_agent:blocklist:d"})
+    service._client = client
+
+    flags = await service.are_blocklisted(["a", "b", "c", "d", "b"])
+
+    assert flags == [False, True, False, True, True]
+    assert client.executed == [[f"sre_agent:blocklist:{jti}" for jti in "abcdb"]]
+    assert client.transactions == [False]
+
+
+@pytest.mark.asyncio
+async def test_are_blocklisted_empty_list_skips_redis() -> None:
+    service = RedisService(RedisConfig())
+    client = _BlocklistClient(set())
+    service._client = client
+
+    assert await service.are_blocklisted([]) == []
+    assert client.executed == []
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from sre_agent.sandbox.repo_manager import RepoManager
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def _make_origin(tmp_path: Path) -> tuple[str, list[str]]:
+    origin = tmp_path / "origin"
+    origin.mkdir()
+    _git(origin, "init", "-q", "-b", "main")
+    _git(origin, "config", "uploadpack.allowFilter", "true")
+    shas = []
+    for version in ("v1", "v2"):
+        (origin / "app.py").write_text(f"VERSION = {version!r}\n")
+        _git(origin, "add", "app.py")
+        _git(origin, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", version)
+        shas.append(_git(origin, "rev-parse", "HEAD"))
+    return f"file://{origin}", shas
+
+
+async def test_partial_clone_checks_out_requested_commit(tmp_path: Path) -> None:
+    url, (first, _) = _make_origin(tmp_path)
+    manager = RepoManager(base_dir=tmp_path / "clones", partial_clone=True)
+
+    repo_path = await manager.clone(url, branch="main", commit=first, depth=50)
+
+    assert (repo_path / "app.py").read_text() == "VERSION = 'v1'\n"
+    assert _git(repo_path, "config", "remote.origin.partialclonefilter") == "blob:none"
+
+
+async def test_partial_clone_falls_back_to_branch_tip_for_unknown_commit(tmp_path: Path) -> None:
+    url, _ = _make_origin(tmp_path)
+    manager = RepoManager(base_dir=tmp_path / "clones", partial_clone=True)
+
+    repo_path = await manager.clone(url, branch="main", commit="f" * 40, depth=50)
+
+    assert (repo_path / "app.py").read_text() == "VERSION = 'v2'\n"
+
+
+async def test_run_git_kills_process_on_timeout_and_cancel() -> None:
+    import asyncio
+
+    from sre_agent.sandbox.repo_manager import _run_git
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        await _run_git(["sleep", "5"], timeout=0.05)
+
+    task = asyncio.create_task(_run_git(["sleep", "5"], timeout=30))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(task, timeout=2)
+
+    done = await _run_git(["git", "--version"], timeout=10)
+    assert done.returncode == 0
+    assert done.stdout.startswith("git version")
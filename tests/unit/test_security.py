@@ -4,7 +4,13 @@ import hashlib
 import hmac
 
 import pytest
-from sre_agent.core.security import WebhookSignatureError, verify_github_signature
+from fastapi import HTTPException
+from sre_agent.config import Settings
+from sre_agent.core.security import (
+    WebhookSignatureError,
+    get_verified_github_payload,
+    verify_github_signature,
+)
 
 
 class TestVerifyGitHubSignature:
@@ -80,3 +86,92 @@ class TestVerifyGitHubSignature:
                 signature_header=f"sha256={wrong_signature}",
                 secret=secret,
             )
+
+    def test_large_payload_signature_passes(self) -> None:
+        """Multi-megabyte payloads verify against the standard HMAC digest."""
+        secret = "test-secret"
+        payload = b"x" * (2 * 1024 * 1024)
+
+        signature = hmac.new(
+            key=secret.encode("utf-8"),
+            msg=payload,
+            digestmod=hashlib.sha256,
+        ).hexdigest()
+
+        assert verify_github_signature(
+            payload=payload,
+            signature_header=f"sha256={signature}",
+            secret=secret,
+        )
+
+
+class _StreamingRequest:
+    """Minimal request double that yields its body in chunks."""
+
+    def __init__(self, body: bytes, chunk_size: int = 7, headers=None) -> None:
+        self._chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+        self.headers = headers or {"content-length": str(len(body))}
+
+    async def stream(self):
+        for chunk in self._chunks:
+            yield chunk
+
+
+class TestGetVerifiedGitHubPayload:
+    """Tests for the streaming webhook verification dependency."""
+
+    async def test_streamed_body_is_verified_and_returned(self) -> None:
+        secret = "test-secret"
+        payload = b'{"action": "completed", "workflow_job": {"id": 1}}'
+        signature = hmac.new(secret.encode("utf-8"), payload, hashlib.sha256).hexdigest()
+
+        body, event, delivery = await get_verified_github_payload(
+            request=_StreamingRequest(payload),
+            x_hub_signature_256=f"sha256={signature}",
+            x_github_event="workflow_job",
+            x_github_delivery="delivery-1",
+            settings=Settings(github_webhook_secret=secret),
+        )
+
+        assert body == payload
+        assert (event, delivery) == ("workflow_job", "delivery-1")
+
+    async def test_streamed_body_with_bad_signature_returns_401(self) -> None:
+        with pytest.raises(HTTPException) as exc_info:
+            await get_verified_github_payload(
+                request=_StreamingRequest(b"{}"),
+                x_hub_signature_256="sha256=" + "0" * 64,
+                x_github_event="workflow_job",
+                x_github_delivery="delivery-1",
+                settings=Settings(github_webhook_secret="test-secret"),
+            )
+
+        assert exc_info.value.status_code == 401
+
+    async def test_oversized_content_length_returns_413(self) -> None:
+        request = _StreamingRequest(b"{}", headers={"content-length": str(26 * 1024 * 1024)})
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_verified_github_payload(
+                request=request,
+                x_hub_signature_256="sha256=" + "0" * 64,
+                x_github_event="workflow_job",
+                x_github_delivery="delivery-1",
+                settings=Settings(github_webhook_secret="test-secret"),
+            )
+
+        assert exc_info.value.status_code == 413
+
+    async def test_oversized_streamed_body_returns_413(self) -> None:
+        request = _StreamingRequest(b"x" * 64, headers={})
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_verified_github_payload(
+                request=request,
+                x_hub_signature_256="sha256=" + "0" * 64,
+                x_github_event="workflow_job",
+                x_github_delivery="delivery-1",
+                settings=Settings(github_webhook_secret="test-secret", github_webhook_max_bytes=32),
+            )
+
+        assert exc_info.value.status_code == 413